@@ -0,0 +1,104 @@
+"""
+Base Module
+Common plumbing shared by the LLM-backed agent modules
+"""
+from typing import Any, Optional
+
+from .client import LLMClient, LLMRequest
+from .json_stream import IncrementalJSONParser, ItemCallback, parse_json_response
+from .schemas import validate_output
+from .serializer import PromptSerializer
+from .slicer import ContextSlicer
+
+
+class AgentModule:
+    """Base class wiring a module to the shared LLM client"""
+
+    def __init__(self, api_key: Optional[str] = None, llm_client: Optional[LLMClient] = None,
+                 serializer: Optional[PromptSerializer] = None):
+        if llm_client is None:
+            llm_client = LLMClient(api_key)
+        self.client = llm_client
+        # Compact, token-budgeted encoding of project data for prompts
+        self.serializer = serializer or PromptSerializer()
+        # Scoped project context for calls about one task, milestone or phase
+        self.slicer = ContextSlicer()
+
+    def _run(self, request: LLMRequest) -> Any:
+        """
+        Execute a request synchronously and parse the result
+        Output that fails validation is retried once on the next model tier up
+        """
+        request = self.client.router.route(request)
+        result = self._complete(request)
+        escalated = self.client.router.escalate(request, result)
+        return result if escalated is None else self._complete(escalated)
+
+    async def _run_async(self, request: LLMRequest) -> Any:
+        """Async variant of _run"""
+        request = self.client.router.route(request)
+        result = await self._complete_async(request)
+        escalated = self.client.router.escalate(request, result)
+        return result if escalated is None else await self._complete_async(escalated)
+
+    def _complete(self, request: LLMRequest) -> Any:
+        response = self.client.complete(request)
+        return self._handle_response(request, response.text)
+
+    async def _complete_async(self, request: LLMRequest) -> Any:
+        response = await self.client.complete_async(request)
+        return self._handle_response(request, response.text)
+
+    def _run_streaming(self, request: LLMRequest, on_item: ItemCallback) -> Any:
+        """
+        Stream a JSON request, calling on_item(key, element) for each element of a
+        top-level array as soon as it closes; returns the full parsed document
+        If that fails validation, the document is regenerated (unstreamed) on a larger model
+        """
+        request = self.client.router.route(request)
+        parser = IncrementalJSONParser()
+        for event in self.client.stream(request):
+            for key, item in parser.feed(event.text):
+                on_item(key, item)
+        result = self._validate(request, self._close_parser(parser))
+        escalated = self.client.router.escalate(request, result)
+        return result if escalated is None else self._complete(escalated)
+
+    async def _run_streaming_async(self, request: LLMRequest, on_item: ItemCallback) -> Any:
+        """Async variant of _run_streaming"""
+        request = self.client.router.route(request)
+        parser = IncrementalJSONParser()
+        async for event in self.client.stream_async(request):
+            for key, item in parser.feed(event.text):
+                on_item(key, item)
+        result = self._validate(request, self._close_parser(parser))
+        escalated = self.client.router.escalate(request, result)
+        return result if escalated is None else await self._complete_async(escalated)
+
+    def _close_parser(self, parser: IncrementalJSONParser) -> Any:
+        try:
+            return parser.close()
+        except ValueError:
+            return self._parse_json_response(parser.buffer)
+
+    def _snapshot(self, data: Any, method: Optional[str] = None, label: str = "Project Data") -> str:
+        """
+        Labelled prompt encoding of project data, passed as LLMRequest.context so
+        it forms part of the cacheable prefix ahead of the method-specific prompt
+        """
+        return f"{label}:\n{self.serializer.serialize(data, method)}"
+
+    def _handle_response(self, request: LLMRequest, text: str) -> Any:
+        if request.parse_json:
+            return self._validate(request, self._parse_json_response(text))
+        return text
+
+    def _validate(self, request: LLMRequest, data: Any) -> Any:
+        """Check parsed output against the request's schema, if it has one"""
+        if request.schema is None:
+            return data
+        return validate_output(request.schema, data)
+
+    def _parse_json_response(self, text: str) -> Any:
+        """Extract and parse JSON from the model's response (repairing truncated output)"""
+        return parse_json_response(text)
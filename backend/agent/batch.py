@@ -0,0 +1,232 @@
+"""
+Batch Module
+Runs many independent requests as one batch job instead of one HTTP call each
+"""
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional
+import time
+import uuid
+
+from .client import LLMClient, LLMRequest, LLMResponse
+
+BATCH_IN_PROGRESS = "in_progress"
+BATCH_ENDED = "ended"
+
+# Receives the progress dict after every poll
+ProgressCallback = Callable[[Dict], None]
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one request in a batch: a response or an error message"""
+    custom_id: str
+    response: Optional[LLMResponse] = None
+    error: Optional[str] = None
+
+
+class BatchBackend:
+    """
+    Where a batch is executed. Requests are keyed by a custom_id
+    (letters, digits, "_" and "-", at most 64 characters).
+    """
+
+    def submit(self, requests: Dict[str, LLMRequest]) -> str:
+        """Queue the requests; returns the batch id"""
+        raise NotImplementedError
+
+    def status(self, batch_id: str) -> str:
+        """BATCH_IN_PROGRESS or BATCH_ENDED"""
+        raise NotImplementedError
+
+    def results(self, batch_id: str) -> Iterator[BatchResult]:
+        """Results available so far (some backends only have them once the batch has ended)"""
+        raise NotImplementedError
+
+    def cancel(self, batch_id: str):
+        raise NotImplementedError
+
+
+class MessageBatchBackend(BatchBackend):
+    """
+    Anthropic Message Batches API: asynchronous, discounted processing with no
+    HTTP request held open. In anthropic 0.40 it is exposed as a beta
+    (client.beta.messages.batches), which sets its own beta header.
+    """
+
+    def __init__(self, client: LLMClient):
+        self.client = client
+
+    @property
+    def batches(self):
+        return self.client.sync_client.beta.messages.batches
+
+    def submit(self, requests: Dict[str, LLMRequest]) -> str:
+        batch = self.batches.create(requests=[
+            {"custom_id": custom_id, "params": self.client.router.route(request).to_api_kwargs()}
+            for custom_id, request in requests.items()
+        ])
+        return batch.id
+
+    def status(self, batch_id: str) -> str:
+        batch = self.batches.retrieve(batch_id)
+        return BATCH_ENDED if batch.processing_status == "ended" else BATCH_IN_PROGRESS
+
+    def results(self, batch_id: str) -> Iterator[BatchResult]:
+        # Results are only published once the whole batch has ended
+        if self.status(batch_id) != BATCH_ENDED:
+            return
+        for entry in self.batches.results(batch_id):
+            result = entry.result
+            if result.type == "succeeded":
+                yield BatchResult(entry.custom_id, response=LLMResponse.from_message(result.message))
+            else:
+                detail = getattr(getattr(result, "error", None), "error", None)
+                message = getattr(detail, "message", None)
+                yield BatchResult(entry.custom_id, error=f"{result.type}: {message}" if message else result.type)
+
+    def cancel(self, batch_id: str):
+        self.batches.cancel(batch_id)
+
+
+class LocalBatchBackend(BatchBackend):
+    """
+    Stand-in backend that runs each request through a completion function
+    (e.g. LLMClient.complete, or a fake for offline runs) on a thread pool.
+    Results become available one by one as they finish.
+    """
+
+    def __init__(self, complete: Callable[[LLMRequest], LLMResponse], max_workers: int = 4):
+        self.complete = complete
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+        self._batches: Dict[str, Dict[str, Future]] = {}
+
+    def submit(self, requests: Dict[str, LLMRequest]) -> str:
+        batch_id = f"localbatch_{uuid.uuid4().hex[:12]}"
+        self._batches[batch_id] = {
+            custom_id: self._pool.submit(self.complete, request)
+            for custom_id, request in requests.items()
+        }
+        return batch_id
+
+    def status(self, batch_id: str) -> str:
+        futures = self._batches[batch_id].values()
+        return BATCH_ENDED if all(future.done() for future in futures) else BATCH_IN_PROGRESS
+
+    def results(self, batch_id: str) -> Iterator[BatchResult]:
+        for custom_id, future in self._batches[batch_id].items():
+            if not future.done():
+                continue
+            if future.cancelled():
+                yield BatchResult(custom_id, error="canceled")
+            elif future.exception() is not None:
+                yield BatchResult(custom_id, error=f"errored: {future.exception()}")
+            else:
+                yield BatchResult(custom_id, response=future.result())
+
+    def cancel(self, batch_id: str):
+        for future in self._batches[batch_id].values():
+            future.cancel()
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+class ReportBatch:
+    """
+    Markdown reports for many projects generated as one batch.
+
+    add() collects a request per project, submit() hands them to the backend,
+    poll() writes every newly finished report to reports_dir and returns
+    progress, and wait() polls until the batch has ended.
+    """
+
+    def __init__(self, backend: BatchBackend, reports_dir: str = "reports", poll_interval: float = 30.0):
+        self.backend = backend
+        self.reports_dir = Path(reports_dir)
+        self.poll_interval = poll_interval
+        self.batch_id: Optional[str] = None
+
+        self._requests: Dict[str, LLMRequest] = {}
+        self._project_ids: Dict[str, str] = {}
+        self._written: Dict[str, str] = {}
+        self._errors: Dict[str, str] = {}
+        self._status = "pending"
+
+    def add(self, project_id: str, request: LLMRequest) -> str:
+        """Queue the report request for one project; returns its custom_id"""
+        if self.batch_id is not None:
+            raise RuntimeError("Batch already submitted")
+        custom_id = f"report_{len(self._requests)}"
+        self._requests[custom_id] = request
+        self._project_ids[custom_id] = project_id
+        return custom_id
+
+    def submit(self) -> str:
+        if self.batch_id is None:
+            if not self._requests:
+                raise ValueError("No report requests to submit")
+            self.batch_id = self.backend.submit(self._requests)
+            self._status = BATCH_IN_PROGRESS
+        return self.batch_id
+
+    def poll(self) -> Dict:
+        """Collect finished results, writing each report once; returns progress"""
+        if self.batch_id is None:
+            return self.progress()
+        # Read the status first so results published at the end are not missed
+        status = self.backend.status(self.batch_id)
+        for result in self.backend.results(self.batch_id):
+            if result.custom_id in self._written or result.custom_id in self._errors:
+                continue
+            if result.response is not None:
+                self._written[result.custom_id] = str(self._write_report(result))
+            else:
+                self._errors[result.custom_id] = result.error or "unknown error"
+        self._status = status
+        return self.progress()
+
+    def wait(self, on_progress: Optional[ProgressCallback] = None,
+             timeout: Optional[float] = None) -> Dict:
+        """Poll until the batch ends (or timeout seconds pass); returns the final progress"""
+        self.submit()
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            progress = self.poll()
+            if on_progress:
+                on_progress(progress)
+            if progress["status"] == BATCH_ENDED:
+                return progress
+            if deadline is not None and time.monotonic() >= deadline:
+                return progress
+            time.sleep(self.poll_interval)
+
+    def cancel(self):
+        if self.batch_id is not None:
+            self.backend.cancel(self.batch_id)
+
+    def progress(self) -> Dict:
+        total = len(self._requests)
+        done = len(self._written) + len(self._errors)
+        return {
+            "batch_id": self.batch_id,
+            "status": self._status,
+            "total": total,
+            "completed": len(self._written),
+            "failed": len(self._errors),
+            "pending": total - done,
+            "progress_percentage": round(done / total * 100, 1) if total else 0.0,
+            "report_files": {self._project_ids[key]: path for key, path in self._written.items()},
+            "errors": {self._project_ids[key]: error for key, error in self._errors.items()}
+        }
+
+    def _write_report(self, result: BatchResult) -> Path:
+        # Same naming as reports generated through the API
+        project_id = self._project_ids[result.custom_id]
+        self.reports_dir.mkdir(parents=True, exist_ok=True)
+        path = self.reports_dir / f"report_{project_id}_{datetime.now().strftime('%Y%m%d%H%M%S')}.md"
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(result.response.text)
+        return path
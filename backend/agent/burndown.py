@@ -0,0 +1,157 @@
+"""
+Burndown Module
+Burndown series replayed from recorded task status change events
+"""
+from datetime import date, datetime, timedelta
+from itertools import accumulate
+from typing import Dict, List, Optional, Tuple
+
+from .metrics import STATUS_HISTORY_FIELD, TaskTable, normalize_status, parse_day, project_start_date
+
+
+def record_status_event(project_data: Dict, task_id: str, status: str,
+                        timestamp: Optional[str] = None) -> Dict:
+    """Append a status change event to the project's history and return it"""
+    event = {
+        "task_id": str(task_id),
+        "status": normalize_status(status),
+        "timestamp": timestamp or datetime.now().isoformat()
+    }
+    project_data.setdefault(STATUS_HISTORY_FIELD, []).append(event)
+    return event
+
+
+class BurndownEngine:
+    """
+    Replays status events into per-day completion deltas, then takes cumulative
+    sums over the date-indexed arrays to get remaining/completed work per day.
+    """
+
+    def build(self, project_data: Dict, events: Optional[List[Dict]] = None,
+              current_date: Optional[str] = None) -> Dict:
+        """
+        Same shape as ProgressTracker.generate_burndown_data:
+        {"burndown": {total_tasks, total_hours, data_points, ideal_line, ...}}
+        """
+        table = TaskTable.from_project(project_data)
+        today = parse_day(current_date) or date.today()
+        if events is None:
+            events = project_data.get(STATUS_HISTORY_FIELD) or []
+
+        hours = dict(zip(table.task_ids, table.estimated_hours))
+        total_tasks = len(hours)
+        total_hours = sum(hours.values())
+        changes = self._completion_changes(table, events, today)
+
+        start = project_start_date(project_data)
+        if start is None:
+            start = min((day for day, _, _ in changes), default=today)
+        start = min(start, today)
+        days = (today - start).days + 1
+
+        # Per-day deltas; reopened tasks contribute negative entries
+        task_delta = [0] * days
+        hour_delta = [0.0] * days
+        for day, task_id, sign in changes:
+            index = min(max((day - start).days, 0), days - 1)
+            task_delta[index] += sign
+            hour_delta[index] += sign * hours.get(task_id, 0.0)
+        completed_tasks = list(accumulate(task_delta))
+        completed_hours = list(accumulate(hour_delta))
+
+        data_points = [
+            {
+                "date": (start + timedelta(days=i)).isoformat(),
+                "remaining_tasks": total_tasks - completed_tasks[i],
+                "remaining_hours": round(total_hours - completed_hours[i], 1),
+                "completed_tasks": completed_tasks[i],
+                "completed_hours": round(completed_hours[i], 1)
+            }
+            for i in range(days)
+        ]
+
+        deadline = self._deadline(project_data, table)
+        ideal_end = deadline if deadline and deadline > start else today
+        ideal_days = max((ideal_end - start).days, 1)
+        ideal_line = [
+            {
+                "date": (start + timedelta(days=i)).isoformat(),
+                "ideal_remaining": round(total_tasks * (1 - i / ideal_days), 1)
+            }
+            for i in range(ideal_days + 1)
+        ]
+
+        remaining_now = total_tasks - completed_tasks[-1]
+        projected = self._projected_completion(completed_tasks, total_tasks, start, changes)
+        ideal_now = max(total_tasks * (1 - (today - start).days / ideal_days), 0.0)
+        if deadline and projected:
+            on_track = projected <= deadline
+        else:
+            on_track = remaining_now <= ideal_now
+
+        return {
+            "burndown": {
+                "total_tasks": total_tasks,
+                "total_hours": round(total_hours, 1),
+                "data_points": data_points,
+                "ideal_line": ideal_line,
+                "projected_completion_date": projected.isoformat() if projected else None,
+                "on_track": on_track,
+                # Positive when more work remains than the ideal line allows
+                "variance_percentage": round(100.0 * (remaining_now - ideal_now) / total_tasks, 1) if total_tasks else 0.0
+            }
+        }
+
+    @staticmethod
+    def _completion_changes(table: TaskTable, events: List[Dict], today: date) -> List[Tuple[date, str, int]]:
+        """(day, task_id, +1 completed / -1 reopened) transitions in time order"""
+        known = set(table.task_ids)
+        ordered = []
+        for position, event in enumerate(events):
+            if not isinstance(event, dict):
+                continue
+            task_id = str(event.get("task_id") or "")
+            day = parse_day(event.get("timestamp") or event.get("date"))
+            if task_id in known and day is not None:
+                ordered.append((day, position, task_id, normalize_status(event.get("status"))))
+        ordered.sort()
+
+        done = {}
+        changes = []
+        for day, _, task_id, status in ordered:
+            is_done = status == "completed"
+            if is_done != done.get(task_id, False):
+                changes.append((day, task_id, 1 if is_done else -1))
+            done[task_id] = is_done
+
+        # Tasks completed before history was recorded fall back to their own dates
+        for i, task_id in enumerate(table.task_ids):
+            if task_id not in done and table.statuses[i] == "completed":
+                changes.append((table.completed_on[i] or today, task_id, 1))
+        return changes
+
+    @staticmethod
+    def _deadline(project_data: Dict, table: TaskTable) -> Optional[date]:
+        deadline = parse_day(project_data.get("deadline") or project_data.get("end_date"))
+        if deadline is None:
+            deadline = max((day for day in table.deadlines if day), default=None)
+        return deadline
+
+    @staticmethod
+    def _projected_completion(completed: List[int], total: int, start: date,
+                              changes: List[Tuple[date, str, int]]) -> Optional[date]:
+        """Least-squares line through cumulative completions, extended to the total"""
+        if total and completed[-1] >= total:
+            return max((day for day, _, sign in changes if sign > 0), default=start)
+        n = len(completed)
+        if n < 2 or not total:
+            return None
+        mean_x = (n - 1) / 2
+        mean_y = sum(completed) / n
+        sxx = sum((x - mean_x) ** 2 for x in range(n))
+        sxy = sum((x - mean_x) * (y - mean_y) for x, y in enumerate(completed))
+        slope = sxy / sxx
+        if slope <= 0:
+            return None
+        intercept = mean_y - slope * mean_x
+        return start + timedelta(days=max(round((total - intercept) / slope), n - 1))
@@ -0,0 +1,218 @@
+"""
+Cache Module
+Content-addressed response cache for LLM-backed agent methods
+"""
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+from .client import LLMRequest, LLMResponse
+
+# Methods whose output depends on more than the prompt (e.g. free-form chat)
+DEFAULT_UNCACHED_METHODS = {"chat"}
+
+
+class ResponseCache:
+    """
+    Two-level response cache: an in-memory LRU in front of an optional,
+    size-bounded directory of JSON files. Entries expire after ttl_seconds.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 3600,
+                 cache_dir: Optional[str] = None, max_disk_bytes: int = 50 * 1024 * 1024,
+                 disabled_methods: Optional[Iterable[str]] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_disk_bytes = max_disk_bytes
+        self.disabled_methods = set(DEFAULT_UNCACHED_METHODS if disabled_methods is None else disabled_methods)
+
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "memory_hits": 0, "disk_hits": 0, "writes": 0, "evictions": 0}
+
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    #  KEYS
+
+    @staticmethod
+    def canonicalize(text: str) -> str:
+        """Normalize whitespace so formatting-only differences share a key"""
+        lines = [line.rstrip() for line in text.strip().splitlines()]
+        return re.sub(r"\n{3,}", "\n\n", "\n".join(lines))
+
+    def key_for(self, request: LLMRequest) -> str:
+        """Hash of (model, method, canonical prompt, max_tokens, output schema)"""
+        messages = [
+            {**message, "content": self.canonicalize(message["content"])}
+            if isinstance(message.get("content"), str) else message
+            for message in request.build_messages()
+        ]
+        material = {
+            "model": request.model,
+            "method": request.method,
+            "system": self.canonicalize(request.system or ""),
+            "messages": messages,
+            "max_tokens": request.max_tokens,
+            "schema": request.schema.__name__ if request.schema is not None else None,
+        }
+        encoded = json.dumps(material, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    #  CONFIGURATION
+
+    def is_enabled_for(self, method: str) -> bool:
+        return method not in self.disabled_methods
+
+    def disable(self, method: str):
+        """Opt a method out of caching"""
+        self.disabled_methods.add(method)
+
+    def enable(self, method: str):
+        """Opt a method back into caching"""
+        self.disabled_methods.discard(method)
+
+    #  LOOKUP / STORE
+
+    def get(self, key: str) -> Optional[LLMResponse]:
+        """Return a fresh cached response or None"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._is_fresh(entry, now):
+                self._entries.move_to_end(key)
+                self._counters["hits"] += 1
+                self._counters["memory_hits"] += 1
+                return self._to_response(entry)
+            if entry is not None:
+                del self._entries[key]
+
+        entry = self._read_disk(key, now)
+        with self._lock:
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+            self._counters["hits"] += 1
+            self._counters["disk_hits"] += 1
+            self._remember(key, entry)
+        return self._to_response(entry)
+
+    def set(self, key: str, response: LLMResponse):
+        """Store a response in memory and, if configured, on disk"""
+        entry = {
+            "stored_at": time.time(),
+            "text": response.text,
+            "model": response.model,
+            "usage": response.usage,
+            "stop_reason": response.stop_reason,
+        }
+        with self._lock:
+            self._remember(key, entry)
+            self._counters["writes"] += 1
+        self._write_disk(key, entry)
+
+    def invalidate(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.cache_dir:
+            (self.cache_dir / f"{key}.json").unlink(missing_ok=True)
+
+    def clear(self):
+        """Drop every cached entry (memory and disk)"""
+        with self._lock:
+            self._entries.clear()
+        if self.cache_dir:
+            for path in self.cache_dir.glob("*.json"):
+                path.unlink(missing_ok=True)
+
+    def stats(self) -> Dict:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            counters = dict(self._counters)
+            counters["entries"] = len(self._entries)
+        lookups = counters["hits"] + counters["misses"]
+        counters["hit_rate"] = round(counters["hits"] / lookups, 3) if lookups else 0.0
+        counters["disk_bytes"] = self._disk_usage()[0] if self.cache_dir else 0
+        return counters
+
+    #  INTERNALS
+
+    def _is_fresh(self, entry: Dict, now: float) -> bool:
+        return self.ttl_seconds is None or now - entry["stored_at"] <= self.ttl_seconds
+
+    def _remember(self, key: str, entry: Dict):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    @staticmethod
+    def _to_response(entry: Dict) -> LLMResponse:
+        return LLMResponse(
+            text=entry["text"],
+            model=entry["model"],
+            usage=dict(entry.get("usage") or {}),
+            stop_reason=entry.get("stop_reason"),
+            cached=True
+        )
+
+    def _read_disk(self, key: str, now: float) -> Optional[Dict]:
+        if not self.cache_dir:
+            return None
+        path = self.cache_dir / f"{key}.json"
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not self._is_fresh(entry, now):
+            path.unlink(missing_ok=True)
+            return None
+        return entry
+
+    def _write_disk(self, key: str, entry: Dict):
+        if not self.cache_dir:
+            return
+        path = self.cache_dir / f"{key}.json"
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error writing cache entry: {e}")
+            return
+        self._enforce_disk_limit()
+
+    def _disk_usage(self):
+        files = []
+        total = 0
+        for path in self.cache_dir.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+        return total, files
+
+    def _enforce_disk_limit(self):
+        """Delete the oldest files until the directory fits in max_disk_bytes"""
+        total, files = self._disk_usage()
+        if total <= self.max_disk_bytes:
+            return
+        for _, size, path in sorted(files):
+            path.unlink(missing_ok=True)
+            total -= size
+            with self._lock:
+                self._counters["evictions"] += 1
+            if total <= self.max_disk_bytes:
+                break
@@ -0,0 +1,386 @@
+"""
+Client Module
+Shared, pooled LLM client used by every agent module
+"""
+from anthropic import Anthropic, AsyncAnthropic, DefaultAsyncHttpxClient, DefaultHttpxClient
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Type
+from pydantic import BaseModel
+import asyncio
+import json
+import threading
+import httpx
+
+from .routing import DEFAULT_MODEL, ModelRouter
+from .scheduler import RequestScheduler
+from .schemas import tool_definition
+from .singleflight import SingleFlight, request_key
+
+# anthropic 0.40 exposes prompt caching as a beta; the header enables cache_control markers
+PROMPT_CACHING_BETA = "prompt-caching-2024-07-31"
+CACHE_CONTROL = {"type": "ephemeral"}
+
+USAGE_FIELDS = ("input_tokens", "output_tokens", "cache_creation_input_tokens", "cache_read_input_tokens")
+
+
+@dataclass
+class LLMRequest:
+    """A single model call, described independently of how it is executed"""
+    method: str
+    prompt: str = ""
+    max_tokens: int = 4000
+    messages: Optional[List[Dict]] = None
+    system: Optional[str] = None
+    # None lets the client's ModelRouter choose from the method
+    model: Optional[str] = None
+    parse_json: bool = True
+    # Output schema; the model is forced to answer through a tool taking this input
+    schema: Optional[Type[BaseModel]] = None
+    # Stable material (e.g. the project snapshot) sent ahead of the prompt
+    context: Optional[str] = None
+    # Mark the stable prefix (tools, system, context) as cacheable
+    cache_prefix: bool = True
+    # Scheduling class (interactive, on_demand, batch); None derives it from the method
+    priority: Optional[str] = None
+
+    def build_messages(self) -> List[Dict]:
+        """Messages payload for the API (a single user turn unless given explicitly)"""
+        if self.messages is not None:
+            messages = self.messages
+            if self.cache_prefix and messages:
+                # Cache the conversation so far; the next turn reads it back
+                messages = messages[:-1] + [_with_cache_control(messages[-1])]
+            return messages
+        if self.context:
+            context_block = {"type": "text", "text": self.context}
+            if self.cache_prefix:
+                context_block["cache_control"] = CACHE_CONTROL
+            return [{"role": "user", "content": [context_block, {"type": "text", "text": self.prompt}]}]
+        return [{"role": "user", "content": self.prompt}]
+
+    def to_api_kwargs(self) -> Dict[str, Any]:
+        """
+        Keyword arguments for messages.create
+        The stable prefix comes first (tools, system, context) so cache markers cover it
+        """
+        kwargs = {
+            "model": self.model or DEFAULT_MODEL,
+            "max_tokens": self.max_tokens,
+            "messages": self.build_messages(),
+        }
+        if self.system:
+            kwargs["system"] = self.system
+            if self.cache_prefix:
+                kwargs["system"] = [{"type": "text", "text": self.system, "cache_control": CACHE_CONTROL}]
+        if self.schema is not None:
+            tool = tool_definition(self.method, self.schema)
+            if self.cache_prefix:
+                tool["cache_control"] = CACHE_CONTROL
+            kwargs["tools"] = [tool]
+            kwargs["tool_choice"] = {"type": "tool", "name": self.method}
+        return kwargs
+
+    def extra_headers(self) -> Dict[str, str]:
+        """Headers the request needs besides the API kwargs"""
+        if self.cache_prefix:
+            return {"anthropic-beta": PROMPT_CACHING_BETA}
+        return {}
+
+
+@dataclass
+class LLMResponse:
+    """Plain result of a model call"""
+    text: str
+    model: str
+    usage: Dict[str, int] = field(default_factory=dict)
+    stop_reason: Optional[str] = None
+    cached: bool = False
+
+    @classmethod
+    def from_message(cls, message) -> "LLMResponse":
+        # A structured (tool call) answer is carried as its JSON input text
+        tool_inputs = [block.input for block in message.content if getattr(block, "type", None) == "tool_use"]
+        if tool_inputs:
+            text = json.dumps(tool_inputs[0])
+        else:
+            text = "".join(
+                block.text for block in message.content if getattr(block, "type", None) == "text"
+            )
+        return cls(
+            text=text,
+            model=message.model,
+            # Cache token counts are only reported when prompt caching is in play
+            usage={key: getattr(message.usage, key, None) or 0 for key in USAGE_FIELDS},
+            stop_reason=message.stop_reason,
+        )
+
+
+@dataclass
+class StreamEvent:
+    """
+    One step of a streamed completion:
+    message_start, then delta events carrying text (or partial tool input JSON),
+    then message_end with the full response
+    """
+    type: str
+    text: str = ""
+    response: Optional[LLMResponse] = None
+    data: Dict[str, Any] = field(default_factory=dict)
+
+
+def replay_stream(response: LLMResponse) -> Iterator[StreamEvent]:
+    """Stream events for an already complete response (e.g. a cache hit)"""
+    yield StreamEvent("message_start")
+    if response.text:
+        yield StreamEvent("delta", response.text)
+    yield StreamEvent("message_end", response=response)
+
+
+def _with_cache_control(message: Dict) -> Dict:
+    """Copy of a message whose last content block carries a cache marker"""
+    content = message["content"]
+    if isinstance(content, str):
+        blocks = [{"type": "text", "text": content}]
+    else:
+        blocks = [dict(block) for block in content]
+    if blocks:
+        blocks[-1]["cache_control"] = CACHE_CONTROL
+    return {**message, "content": blocks}
+
+
+def _delta_text(event) -> str:
+    """Text carried by a raw stream event: answer text or a fragment of tool input JSON"""
+    if event.type == "text":
+        return event.text
+    if event.type == "input_json":
+        return event.partial_json
+    return ""
+
+
+class LLMClient:
+    """
+    One shared client for all agent modules.
+
+    Holds a single bounded, keep-alive HTTP pool per execution mode (sync and
+    async). Every call is admitted by a RequestScheduler, which orders requests
+    by priority and enforces the concurrency limit and rate budgets.
+    An optional ResponseCache short-circuits repeated identical requests, and
+    identical complete() calls already in flight share one API call.
+    """
+
+    def __init__(self, api_key: str, max_concurrency: int = 8,
+                 max_connections: int = 20, max_keepalive_connections: int = 10,
+                 keepalive_expiry: float = 30.0, timeout: float = 600.0,
+                 max_retries: int = 2, base_url: Optional[str] = None,
+                 cache=None, requests_per_minute: Optional[int] = None,
+                 tokens_per_minute: Optional[int] = None,
+                 scheduler: Optional[RequestScheduler] = None,
+                 router: Optional[ModelRouter] = None,
+                 transport: Optional[httpx.BaseTransport] = None):
+        self.api_key = api_key
+        self.cache = cache
+        self.max_concurrency = max_concurrency
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        # Replaces the network, e.g. with a FakeLLMBackend for offline runs
+        self.transport = transport
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+
+        # Fills in the model of requests that do not name one
+        self.router = router or ModelRouter.from_env()
+
+        # Shared by sync and async calls, so both draw on the same budgets
+        self.scheduler = scheduler or RequestScheduler(
+            max_concurrency, requests_per_minute=requests_per_minute, tokens_per_minute=tokens_per_minute
+        )
+
+        self._sync_client: Optional[Anthropic] = None
+        self._sync_lock = threading.Lock()
+
+        # Identical requests in flight at the same time share one call
+        self.flights = SingleFlight()
+
+        # Token totals over all API calls (cache hits excluded)
+        self._usage = {key: 0 for key in USAGE_FIELDS}
+        self._usage_lock = threading.Lock()
+
+        # The async client is bound to the event loop that created it
+        self._async_client: Optional[AsyncAnthropic] = None
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def sync_client(self) -> Anthropic:
+        """Lazily built synchronous client sharing one connection pool"""
+        with self._sync_lock:
+            if self._sync_client is None:
+                self._sync_client = Anthropic(
+                    api_key=self.api_key,
+                    base_url=self.base_url,
+                    timeout=self.timeout,
+                    max_retries=self.max_retries,
+                    http_client=DefaultHttpxClient(limits=self.limits, transport=self.transport)
+                )
+            return self._sync_client
+
+    @property
+    def async_client(self) -> AsyncAnthropic:
+        """Async client for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_loop is not loop:
+            self._async_client = AsyncAnthropic(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                timeout=self.timeout,
+                max_retries=self.max_retries,
+                http_client=DefaultAsyncHttpxClient(limits=self.limits, transport=self.transport)
+            )
+            self._async_loop = loop
+        return self._async_client
+
+    def complete(self, request: LLMRequest) -> LLMResponse:
+        """Run a request on the shared synchronous pool"""
+        request = self.router.route(request)
+        cache_key, cached = self._cache_lookup(request)
+        if cached is not None:
+            return cached
+        return self.flights.do(cache_key or request_key(request), lambda: self._create(request, cache_key))
+
+    def _create(self, request: LLMRequest, cache_key: Optional[str]) -> LLMResponse:
+        with self.scheduler.slot(request) as ticket:
+            message = self.sync_client.messages.create(
+                **request.to_api_kwargs(), extra_headers=request.extra_headers()
+            )
+            response = LLMResponse.from_message(message)
+            ticket.record(response)
+        self._record_usage(response)
+
+        self._cache_store(cache_key, response)
+        return response
+
+    async def complete_async(self, request: LLMRequest) -> LLMResponse:
+        """Run a request on the shared async pool once the scheduler admits it"""
+        request = self.router.route(request)
+        cache_key, cached = self._cache_lookup(request)
+        if cached is not None:
+            return cached
+        return await self.flights.do_async(
+            cache_key or request_key(request), lambda: self._create_async(request, cache_key)
+        )
+
+    async def _create_async(self, request: LLMRequest, cache_key: Optional[str]) -> LLMResponse:
+        async with self.scheduler.slot_async(request) as ticket:
+            message = await self.async_client.messages.create(
+                **request.to_api_kwargs(), extra_headers=request.extra_headers()
+            )
+            response = LLMResponse.from_message(message)
+            ticket.record(response)
+        self._record_usage(response)
+
+        self._cache_store(cache_key, response)
+        return response
+
+    def stream(self, request: LLMRequest) -> Iterator[StreamEvent]:
+        """Run a request on the synchronous pool, yielding text deltas as they arrive"""
+        request = self.router.route(request)
+        cache_key, cached = self._cache_lookup(request)
+        if cached is not None:
+            yield from replay_stream(cached)
+            return
+
+        with self.scheduler.slot(request) as ticket:
+            with self.sync_client.messages.stream(
+                    **request.to_api_kwargs(), extra_headers=request.extra_headers()
+            ) as stream:
+                yield StreamEvent("message_start")
+                for event in stream:
+                    text = _delta_text(event)
+                    if text:
+                        yield StreamEvent("delta", text)
+                message = stream.get_final_message()
+            response = LLMResponse.from_message(message)
+            ticket.record(response)
+        self._record_usage(response)
+
+        self._cache_store(cache_key, response)
+        yield StreamEvent("message_end", response=response)
+
+    async def stream_async(self, request: LLMRequest) -> AsyncIterator[StreamEvent]:
+        """Run a request on the async pool, yielding text deltas as they arrive"""
+        request = self.router.route(request)
+        cache_key, cached = self._cache_lookup(request)
+        if cached is not None:
+            for event in replay_stream(cached):
+                yield event
+            return
+
+        async with self.scheduler.slot_async(request) as ticket:
+            async with self.async_client.messages.stream(
+                    **request.to_api_kwargs(), extra_headers=request.extra_headers()
+            ) as stream:
+                yield StreamEvent("message_start")
+                async for event in stream:
+                    text = _delta_text(event)
+                    if text:
+                        yield StreamEvent("delta", text)
+                message = await stream.get_final_message()
+            response = LLMResponse.from_message(message)
+            ticket.record(response)
+        self._record_usage(response)
+
+        self._cache_store(cache_key, response)
+        yield StreamEvent("message_end", response=response)
+
+    def usage_stats(self) -> Dict[str, int]:
+        """Token totals across calls, including prompt cache reads and writes"""
+        with self._usage_lock:
+            return dict(self._usage)
+
+    def _record_usage(self, response: LLMResponse):
+        with self._usage_lock:
+            for key in USAGE_FIELDS:
+                self._usage[key] += response.usage.get(key, 0)
+
+    def cache_stats(self) -> Dict:
+        """Hit/miss counters of the response cache (empty if caching is off)"""
+        return self.cache.stats() if self.cache is not None else {}
+
+    def routing_stats(self) -> Dict:
+        """Requests routed per model and validation escalations per method"""
+        return self.router.stats()
+
+    def scheduler_stats(self) -> Dict:
+        """Queue depths, concurrency limit and rate budget usage of the scheduler"""
+        return self.scheduler.stats()
+
+    def flight_stats(self) -> Dict:
+        """Counters of single-flight request coalescing"""
+        return self.flights.stats()
+
+    def _cache_lookup(self, request: LLMRequest):
+        if self.cache is None or not self.cache.is_enabled_for(request.method):
+            return None, None
+        key = self.cache.key_for(request)
+        return key, self.cache.get(key)
+
+    def _cache_store(self, key: Optional[str], response: LLMResponse):
+        # Truncated completions are not worth replaying
+        if key is not None and response.stop_reason != "max_tokens":
+            self.cache.set(key, response)
+
+    def close(self):
+        """Release the synchronous connection pool"""
+        if self._sync_client is not None:
+            self._sync_client.close()
+            self._sync_client = None
+
+    async def aclose(self):
+        """Release the async connection pool"""
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
+            self._async_loop = None
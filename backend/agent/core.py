@@ -1,31 +1,60 @@
 
-from anthropic import Anthropic
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional, Tuple
+import asyncio
 import json
 
 
+from .batch import BatchBackend, ProgressCallback, ReportBatch
+from .cache import ResponseCache
+from .client import LLMClient, LLMRequest, StreamEvent
 from .planner import ProjectPlanner
 from .tracker import ProgressTracker
 from .report_generator import ReportGenerator
 from .executor import TaskExecutor
+from .memory import DEFAULT_INPUT_BUDGET, DEFAULT_RECENT_TURNS, ConversationMemory
 from .summarizer import ProjectSummarizer
 from .tools import DateTimeTools, CalculationTools, DataFormatter
 
+# Per-call timeout (seconds) for fanned-out analyses
+DEFAULT_SECTION_TIMEOUT = 60.0
+
+# Receives (stage_name, result) as each pipeline stage finishes
+StageCallback = Callable[[str, Dict], None]
+
+# Stage name used for plan elements streamed before the full plan is parsed
+PLAN_ITEM_STAGE = "project_plan_item"
+
 class ProjectManagementAgent:
     
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, llm_client: Optional[LLMClient] = None,
+                 max_concurrency: int = 8, cache: Optional[ResponseCache] = None,
+                 memory_turns: int = DEFAULT_RECENT_TURNS, memory_budget: int = DEFAULT_INPUT_BUDGET,
+                 requests_per_minute: Optional[int] = None, tokens_per_minute: Optional[int] = None):
         self.api_key = api_key
-        self.client = Anthropic(api_key=api_key)
+        
+        # One pooled, cached client shared by every module
+        if llm_client is None:
+            llm_client = LLMClient(
+                api_key,
+                max_concurrency=max_concurrency,
+                cache=cache if cache is not None else ResponseCache(),
+                requests_per_minute=requests_per_minute,
+                tokens_per_minute=tokens_per_minute
+            )
+        self.client = llm_client
         
         # Initialize all modules
-        self.planner = ProjectPlanner(api_key)
-        self.tracker = ProgressTracker(api_key)
-        self.report_generator = ReportGenerator(api_key)
-        self.executor = TaskExecutor(api_key)
-        self.summarizer = ProjectSummarizer(api_key)
+        self.planner = ProjectPlanner(api_key, self.client)
+        self.tracker = ProgressTracker(api_key, self.client)
+        self.report_generator = ReportGenerator(api_key, self.client)
+        self.executor = TaskExecutor(api_key, self.client)
+        self.summarizer = ProjectSummarizer(api_key, self.client)
         
-        self.conversation_history = []
+        # Recent turns verbatim, older ones folded into a summary, within a token budget
+        self.memory = ConversationMemory(self.summarizer.summarize_conversation, memory_turns, memory_budget)
         self.current_project_id = None
         
         
@@ -65,66 +94,196 @@ Always be proactive in identifying potential issues and suggesting solutions."""
         """
         # Parse user intent
         intent_data = self.executor.parse_user_intent(user_message, project_context)
-        intent = intent_data.get("intent")
         
+        request = self._prepare_chat(user_message, project_context)
+        try:
+            response = self.client.complete(request)
+        except BaseException:
+            self._abandon_chat()
+            raise
+        
+        return self._finish_chat(response, intent_data)
+    
+    async def chat_async(self, user_message: str, project_context: Optional[Dict] = None) -> Dict:
+        """
+        Async variant of chat
+        """
+        intent_data = await self.executor.parse_user_intent_async(user_message, project_context)
+        
+        request = self._prepare_chat(user_message, project_context)
+        try:
+            response = await self.client.complete_async(request)
+        except BaseException:
+            self._abandon_chat()
+            raise
+        
+        return self._finish_chat(response, intent_data)
+    
+    def stream_chat(self, user_message: str, project_context: Optional[Dict] = None) -> Iterator[StreamEvent]:
+        """
+        Streaming variant of chat
+        Yields message_start, delta events with response text, then message_end
+        carrying the full response, usage and (in data) the parsed intent
+        """
+        intent_data = self.executor.parse_user_intent(user_message, project_context)
+        request = self._prepare_chat(user_message, project_context)
+        
+        finished = False
+        try:
+            for event in self.client.stream(request):
+                if event.type == "message_end":
+                    result = self._finish_chat(event.response, intent_data)
+                    event.data["intent"] = result["intent"]
+                    finished = True
+                yield event
+        finally:
+            if not finished:
+                self._abandon_chat()
+    
+    async def stream_chat_async(self, user_message: str,
+                                project_context: Optional[Dict] = None) -> AsyncIterator[StreamEvent]:
+        """
+        Async variant of stream_chat; intent parsing runs alongside the reply stream
+        """
+        intent_task = asyncio.create_task(self.executor.parse_user_intent_async(user_message, project_context))
+        request = self._prepare_chat(user_message, project_context)
+        
+        finished = False
+        try:
+            async for event in self.client.stream_async(request):
+                if event.type == "message_end":
+                    try:
+                        intent_data = await intent_task
+                    except Exception as e:
+                        intent_data = {"intent": None, "error": str(e)}
+                    result = self._finish_chat(event.response, intent_data)
+                    event.data["intent"] = result["intent"]
+                    finished = True
+                yield event
+        finally:
+            if not finished:
+                intent_task.cancel()
+                self._abandon_chat()
+    
+    def _abandon_chat(self):
+        """Drop the user turn of a reply that never completed so history stays alternating"""
+        self.memory.discard_last("user")
+    
+    def _prepare_chat(self, user_message: str, project_context: Optional[Dict] = None) -> LLMRequest:
         # Add context to message
         full_message = user_message
         if project_context:
             full_message += f"\n\n[Project Context Available]"
         
-        # Add to conversation history
-        self.conversation_history.append({
-            "role": "user",
-            "content": full_message
-        })
+        # Add to conversation history; the request carries the budgeted view of it
+        self.memory.append("user", full_message)
+        system, messages, _ = self.memory.build(self.system_prompt)
         
-        # Get response from Claude
-        response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
+        return LLMRequest(
+            "chat",
             max_tokens=4000,
-            system=self.system_prompt,
-            messages=self.conversation_history
+            system=system,
+            messages=messages,
+            parse_json=False
         )
+    
+    def _finish_chat(self, response, intent_data: Dict) -> Dict:
+        assistant_message = response.text
         
-        assistant_message = response.content[0].text
-        
-        # Add to history
-        self.conversation_history.append({
-            "role": "assistant",
-            "content": assistant_message
-        })
+        # Add to history, then fold older turns into the summary in the background
+        self.memory.append("assistant", assistant_message)
+        memory_report = self.memory.last_report
+        self.memory.compact()
         
         return {
             "response": assistant_message,
-            "intent": intent,
-            "usage": {
-                "input_tokens": response.usage.input_tokens,
-                "output_tokens": response.usage.output_tokens
-            }
+            "intent": intent_data.get("intent"),
+            "usage": response.usage,
+            "memory": memory_report
         }
     
     
     
-    def create_project(self, project_goal: str, constraints: Optional[Dict] = None) -> Dict:
+    def create_project(self, project_goal: str, constraints: Optional[Dict] = None,
+                       parallel: bool = True, on_stage: Optional[StageCallback] = None,
+                       timeout: Optional[float] = None) -> Dict:
+        """
+        Create a project plan with timeline, resource estimate and critical path
         
+        Once the plan exists, the three dependent stages only need the plan, so
+        with parallel=True they run at the same time. `on_stage(stage, result)`
+        is called as each stage finishes, starting with "project_plan"; before that,
+        "project_plan_item" fires with {"key", "item"} as each phase streams in.
+        """
         # Use planner to break down goals
-        project_plan = self.planner.break_down_goals(project_goal, constraints)
+        on_item = None
+        if on_stage:
+            on_item = lambda key, item: on_stage(PLAN_ITEM_STAGE, {"key": key, "item": item})
+        project_plan = self.planner.break_down_goals(project_goal, constraints, on_item=on_item)
+        if on_stage:
+            on_stage("project_plan", project_plan)
+        
+        stages = {
+            "timeline": lambda: self.planner.create_timeline(project_plan),
+            "resources": lambda: self.planner.estimate_resources(project_plan),
+            "critical_path": lambda: self.planner.identify_critical_path(project_plan)
+        }
+        
+        if parallel:
+            results = self._fan_out_threads(stages, timeout, on_result=on_stage)
+        else:
+            results = self._run_sequential(stages, on_result=on_stage)
         
-        # Create timeline
-        timeline = self.planner.create_timeline(project_plan)
+        return {"project_plan": project_plan, **results}
+    
+    async def create_project_async(self, project_goal: str, constraints: Optional[Dict] = None,
+                                   on_stage: Optional[StageCallback] = None,
+                                   timeout: Optional[float] = None) -> Dict:
+        """Async variant of create_project"""
+        results = {}
+        async for update in self.stream_create_project(project_goal, constraints, timeout):
+            if update["stage"] != PLAN_ITEM_STAGE:
+                results[update["stage"]] = update["result"]
+            if on_stage:
+                on_stage(update["stage"], update["result"])
         
-        # Estimate resources
-        resources = self.planner.estimate_resources(project_plan)
+        return self._with_partial_flag(results)
+    
+    async def stream_create_project(self, project_goal: str, constraints: Optional[Dict] = None,
+                                    timeout: Optional[float] = None) -> AsyncIterator[Dict]:
+        """
+        Yield {"stage", "result"} for each creation stage as soon as it finishes
         
-        # Identify critical path
-        critical_path = self.planner.identify_critical_path(project_plan)
+        While the plan is being generated, each phase is yielded as a
+        "project_plan_item" stage ({"key", "item"}) the moment it closes.
+        """
+        items: asyncio.Queue = asyncio.Queue()
+        plan_task = asyncio.create_task(self.planner.break_down_goals_async(
+            project_goal, constraints,
+            on_item=lambda key, item: items.put_nowait({"key": key, "item": item})
+        ))
+        try:
+            while True:
+                getter = asyncio.ensure_future(items.get())
+                await asyncio.wait({plan_task, getter}, return_when=asyncio.FIRST_COMPLETED)
+                if not getter.done():
+                    getter.cancel()
+                    break
+                yield {"stage": PLAN_ITEM_STAGE, "result": getter.result()}
+            while not items.empty():
+                yield {"stage": PLAN_ITEM_STAGE, "result": items.get_nowait()}
+            project_plan = plan_task.result()
+        finally:
+            plan_task.cancel()
+        yield {"stage": "project_plan", "result": project_plan}
         
-        return {
-            "project_plan": project_plan,
-            "timeline": timeline,
-            "resources": resources,
-            "critical_path": critical_path
+        stages = {
+            "timeline": self.planner.create_timeline_async(project_plan),
+            "resources": self.planner.estimate_resources_async(project_plan),
+            "critical_path": self.planner.identify_critical_path_async(project_plan)
         }
+        async for name, result in self._iter_fan_out_async(stages, timeout):
+            yield {"stage": name, "result": result}
     
     def update_project_plan(self, current_plan: Dict, adjustments: Dict) -> Dict:
         """
@@ -132,6 +291,10 @@ Always be proactive in identifying potential issues and suggesting solutions."""
         """
         return self.planner.adjust_timeline(current_plan, adjustments)
     
+    async def update_project_plan_async(self, current_plan: Dict, adjustments: Dict) -> Dict:
+        """Async variant of update_project_plan"""
+        return await self.planner.adjust_timeline_async(current_plan, adjustments)
+    
     #  PROGRESS TRACKING 
     
     def update_task(self, task_id: str, status: str, project_data: Dict,
@@ -142,6 +305,8 @@ Always be proactive in identifying potential issues and suggesting solutions."""
         update_result = self.tracker.update_task_status(
             task_id, status, project_data, notes, actual_hours
         )
+        self.executor.record_task_status(project_data, task_id, status)
+        self.tracker.record_task_status(project_data, task_id, status)
         
         # Get updated completion percentage
         completion = self.tracker.calculate_completion_percentage(project_data)
@@ -151,28 +316,61 @@ Always be proactive in identifying potential issues and suggesting solutions."""
             "completion_metrics": completion
         }
     
-    def get_project_status(self, project_data: Dict) -> Dict:
+    async def update_task_async(self, task_id: str, status: str, project_data: Dict,
+                                notes: Optional[str] = None, actual_hours: Optional[float] = None) -> Dict:
+        """Async variant of update_task"""
+        update_result = await self.tracker.update_task_status_async(
+            task_id, status, project_data, notes, actual_hours
+        )
+        self.executor.record_task_status(project_data, task_id, status)
+        self.tracker.record_task_status(project_data, task_id, status)
+        completion = await self.tracker.calculate_completion_percentage_async(project_data)
+        
+        return {
+            "update_result": update_result,
+            "completion_metrics": completion
+        }
+    
+    def get_project_status(self, project_data: Dict, parallel: bool = True,
+                           timeout: Optional[float] = DEFAULT_SECTION_TIMEOUT) -> Dict:
         """
         Get comprehensive project status
-        """
-        # Calculate completion
-        completion = self.tracker.calculate_completion_percentage(project_data)
         
-        # Monitor deadlines
-        deadline_status = self.tracker.monitor_deadlines(project_data)
-        
-        # Identify blockers
-        blockers = self.tracker.identify_blockers(project_data)
+        With parallel=True the four independent analyses run at the same time on
+        worker threads; sections that fail or exceed `timeout` seconds are
+        replaced by an error marker and the rest are still returned.
+        """
+        sections = {
+            "completion": lambda: self.tracker.calculate_completion_percentage(project_data),
+            "deadline_status": lambda: self.tracker.monitor_deadlines(project_data),
+            "blockers": lambda: self.tracker.identify_blockers(project_data),
+            "metrics": lambda: self.summarizer.aggregate_metrics(project_data)
+        }
         
-        # Get summary
-        summary = self.summarizer.aggregate_metrics(project_data)
+        if not parallel:
+            return self._run_sequential(sections)
         
-        return {
-            "completion": completion,
-            "deadline_status": deadline_status,
-            "blockers": blockers,
-            "metrics": summary
+        return self._fan_out_threads(sections, timeout)
+    
+    async def get_project_status_async(self, project_data: Dict,
+                                       timeout: Optional[float] = DEFAULT_SECTION_TIMEOUT) -> Dict:
+        """
+        Async variant of get_project_status; the four analyses are issued concurrently
+        """
+        sections = {
+            "completion": self.tracker.calculate_completion_percentage_async(project_data),
+            "deadline_status": self.tracker.monitor_deadlines_async(project_data),
+            "blockers": self.tracker.identify_blockers_async(project_data),
+            "metrics": self.summarizer.aggregate_metrics_async(project_data)
         }
+        
+        return await self._fan_out_async(sections, timeout)
+    
+    def monitor_portfolio_deadlines(self, projects: List[Dict], current_date: Optional[str] = None) -> Dict:
+        """
+        Overdue, at-risk and upcoming deadlines across all projects
+        """
+        return self.tracker.monitor_portfolio_deadlines(projects, current_date)
     
     def track_milestone(self, milestone_name: str, project_data: Dict) -> Dict:
         """
@@ -180,6 +378,10 @@ Always be proactive in identifying potential issues and suggesting solutions."""
         """
         return self.tracker.track_milestone_completion(milestone_name, project_data)
     
+    async def track_milestone_async(self, milestone_name: str, project_data: Dict) -> Dict:
+        """Async variant of track_milestone"""
+        return await self.tracker.track_milestone_completion_async(milestone_name, project_data)
+    
     #  REPORT GENERATION 
     
     def generate_status_report(self, project_data: Dict, report_type: str = "weekly") -> str:
@@ -188,36 +390,90 @@ Always be proactive in identifying potential issues and suggesting solutions."""
         """
         return self.report_generator.generate_status_report(project_data, report_type)
     
+    async def generate_status_report_async(self, project_data: Dict, report_type: str = "weekly") -> str:
+        """Async variant of generate_status_report"""
+        return await self.report_generator.generate_status_report_async(project_data, report_type)
+    
+    def stream_status_report(self, project_data: Dict, report_type: str = "weekly") -> Iterator[StreamEvent]:
+        """
+        Stream a status report as it is written (message_start, delta, message_end)
+        """
+        return self.report_generator.stream_status_report(project_data, report_type)
+    
+    def stream_status_report_async(self, project_data: Dict, report_type: str = "weekly") -> AsyncIterator[StreamEvent]:
+        """Async variant of stream_status_report"""
+        return self.report_generator.stream_status_report_async(project_data, report_type)
+    
+    def create_portfolio_report_batch(self, projects: List[Dict], report_type: str = "weekly",
+                                      backend: Optional[BatchBackend] = None,
+                                      reports_dir: str = "reports") -> ReportBatch:
+        """
+        Status reports for many projects as one batch job; call submit() and poll() or wait()
+        """
+        return self.report_generator.create_report_batch(projects, report_type, backend, reports_dir)
+    
+    def generate_portfolio_reports(self, projects: List[Dict], report_type: str = "weekly",
+                                   backend: Optional[BatchBackend] = None, reports_dir: str = "reports",
+                                   on_progress: Optional[ProgressCallback] = None,
+                                   timeout: Optional[float] = None) -> Dict:
+        """
+        Generate status reports for a whole portfolio through the batch interface
+        Blocks until the batch ends (or timeout); each report is written to reports_dir as it completes
+        """
+        batch = self.create_portfolio_report_batch(projects, report_type, backend, reports_dir)
+        batch.submit()
+        return batch.wait(on_progress, timeout)
+    
     def generate_executive_summary(self, project_data: Dict) -> Dict:
         """
         Generate executive summary
         """
         return self.report_generator.generate_executive_summary(project_data)
     
+    async def generate_executive_summary_async(self, project_data: Dict) -> Dict:
+        """Async variant of generate_executive_summary"""
+        return await self.report_generator.generate_executive_summary_async(project_data)
+    
     def generate_risk_report(self, project_data: Dict) -> Dict:
         """
         Generate risk and bottleneck analysis
         """
         return self.report_generator.identify_risks_and_bottlenecks(project_data)
     
+    async def generate_risk_report_async(self, project_data: Dict) -> Dict:
+        """Async variant of generate_risk_report"""
+        return await self.report_generator.identify_risks_and_bottlenecks_async(project_data)
+    
     def generate_progress_summary(self, project_data: Dict, period: str = "this_week") -> Dict:
         """
         Generate progress summary for time period
         """
         return self.report_generator.create_progress_summary(project_data, period)
     
+    async def generate_progress_summary_async(self, project_data: Dict, period: str = "this_week") -> Dict:
+        """Async variant of generate_progress_summary"""
+        return await self.report_generator.create_progress_summary_async(project_data, period)
+    
     def generate_milestone_report(self, milestone_name: str, project_data: Dict) -> str:
         """
         Generate milestone-specific report
         """
         return self.report_generator.generate_milestone_report(milestone_name, project_data)
     
+    async def generate_milestone_report_async(self, milestone_name: str, project_data: Dict) -> str:
+        """Async variant of generate_milestone_report"""
+        return await self.report_generator.generate_milestone_report_async(milestone_name, project_data)
+    
     def get_dashboard_metrics(self, project_data: Dict) -> Dict:
         """
         Get metrics for dashboard visualization
         """
         return self.report_generator.generate_metrics_dashboard(project_data)
     
+    async def get_dashboard_metrics_async(self, project_data: Dict) -> Dict:
+        """Async variant of get_dashboard_metrics"""
+        return await self.report_generator.generate_metrics_dashboard_async(project_data)
+    
     # TASK EXECUTION 
     
     def suggest_next_tasks(self, project_data: Dict, team_capacity: Optional[Dict] = None) -> Dict:
@@ -226,24 +482,46 @@ Always be proactive in identifying potential issues and suggesting solutions."""
         """
         return self.executor.suggest_next_tasks(project_data, team_capacity)
     
+    async def suggest_next_tasks_async(self, project_data: Dict, team_capacity: Optional[Dict] = None) -> Dict:
+        """Async variant of suggest_next_tasks"""
+        return await self.executor.suggest_next_tasks_async(project_data, team_capacity)
+    
     def validate_task_dependencies(self, task_id: str, project_data: Dict) -> Dict:
         """
         Validate if task can be started
         """
         return self.executor.validate_task_dependencies(task_id, project_data)
     
+    async def validate_task_dependencies_async(self, task_id: str, project_data: Dict) -> Dict:
+        """Async variant of validate_task_dependencies"""
+        return await self.executor.validate_task_dependencies_async(task_id, project_data)
+    
+    def validate_all_task_dependencies(self, project_data: Dict) -> Dict:
+        """
+        Validate dependencies of every task in the project (e.g. for a Kanban board)
+        """
+        return self.executor.validate_all_dependencies(project_data)
+    
     def handle_scope_change(self, change_request: Dict, project_data: Dict) -> Dict:
         """
         Analyze scope change impact
         """
         return self.executor.handle_scope_change(change_request, project_data)
     
+    async def handle_scope_change_async(self, change_request: Dict, project_data: Dict) -> Dict:
+        """Async variant of handle_scope_change"""
+        return await self.executor.handle_scope_change_async(change_request, project_data)
+    
     def assign_task(self, task_id: str, available_team: List[Dict], project_data: Dict) -> Dict:
         """
         Suggest best team member for task
         """
         return self.executor.coordinate_team_assignment(task_id, available_team, project_data)
     
+    async def assign_task_async(self, task_id: str, available_team: List[Dict], project_data: Dict) -> Dict:
+        """Async variant of assign_task"""
+        return await self.executor.coordinate_team_assignment_async(task_id, available_team, project_data)
+    
     # SUMMARIZATION 
     
     def summarize_for_audience(self, project_data: Dict, audience: str = "team") -> str:
@@ -253,24 +531,40 @@ Always be proactive in identifying potential issues and suggesting solutions."""
         """
         return self.summarizer.summarize_project_status(project_data, audience)
     
+    async def summarize_for_audience_async(self, project_data: Dict, audience: str = "team") -> str:
+        """Async variant of summarize_for_audience"""
+        return await self.summarizer.summarize_project_status_async(project_data, audience)
+    
     def get_quick_summary(self, project_data: Dict) -> str:
         """
         Get brief executive brief (elevator pitch)
         """
         return self.summarizer.create_executive_brief(project_data)
     
+    async def get_quick_summary_async(self, project_data: Dict) -> str:
+        """Async variant of get_quick_summary"""
+        return await self.summarizer.create_executive_brief_async(project_data)
+    
     def summarize_phase(self, phase_name: str, project_data: Dict) -> Dict:
         """
         Summarize specific project phase
         """
         return self.summarizer.summarize_phase(phase_name, project_data)
     
+    async def summarize_phase_async(self, phase_name: str, project_data: Dict) -> Dict:
+        """Async variant of summarize_phase"""
+        return await self.summarizer.summarize_phase_async(phase_name, project_data)
+    
     def get_highlights(self, project_data: Dict, period: str = "this_week") -> Dict:
         """
         Get key highlights for period
         """
         return self.summarizer.generate_highlights(project_data, period)
     
+    async def get_highlights_async(self, project_data: Dict, period: str = "this_week") -> Dict:
+        """Async variant of get_highlights"""
+        return await self.summarizer.generate_highlights_async(project_data, period)
+    
     def create_stakeholder_update(self, project_data: Dict, 
                                   stakeholder_interests: List[str]) -> str:
         """
@@ -278,6 +572,11 @@ Always be proactive in identifying potential issues and suggesting solutions."""
         """
         return self.summarizer.create_stakeholder_update(project_data, stakeholder_interests)
     
+    async def create_stakeholder_update_async(self, project_data: Dict, 
+                                        stakeholder_interests: List[str]) -> str:
+        """Async variant of create_stakeholder_update"""
+        return await self.summarizer.create_stakeholder_update_async(project_data, stakeholder_interests)
+    
     # ANALYTICS 
     
     def get_burndown_data(self, project_data: Dict, 
@@ -287,12 +586,21 @@ Always be proactive in identifying potential issues and suggesting solutions."""
         """
         return self.tracker.generate_burndown_data(project_data, historical_data)
     
+    async def get_burndown_data_async(self, project_data: Dict, 
+                               historical_data: Optional[List] = None) -> Dict:
+        """Async variant of get_burndown_data"""
+        return await self.tracker.generate_burndown_data_async(project_data, historical_data)
+    
     def compare_progress_over_time(self, historical_data: List[Dict]) -> Dict:
         """
         Compare project progress over time
         """
         return self.summarizer.compare_progress_over_time(historical_data)
     
+    async def compare_progress_over_time_async(self, historical_data: List[Dict]) -> Dict:
+        """Async variant of compare_progress_over_time"""
+        return await self.summarizer.compare_progress_over_time_async(historical_data)
+    
     def analyze_team_performance(self, project_data: Dict, 
                                 team_data: Optional[Dict] = None) -> Dict:
         """
@@ -300,11 +608,21 @@ Always be proactive in identifying potential issues and suggesting solutions."""
         """
         return self.summarizer.summarize_team_performance(project_data, team_data)
     
+    async def analyze_team_performance_async(self, project_data: Dict, 
+                                      team_data: Optional[Dict] = None) -> Dict:
+        """Async variant of analyze_team_performance"""
+        return await self.summarizer.summarize_team_performance_async(project_data, team_data)
+    
     # UTILITIES 
     
+    @property
+    def conversation_history(self) -> List[Dict]:
+        """Turns kept verbatim (older ones live in memory.summary)"""
+        return self.memory.messages
+    
     def reset_conversation(self):
         """Reset conversation history"""
-        self.conversation_history = []
+        self.memory.clear()
         self.current_project_id = None
     
     def set_current_project(self, project_id: str):
@@ -312,5 +630,106 @@ Always be proactive in identifying potential issues and suggesting solutions."""
         self.current_project_id = project_id
     
     def get_conversation_history(self) -> List[Dict]:
-        """Get conversation history"""
-        return self.conversation_history
\ No newline at end of file
+        """Get conversation history (recent turns verbatim)"""
+        return self.memory.messages
+    
+    def _fan_out_threads(self, sections: Dict[str, Callable[[], Dict]],
+                         timeout: Optional[float],
+                         on_result: Optional[StageCallback] = None) -> Dict:
+        """Run independent calls on threads; return partial results with error markers"""
+        pool = ThreadPoolExecutor(max_workers=len(sections))
+        futures = {pool.submit(run): name for name, run in sections.items()}
+        
+        results = {}
+        try:
+            for future in as_completed(futures, timeout=timeout):
+                name = futures[future]
+                if future.exception() is not None:
+                    results[name] = self._section_error("exception", str(future.exception()))
+                else:
+                    results[name] = future.result()
+                if on_result:
+                    on_result(name, results[name])
+        except FuturesTimeoutError:
+            pass
+        finally:
+            # Do not block on stragglers; their results are discarded
+            pool.shutdown(wait=False, cancel_futures=True)
+        
+        for name in sections:
+            if name not in results:
+                results[name] = self._section_error("timeout", f"No result after {timeout}s")
+        return self._with_partial_flag({name: results[name] for name in sections})
+    
+    def _run_sequential(self, sections: Dict[str, Callable[[], Dict]],
+                        on_result: Optional[StageCallback] = None) -> Dict:
+        """Run calls one after another, with the same error markers as _fan_out_threads"""
+        results = {}
+        for name, run in sections.items():
+            try:
+                results[name] = run()
+            except Exception as e:
+                results[name] = self._section_error("exception", str(e))
+            if on_result:
+                on_result(name, results[name])
+        return self._with_partial_flag(results)
+    
+    async def _fan_out_async(self, sections: Dict[str, Awaitable[Dict]],
+                             timeout: Optional[float]) -> Dict:
+        """Await independent calls concurrently; return partial results with error markers"""
+        results = {name: result async for name, result in self._iter_fan_out_async(sections, timeout)}
+        return self._with_partial_flag({name: results[name] for name in sections})
+    
+    async def _iter_fan_out_async(self, sections: Dict[str, Awaitable[Dict]],
+                                  timeout: Optional[float]) -> AsyncIterator[Tuple[str, Dict]]:
+        """Yield (name, result) pairs in completion order"""
+        async def run(name: str, call: Awaitable[Dict]):
+            try:
+                return name, await asyncio.wait_for(call, timeout)
+            except asyncio.TimeoutError:
+                return name, self._section_error("timeout", f"No result after {timeout}s")
+            except Exception as e:
+                return name, self._section_error("exception", str(e))
+        
+        tasks = [asyncio.ensure_future(run(name, call)) for name, call in sections.items()]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Consumer stopped early: do not leave orphaned requests running
+            for task in tasks:
+                task.cancel()
+    
+    @staticmethod
+    def _section_error(error_type: str, message: str) -> Dict:
+        return {"error": message, "error_type": error_type}
+    
+    @staticmethod
+    def _with_partial_flag(results: Dict) -> Dict:
+        failed = [
+            name for name, value in results.items()
+            if isinstance(value, dict) and "error_type" in value
+        ]
+        results["partial"] = bool(failed)
+        results["failed_sections"] = failed
+        return results
+    
+    def get_cache_stats(self) -> Dict:
+        """Get response cache hit/miss counters"""
+        return self.client.cache_stats()
+    
+    def get_usage_stats(self) -> Dict:
+        """Get token totals, including prompt cache reads and writes"""
+        return self.client.usage_stats()
+    
+    def get_routing_stats(self) -> Dict:
+        """Get requests routed per model and validation escalations per method"""
+        return self.client.routing_stats()
+    
+    def get_scheduler_stats(self) -> Dict:
+        """Get request queue depths per priority, concurrency limit and rate budget usage"""
+        return self.client.scheduler_stats()
+    
+    def get_flight_stats(self) -> Dict:
+        """Get counters of identical in-flight requests that shared one call"""
+        return self.client.flight_stats()
\ No newline at end of file
@@ -0,0 +1,202 @@
+"""
+Critical Path Module
+Graph-based critical path method (CPM) over task dependencies
+"""
+from collections import deque
+import heapq
+from typing import Dict, List
+
+from .metrics import iter_phases
+
+# Floating point tolerance when deciding whether a task has zero slack
+SLACK_EPSILON = 1e-9
+
+# Output size caps so very large plans still produce readable results
+MAX_PARALLEL_GROUPS = 20
+MAX_TASKS_PER_GROUP = 25
+MAX_BOTTLENECKS = 5
+
+
+class DependencyCycleError(ValueError):
+    """Raised when task dependencies form a cycle"""
+
+    def __init__(self, cycle: List[str]):
+        self.cycle = cycle
+        super().__init__(f"Dependency cycle detected: {' -> '.join(cycle)}")
+
+
+class CriticalPathEngine:
+    """
+    Topological sort plus forward/backward passes over a plan's tasks.
+    Durations are estimated_hours; dependencies reference task_ids.
+    """
+
+    def analyze(self, project_plan: Dict) -> Dict:
+        """
+        Same shape as ProjectPlanner.identify_critical_path
+        (critical_path, parallel_opportunities, bottlenecks) plus per-task slack.
+        Raises DependencyCycleError if the dependency graph is not a DAG.
+        """
+        ids, titles, durations, preds, unknown = self._load(project_plan)
+        n = len(ids)
+        succs: List[List[int]] = [[] for _ in range(n)]
+        indegree = [0] * n
+        for v in range(n):
+            for u in preds[v]:
+                succs[u].append(v)
+            indegree[v] = len(preds[v])
+
+        # Kahn's algorithm, relaxing earliest start/finish and depth along the way
+        earliest_start = [0.0] * n
+        earliest_finish = [0.0] * n
+        level = [0] * n
+        queue = deque(v for v in range(n) if indegree[v] == 0)
+        order = []
+        while queue:
+            u = queue.popleft()
+            order.append(u)
+            finish = earliest_finish[u] = earliest_start[u] + durations[u]
+            depth = level[u] + 1
+            for v in succs[u]:
+                if finish > earliest_start[v]:
+                    earliest_start[v] = finish
+                if depth > level[v]:
+                    level[v] = depth
+                indegree[v] -= 1
+                if indegree[v] == 0:
+                    queue.append(v)
+        if len(order) != n:
+            raise DependencyCycleError([ids[v] for v in self._find_cycle(preds, indegree)])
+        project_duration = max(earliest_finish, default=0.0)
+
+        # Backward pass: latest start/finish
+        latest_start = [0.0] * n
+        for v in reversed(order):
+            finish = project_duration
+            for w in succs[v]:
+                if latest_start[w] < finish:
+                    finish = latest_start[w]
+            latest_start[v] = finish - durations[v]
+
+        slack = [latest_start[v] - earliest_start[v] for v in range(n)]
+        critical = [v for v in order if abs(slack[v]) <= SLACK_EPSILON]
+        critical.sort(key=lambda v: (earliest_start[v], earliest_finish[v]))
+
+        return {
+            "critical_path": [
+                {
+                    "task_id": ids[v],
+                    "task_title": titles[v],
+                    "reason": (f"Zero slack: must start at hour {earliest_start[v]:g} and finish "
+                               f"by hour {earliest_finish[v]:g} of {project_duration:g}"),
+                    "impact_if_delayed": "Every hour of delay moves the project finish by the same amount",
+                    "earliest_start": earliest_start[v],
+                    "earliest_finish": earliest_finish[v]
+                }
+                for v in critical
+            ],
+            "parallel_opportunities": self._parallel_groups(order, level, slack, ids),
+            "bottlenecks": self._bottlenecks(succs, slack, ids, titles),
+            "project_duration_hours": project_duration,
+            "task_slack": {ids[v]: slack[v] for v in range(n)},
+            "unknown_dependencies": unknown
+        }
+
+    def _load(self, project_plan: Dict):
+        tasks = []
+        for phase in iter_phases(project_plan):
+            tasks.extend(task for task in phase.get("tasks") or [] if isinstance(task, dict))
+        tasks.extend(task for task in project_plan.get("tasks") or [] if isinstance(task, dict))
+
+        ids: List[str] = []
+        titles: List[str] = []
+        durations: List[float] = []
+        index: Dict[str, int] = {}
+        rows: List[int] = []
+        for task in tasks:
+            task_id = task.get("task_id") or task.get("id") or f"task_{len(ids) + 1}"
+            if not isinstance(task_id, str):
+                task_id = str(task_id)
+            row = index.get(task_id)
+            if row is None:
+                row = index[task_id] = len(ids)
+                ids.append(task_id)
+                titles.append(task.get("title") or "")
+                hours = task.get("estimated_hours") or 0
+                try:
+                    durations.append(max(float(hours), 0.0))
+                except (TypeError, ValueError):
+                    durations.append(0.0)
+            rows.append(row)
+
+        preds: List[List[int]] = [[] for _ in ids]
+        unknown: List[Dict] = []
+        lookup = index.get
+        for task, v in zip(tasks, rows):
+            dependencies = task.get("dependencies")
+            if not dependencies:
+                continue
+            if isinstance(dependencies, str):
+                dependencies = [dependencies]
+            task_preds = preds[v]
+            for dep in dependencies:
+                u = lookup(dep if isinstance(dep, str) else str(dep))
+                if u is None:
+                    unknown.append({"task_id": ids[v], "dependency": dep})
+                elif u != v and u not in task_preds:
+                    task_preds.append(u)
+        return ids, titles, durations, preds, unknown
+
+    @staticmethod
+    def _find_cycle(preds: List[List[int]], indegree: List[int]) -> List[int]:
+        """Walk predecessor edges among unsorted nodes until a node repeats"""
+        remaining = {v for v, degree in enumerate(indegree) if degree > 0}
+        v = next(iter(remaining))
+        seen: Dict[int, int] = {}
+        path: List[int] = []
+        while v not in seen:
+            seen[v] = len(path)
+            path.append(v)
+            v = next(u for u in preds[v] if u in remaining)
+        cycle = path[seen[v]:]
+        cycle.reverse()
+        return cycle + [cycle[0]]
+
+    @staticmethod
+    def _parallel_groups(order: List[int], level: List[int], slack: List[float],
+                         ids: List[str]) -> List[Dict]:
+        """Tasks at the same dependency depth never depend on each other"""
+        by_level: Dict[int, List[int]] = {}
+        for v in order:
+            by_level.setdefault(level[v], []).append(v)
+
+        groups = []
+        for depth in sorted(by_level):
+            members = by_level[depth]
+            if len(members) < 2:
+                continue
+            floating = sum(1 for v in members if slack[v] > SLACK_EPSILON)
+            groups.append({
+                "tasks": [ids[v] for v in members[:MAX_TASKS_PER_GROUP]],
+                "description": (f"{len(members)} tasks at dependency depth {depth} can run in parallel; "
+                                f"{floating} of them have slack"),
+                "total_tasks": len(members)
+            })
+            if len(groups) >= MAX_PARALLEL_GROUPS:
+                break
+        return groups
+
+    @staticmethod
+    def _bottlenecks(succs: List[List[int]], slack: List[float], ids: List[str],
+                     titles: List[str]) -> List[str]:
+        """Critical tasks that gate the most direct successors"""
+        ranked = [
+            (abs(slack[v]) > SLACK_EPSILON, -len(succs[v]), v)
+            for v in range(len(ids)) if len(succs[v]) >= 2
+        ]
+        candidates = [v for _, _, v in heapq.nsmallest(MAX_BOTTLENECKS, ranked)]
+        return [
+            f"{ids[v]} ({titles[v] or 'untitled'}) gates {len(succs[v])} downstream tasks"
+            + (" and is on the critical path" if abs(slack[v]) <= SLACK_EPSILON else "")
+            for v in candidates
+        ]
@@ -0,0 +1,367 @@
+"""
+Deadline Index Module
+Portfolio-wide sorted index of task and milestone deadlines
+"""
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+import threading
+
+from .metrics import iter_phases, milestone_target_date, normalize_priority, normalize_status, parse_day, project_start_date
+
+# Days ahead reported as upcoming / considered at risk
+UPCOMING_HORIZON_DAYS = 14
+AT_RISK_HORIZON_DAYS = 7
+
+# Rough progress implied by a status when a task has no completion_percentage
+STATUS_PROGRESS = {"completed": 100.0, "in_progress": 50.0, "at_risk": 25.0, "blocked": 10.0, "not_started": 0.0}
+
+TASK = "task"
+MILESTONE = "milestone"
+
+# (deadline ordinal, project_id, kind, item_id)
+IndexKey = Tuple[int, str, str, str]
+
+
+@dataclass
+class DeadlineEntry:
+    project_id: str
+    item_id: str
+    kind: str
+    title: str
+    deadline: date
+    status: str = "not_started"
+    priority: str = "medium"
+    phase: Optional[str] = None
+    completion_percentage: Optional[float] = None
+    associated_tasks: Tuple[str, ...] = ()
+
+    @property
+    def key(self) -> IndexKey:
+        return (self.deadline.toordinal(), self.project_id, self.kind, self.item_id)
+
+
+def _discard_key(keys: List[IndexKey], key: IndexKey):
+    position = bisect_left(keys, key)
+    if position < len(keys) and keys[position] == key:
+        del keys[position]
+
+
+class DeadlineIndex:
+    """
+    Sorted array of (deadline, project, kind, id) keys with bisect range queries,
+    plus a sorted key list per project so single-project queries never touch
+    other projects' entries. Task status changes update the index and per-phase
+    counters incrementally. Thread-safe: every update and query holds the index lock.
+    """
+
+    def __init__(self):
+        self._keys: List[IndexKey] = []
+        self._entries: Dict[Tuple[str, str, str], DeadlineEntry] = {}
+        # (project_id, task_id) -> (status, phase) for every task, with or without a deadline
+        self._tasks: Dict[Tuple[str, str], Tuple[str, Optional[str]]] = {}
+        # (project_id, phase) -> [total tasks, completed tasks]
+        self._phase_counts: Dict[Tuple[str, Optional[str]], List[int]] = {}
+        # project_id -> its task ids and phases, so removal is O(project)
+        self._projects: Dict[str, set] = {}
+        self._project_phases: Dict[str, set] = {}
+        # project_id -> that project's slice of _keys, kept sorted for range queries
+        self._project_keys: Dict[str, List[IndexKey]] = {}
+        # Reentrant: index_project reindexes through the public upserts
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._keys)
+
+    #  UPDATES
+
+    def index_project(self, project_id: str, project_data: Dict):
+        """(Re)index every task and milestone of a project"""
+        with self._lock:
+            self.remove_project(project_id)
+            project_start = project_start_date(project_data)
+            for phase in iter_phases(project_data):
+                phase_name = phase.get("name")
+                for task in phase.get("tasks") or []:
+                    self.upsert_task(project_id, task, phase_name)
+                for milestone in phase.get("milestones") or []:
+                    self.upsert_milestone(project_id, milestone, phase_name, project_start)
+            for task in project_data.get("tasks") or []:
+                self.upsert_task(project_id, task)
+            self._projects.setdefault(project_id, set())
+
+    def upsert_task(self, project_id: str, task: Dict, phase: Optional[str] = None):
+        if not isinstance(task, dict) or not (task.get("task_id") or task.get("id")):
+            return
+        task_id = str(task.get("task_id") or task.get("id"))
+        status = normalize_status(task.get("status"))
+        deadline = parse_day(task.get("deadline") or task.get("due_date") or task.get("end_date"))
+        progress = task.get("completion_percentage")
+        with self._lock:
+            previous = self._tasks.get((project_id, task_id))
+            if previous is not None and phase is None:
+                phase = previous[1]
+            self._set_task_state(project_id, task_id, status, phase)
+
+            self._remove_entry(project_id, TASK, task_id)
+            if deadline is None:
+                return
+            self._add_entry(DeadlineEntry(
+                project_id=project_id,
+                item_id=task_id,
+                kind=TASK,
+                title=task.get("title") or "",
+                deadline=deadline,
+                status=status,
+                priority=normalize_priority(task.get("priority")),
+                phase=phase,
+                completion_percentage=float(progress) if progress is not None else None
+            ))
+
+    def upsert_milestone(self, project_id: str, milestone, phase: Optional[str] = None,
+                         project_start: Optional[date] = None):
+        if isinstance(milestone, str):
+            milestone = {"name": milestone}
+        name = milestone.get("name") or milestone.get("milestone_id")
+        if not name:
+            return
+        target = milestone_target_date(milestone, project_start)
+        with self._lock:
+            self._remove_entry(project_id, MILESTONE, name)
+            if target is None:
+                return
+            self._add_entry(DeadlineEntry(
+                project_id=project_id,
+                item_id=name,
+                kind=MILESTONE,
+                title=name,
+                deadline=target,
+                status=normalize_status(milestone.get("status")),
+                phase=phase,
+                associated_tasks=tuple(milestone.get("associated_tasks") or ())
+            ))
+
+    def set_task_status(self, project_id: str, task_id: str, status: str):
+        """Incremental status change for one task"""
+        task_id = str(task_id)
+        status = normalize_status(status)
+        with self._lock:
+            previous = self._tasks.get((project_id, task_id))
+            self._set_task_state(project_id, task_id, status, previous[1] if previous else None)
+            entry = self._entries.get((project_id, TASK, task_id))
+            if entry is not None:
+                entry.status = status
+
+    def remove_task(self, project_id: str, task_id: str):
+        task_id = str(task_id)
+        with self._lock:
+            previous = self._tasks.pop((project_id, task_id), None)
+            if previous is not None:
+                self._count(project_id, previous[1], previous[0], -1)
+                self._projects.get(project_id, set()).discard(task_id)
+            self._remove_entry(project_id, TASK, task_id)
+
+    def remove_project(self, project_id: str):
+        with self._lock:
+            for key in self._project_keys.pop(project_id, []):
+                self._entries.pop((project_id, key[2], key[3]), None)
+                _discard_key(self._keys, key)
+            for task_id in self._projects.pop(project_id, set()):
+                self._tasks.pop((project_id, task_id), None)
+            for phase in self._project_phases.pop(project_id, set()):
+                self._phase_counts.pop((project_id, phase), None)
+
+    def _set_task_state(self, project_id: str, task_id: str, status: str, phase: Optional[str]):
+        previous = self._tasks.get((project_id, task_id))
+        if previous is not None:
+            self._count(project_id, previous[1], previous[0], -1)
+        self._tasks[(project_id, task_id)] = (status, phase)
+        self._count(project_id, phase, status, +1)
+        self._projects.setdefault(project_id, set()).add(task_id)
+
+    def _count(self, project_id: str, phase: Optional[str], status: str, delta: int):
+        counts = self._phase_counts.setdefault((project_id, phase), [0, 0])
+        self._project_phases.setdefault(project_id, set()).add(phase)
+        counts[0] += delta
+        if status == "completed":
+            counts[1] += delta
+
+    def _add_entry(self, entry: DeadlineEntry):
+        self._entries[(entry.project_id, entry.kind, entry.item_id)] = entry
+        insort(self._project_keys.setdefault(entry.project_id, []), entry.key)
+        insort(self._keys, entry.key)
+
+    def _remove_entry(self, project_id: str, kind: str, item_id: str):
+        entry = self._entries.pop((project_id, kind, item_id), None)
+        if entry is None:
+            return
+        _discard_key(self._project_keys.get(project_id, []), entry.key)
+        _discard_key(self._keys, entry.key)
+
+    #  QUERIES
+
+    def between(self, start: Optional[date], end: Optional[date], project_id: Optional[str] = None,
+                kind: Optional[str] = None) -> List[DeadlineEntry]:
+        """Entries with start <= deadline <= end (either bound may be open)"""
+        with self._lock:
+            return list(self._between(start, end, project_id, kind))
+
+    def _between(self, start: Optional[date], end: Optional[date], project_id: Optional[str],
+                 kind: Optional[str]):
+        keys = self._keys if project_id is None else self._project_keys.get(project_id, [])
+        low = bisect_left(keys, (start.toordinal(),)) if start else 0
+        high = bisect_left(keys, (end.toordinal() + 1,)) if end else len(keys)
+        for key in keys[low:high]:
+            if kind is not None and key[2] != kind:
+                continue
+            yield self._entries[(key[1], key[2], key[3])]
+
+    def report(self, project_id: Optional[str] = None, current_date: Optional[str] = None,
+               upcoming_days: int = UPCOMING_HORIZON_DAYS, at_risk_days: int = AT_RISK_HORIZON_DAYS) -> Dict:
+        """
+        Same shape as ProgressTracker.monitor_deadlines for one project
+        (or the whole portfolio when project_id is None)
+        """
+        with self._lock:
+            return self._report(project_id, current_date, upcoming_days, at_risk_days)
+
+    def _report(self, project_id: Optional[str], current_date: Optional[str],
+                upcoming_days: int, at_risk_days: int) -> Dict:
+        today = parse_day(current_date) or date.today()
+        yesterday = today - timedelta(days=1)
+
+        overdue = []
+        for entry in self._between(None, yesterday, project_id, TASK):
+            if entry.status == "completed":
+                continue
+            days_overdue = (today - entry.deadline).days
+            overdue.append({
+                "project_id": entry.project_id,
+                "task_id": entry.item_id,
+                "task_title": entry.title,
+                "deadline": entry.deadline.isoformat(),
+                "days_overdue": days_overdue,
+                "priority": entry.priority,
+                "impact": f"{entry.priority.title()} priority task"
+                          + (f" in {entry.phase}" if entry.phase else "")
+                          + f" is {days_overdue} day(s) late"
+            })
+
+        at_risk = []
+        upcoming = []
+        for entry in self._between(today, today + timedelta(days=upcoming_days), project_id, TASK):
+            if entry.status == "completed":
+                continue
+            days_remaining = (entry.deadline - today).days
+            upcoming.append({
+                "project_id": entry.project_id,
+                "task_id": entry.item_id,
+                "task_title": entry.title,
+                "deadline": entry.deadline.isoformat(),
+                "days_remaining": days_remaining,
+                "status": entry.status
+            })
+            risk = self._task_risk(entry, days_remaining) if days_remaining <= at_risk_days else None
+            if risk:
+                at_risk.append({
+                    "project_id": entry.project_id,
+                    "task_id": entry.item_id,
+                    "task_title": entry.title,
+                    "deadline": entry.deadline.isoformat(),
+                    "days_remaining": days_remaining,
+                    "completion_percentage": self._progress(entry),
+                    "risk_level": risk[0],
+                    "reason": risk[1]
+                })
+
+        milestones = []
+        for entry in self._between(None, None, project_id, MILESTONE):
+            completion = self._milestone_completion(entry)
+            if completion >= 100:
+                status = "on_track"
+            elif entry.deadline < today:
+                status = "delayed"
+            elif (entry.deadline - today).days <= at_risk_days and completion < 75:
+                status = "at_risk"
+            else:
+                status = "on_track"
+            milestones.append({
+                "project_id": entry.project_id,
+                "milestone": entry.title,
+                "target_date": entry.deadline.isoformat(),
+                "status": status,
+                "completion_percentage": completion
+            })
+
+        return {
+            "overdue_tasks": overdue,
+            "at_risk_tasks": at_risk,
+            "upcoming_deadlines": upcoming,
+            "milestone_status": milestones,
+            "overall_schedule_health": self._schedule_health(project_id, today, overdue),
+            "recommendations": self._recommendations(overdue, at_risk, milestones)
+        }
+
+    def _progress(self, entry: DeadlineEntry) -> float:
+        if entry.completion_percentage is not None:
+            return entry.completion_percentage
+        return STATUS_PROGRESS.get(entry.status, 0.0)
+
+    @staticmethod
+    def _task_risk(entry: DeadlineEntry, days_remaining: int) -> Optional[Tuple[str, str]]:
+        if entry.status in ("blocked", "at_risk"):
+            return "high", f"Task is {entry.status.replace('_', ' ')} with {days_remaining} day(s) left"
+        if entry.status == "not_started":
+            level = "high" if days_remaining <= 2 else "medium"
+            return level, f"Not started with {days_remaining} day(s) left"
+        if entry.status == "in_progress" and days_remaining <= 2:
+            return "low", f"Still in progress with {days_remaining} day(s) left"
+        return None
+
+    def _milestone_completion(self, entry: DeadlineEntry) -> float:
+        if entry.associated_tasks:
+            done = sum(
+                1 for task_id in entry.associated_tasks
+                if self._tasks.get((entry.project_id, task_id), ("",))[0] == "completed"
+            )
+            return round(100.0 * done / len(entry.associated_tasks), 1)
+        total, done = self._phase_counts.get((entry.project_id, entry.phase), (0, 0))
+        return round(100.0 * done / total, 1) if total else 0.0
+
+    def _schedule_health(self, project_id: Optional[str], today: date, overdue: List[Dict]) -> Dict:
+        due = sum(1 for _ in self._between(None, today - timedelta(days=1), project_id, TASK))
+        on_time = 100.0 if not due else round(100.0 * (due - len(overdue)) / due, 1)
+        average_delay = round(sum(item["days_overdue"] for item in overdue) / len(overdue), 1) if overdue else 0.0
+
+        if not overdue:
+            status = "on_track"
+        elif on_time >= 90:
+            status = "minor_delays"
+        elif on_time >= 70:
+            status = "significant_delays"
+        else:
+            status = "critical"
+        return {"status": status, "on_time_percentage": on_time, "average_delay_days": average_delay}
+
+    @staticmethod
+    def _recommendations(overdue: List[Dict], at_risk: List[Dict], milestones: List[Dict]) -> List[str]:
+        recommendations = []
+        high_overdue = [item for item in overdue if item["priority"] == "high"]
+        if high_overdue:
+            recommendations.append(
+                f"Re-plan {len(high_overdue)} overdue high-priority task(s), starting with {high_overdue[0]['task_id']}"
+            )
+        elif overdue:
+            recommendations.append(f"Agree new dates for {len(overdue)} overdue task(s)")
+        blocked = [item for item in at_risk if "blocked" in item["reason"]]
+        if blocked:
+            recommendations.append(f"Unblock {len(blocked)} task(s) due within the week")
+        not_started = [item for item in at_risk if item["reason"].startswith("Not started")]
+        if not_started:
+            recommendations.append(f"Assign owners to {len(not_started)} unstarted task(s) due soon")
+        delayed = [item["milestone"] for item in milestones if item["status"] == "delayed"]
+        if delayed:
+            recommendations.append(f"Communicate revised dates for delayed milestone(s): {', '.join(delayed[:3])}")
+        return recommendations
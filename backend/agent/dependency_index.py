@@ -0,0 +1,176 @@
+"""
+Dependency Index Module
+In-memory forward/reverse task dependency index for fast prerequisite checks
+"""
+from typing import Dict, List, Optional, Set
+
+from .metrics import iter_phases, normalize_status
+
+# Statuses that satisfy a dependency
+DONE_STATUSES = {"completed"}
+
+
+class DependencyIndex:
+    """
+    Forward (task -> prerequisites) and reverse (task -> dependents) adjacency
+    keyed by task_id. Updates and single-task validation cost O(degree).
+    """
+
+    def __init__(self):
+        self.titles: Dict[str, str] = {}
+        self.statuses: Dict[str, str] = {}
+        self.prerequisites: Dict[str, List[str]] = {}
+        self.dependents: Dict[str, Set[str]] = {}
+        # Monotonic change counter; bumped on every mutation
+        self.version = 0
+
+    @classmethod
+    def from_project(cls, project_data: Dict) -> "DependencyIndex":
+        index = cls()
+        for phase in iter_phases(project_data):
+            for task in phase.get("tasks") or []:
+                index.upsert_task(task)
+        for task in project_data.get("tasks") or []:
+            index.upsert_task(task)
+        return index
+
+    #  UPDATES
+
+    def upsert_task(self, task: Dict):
+        """Add a task or replace its title, status and prerequisites"""
+        if not isinstance(task, dict):
+            return
+        task_id = task.get("task_id") or task.get("id")
+        if not task_id:
+            return
+        task_id = str(task_id)
+
+        dependencies = task.get("dependencies") or []
+        if isinstance(dependencies, str):
+            dependencies = [dependencies]
+        new_prereqs = list(dict.fromkeys(str(dep) for dep in dependencies if str(dep) != task_id))
+
+        for dep in set(self.prerequisites.get(task_id, ())) - set(new_prereqs):
+            self._unlink(dep, task_id)
+        for dep in new_prereqs:
+            self.dependents.setdefault(dep, set()).add(task_id)
+
+        self.prerequisites[task_id] = new_prereqs
+        self.titles[task_id] = task.get("title") or self.titles.get(task_id, "")
+        self.statuses[task_id] = normalize_status(task.get("status"))
+        self.dependents.setdefault(task_id, set())
+        self.version += 1
+
+    def set_status(self, task_id: str, status: str) -> bool:
+        """Record a status change without touching the graph; False (and no change) for unknown IDs"""
+        task_id = str(task_id)
+        if task_id not in self.statuses:
+            return False
+        self.statuses[task_id] = normalize_status(status)
+        self.version += 1
+        return True
+
+    def remove_task(self, task_id: str):
+        task_id = str(task_id)
+        for dep in self.prerequisites.pop(task_id, []):
+            self._unlink(dep, task_id)
+        self.titles.pop(task_id, None)
+        self.statuses.pop(task_id, None)
+        # Dependents keep their edge to the now-unknown task so it shows as missing
+        if not self.dependents.get(task_id):
+            self.dependents.pop(task_id, None)
+        self.version += 1
+
+    def _unlink(self, dep: str, task_id: str):
+        dependents = self.dependents.get(dep)
+        if dependents is not None:
+            dependents.discard(task_id)
+            if not dependents and dep not in self.statuses:
+                del self.dependents[dep]
+
+    #  QUERIES
+
+    def __contains__(self, task_id: str) -> bool:
+        return str(task_id) in self.statuses
+
+    def is_done(self, task_id: str) -> bool:
+        return self.statuses.get(task_id) in DONE_STATUSES
+
+    def dependents_of(self, task_id: str) -> List[str]:
+        return sorted(self.dependents.get(str(task_id), ()))
+
+    def validate(self, task_id: str) -> Dict:
+        """
+        Same shape as TaskExecutor.validate_task_dependencies:
+        can_start, dependencies_met, missing_prerequisites, ready_to_execute, ...
+        """
+        task_id = str(task_id)
+        if task_id not in self.statuses:
+            return {
+                "task_id": task_id,
+                "can_start": False,
+                "dependencies_met": [],
+                "missing_prerequisites": [],
+                "ready_to_execute": False,
+                "blocking_reason": f"Task {task_id} not found in project",
+                "recommended_action": "Check the task ID"
+            }
+
+        checks = []
+        missing = []
+        for dep in self.prerequisites.get(task_id, []):
+            met = self.is_done(dep)
+            known = dep in self.statuses
+            checks.append({
+                "dependency_id": dep,
+                "dependency_name": self.titles.get(dep, "") if known else "",
+                "status": "met" if met else "not_met",
+                "blocker": not met
+            })
+            if not met:
+                missing.append(dep if known else f"{dep} (unknown task)")
+
+        status = self.statuses[task_id]
+        can_start = not missing
+        blocking_reason = None
+        if missing:
+            blocking_reason = f"Waiting on {len(missing)} prerequisite(s): {', '.join(missing)}"
+        elif status == "blocked":
+            blocking_reason = "Task is marked as blocked"
+
+        return {
+            "task_id": task_id,
+            "can_start": can_start,
+            "dependencies_met": checks,
+            "missing_prerequisites": missing,
+            "ready_to_execute": can_start and status not in ("completed", "blocked"),
+            "blocking_reason": blocking_reason,
+            "recommended_action": self._recommend(status, missing)
+        }
+
+    def validate_all(self) -> Dict:
+        """Validate every task at once; O(tasks + edges)"""
+        results = {task_id: self.validate(task_id) for task_id in self.statuses}
+        return {
+            "tasks": results,
+            "ready": [task_id for task_id, result in results.items() if result["ready_to_execute"]],
+            "waiting": [task_id for task_id, result in results.items() if not result["can_start"]]
+        }
+
+    @staticmethod
+    def _recommend(status: str, missing: List[str]) -> str:
+        if status == "completed":
+            return "Task is already completed"
+        if missing:
+            return f"Complete {missing[0]} first" if len(missing) == 1 else "Complete the missing prerequisites first"
+        if status == "blocked":
+            return "Resolve the blocker recorded on this task"
+        if status == "in_progress":
+            return "Task is in progress; continue execution"
+        return "All prerequisites are met; the task can start"
+
+
+def project_key(project_data: Dict) -> Optional[str]:
+    """Stable identifier of a project dict, if it has one"""
+    key = project_data.get("project_id") or project_data.get("id")
+    return str(key) if key else None
@@ -0,0 +1,49 @@
+"""
+Domain Module
+Enums and models shared by the agent's output schemas and the API models
+"""
+from pydantic import BaseModel, ConfigDict
+from typing import Optional
+from enum import Enum
+
+
+class TaskStatus(str, Enum):
+    NOT_STARTED = "not_started"
+    IN_PROGRESS = "in_progress"
+    COMPLETED = "completed"
+    BLOCKED = "blocked"
+    AT_RISK = "at_risk"
+
+
+class Priority(str, Enum):
+    HIGH = "high"
+    MEDIUM = "medium"
+    LOW = "low"
+
+
+class HealthIndicator(str, Enum):
+    GREEN = "green"
+    YELLOW = "yellow"
+    RED = "red"
+
+
+class RiskLevel(str, Enum):
+    LOW = "low"
+    MEDIUM = "medium"
+    HIGH = "high"
+    CRITICAL = "critical"
+
+
+class Risk(BaseModel):
+    model_config = ConfigDict(use_enum_values=True)
+
+    risk_id: str
+    category: str
+    description: str
+    probability: RiskLevel
+    impact: RiskLevel
+    risk_score: int
+    mitigation_strategy: Optional[str] = None
+    contingency_plan: Optional[str] = None
+    owner: Optional[str] = None
+    status: str = "identified"
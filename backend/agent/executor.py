@@ -2,50 +2,77 @@
 Executor Module
 Coordinates task execution and handles user requests
 """
-from anthropic import Anthropic
+from collections import OrderedDict
 from typing import Dict, List, Optional
-import json
+import threading
 
-class TaskExecutor:
-    def __init__(self, api_key: str):
-        self.client = Anthropic(api_key=api_key)
+from .base import AgentModule
+from .client import LLMClient, LLMRequest
+from .dependency_index import DependencyIndex, project_key
+from .intent import DEFAULT_INTENT_THRESHOLD, IntentClassifier
+from .schemas import NextTasks, ScopeChangeAssessment, TeamAssignment, UserIntent
+from .serializer import PromptSerializer
+
+class TaskExecutor(AgentModule):
+    def __init__(self, api_key: Optional[str] = None, llm_client: Optional[LLMClient] = None,
+                 serializer: Optional[PromptSerializer] = None,
+                 intent_threshold: float = DEFAULT_INTENT_THRESHOLD,
+                 max_dependency_indexes: int = 128):
+        super().__init__(api_key, llm_client, serializer)
+        # project key -> (updated_at stamp, DependencyIndex), least recently used first
+        self._dependency_indexes: "OrderedDict[str, tuple]" = OrderedDict()
+        self.max_dependency_indexes = max_dependency_indexes
+        # The stamp check and cache updates must be atomic if validation runs on worker threads
+        self._dependency_lock = threading.Lock()
+        # Messages classified locally at or above intent_threshold skip the model
+        self.intent_classifier = IntentClassifier()
+        self.intent_threshold = intent_threshold
         
     def parse_user_intent(self, user_message: str, project_context: Optional[Dict] = None) -> Dict:
         """
         Parse user message to determine intent and required action
+        Classified locally when confident enough, otherwise by the model
         """
-        context_str = ""
+        local = self.intent_classifier.classify(user_message, project_context)
+        if local["confidence"] >= self.intent_threshold:
+            return local
+        intent = self._run(self._parse_user_intent_request(user_message, project_context))
+        return self._merge_intent(user_message, local, intent)
+    
+    async def parse_user_intent_async(self, user_message: str, project_context: Optional[Dict] = None) -> Dict:
+        """Async variant of parse_user_intent"""
+        local = self.intent_classifier.classify(user_message, project_context)
+        if local["confidence"] >= self.intent_threshold:
+            return local
+        intent = await self._run_async(self._parse_user_intent_request(user_message, project_context))
+        return self._merge_intent(user_message, local, intent)
+    
+    def _merge_intent(self, user_message: str, local: Dict, intent: Dict) -> Dict:
+        """Fill entities the model left empty from local extraction, and learn from confident answers"""
+        if not isinstance(intent, dict) or "intent" not in intent:
+            return intent
+        entities = dict(intent.get("entities") or {})
+        for key, value in local["entities"].items():
+            if entities.get(key) is None:
+                entities[key] = value
+        intent["entities"] = entities
+        if (intent.get("confidence") or 0) >= 0.8 and not intent.get("validation_errors"):
+            self.intent_classifier.learn(user_message, intent["intent"])
+        intent["source"] = "model"
+        return intent
+    
+    def _parse_user_intent_request(self, user_message: str, project_context: Optional[Dict] = None) -> LLMRequest:
+        context = None
         if project_context:
-            context_str = f"\n\nCurrent Project Context:\n{json.dumps(project_context, indent=2)}"
+            context = self._snapshot(project_context, 'parse_user_intent', "Current Project Context")
         
         prompt = f"""Analyze this user request and determine the intent:
 
-User Message: "{user_message}"{context_str}
+User Message: "{user_message}"
 
-Classify the intent and extract parameters:
-{{
-  "intent": "create_project|update_task|view_status|generate_report|create_timeline|track_progress|identify_risks|ask_question|other",
-  "confidence": number,
-  "entities": {{
-    "project_id": "string or null",
-    "task_id": "string or null",
-    "milestone_name": "string or null",
-    "date": "string or null",
-    "status": "string or null"
-  }},
-  "required_action": "string",
-  "parameters": {{}},
-  "clarification_needed": boolean,
-  "clarification_questions": ["string"]
-}}"""
+Classify the intent and extract parameters."""
 
-        response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=1500,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        return self._parse_json_response(response.content[0].text)
+        return LLMRequest("parse_user_intent", prompt, max_tokens=1500, schema=UserIntent, context=context)
     
     def execute_command(self, command: Dict, project_data: Optional[Dict] = None) -> Dict:
         """
@@ -100,199 +127,120 @@ Classify the intent and extract parameters:
     def validate_task_dependencies(self, task_id: str, project_data: Dict) -> Dict:
         """
         Validate if a task's dependencies are met before execution
+        Answered from the in-memory dependency index in O(number of prerequisites)
         """
-        prompt = f"""Validate dependencies for task: {task_id}
-
-Project Data:
-{json.dumps(project_data, indent=2)}
-
-Check:
-{{
-  "task_id": "string",
-  "can_start": boolean,
-  "dependencies_met": [
-    {{
-      "dependency_id": "string",
-      "dependency_name": "string",
-      "status": "met|not_met",
-      "blocker": boolean
-    }}
-  ],
-  "missing_prerequisites": ["string"],
-  "ready_to_execute": boolean,
-  "blocking_reason": "string or null",
-  "recommended_action": "string"
-}}"""
-
-        response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=2000,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        return self._parse_json_response(response.content[0].text)
+        return self.dependency_index(project_data).validate(task_id)
+    
+    async def validate_task_dependencies_async(self, task_id: str, project_data: Dict) -> Dict:
+        """Async variant of validate_task_dependencies"""
+        return self.validate_task_dependencies(task_id, project_data)
+    
+    def validate_all_dependencies(self, project_data: Dict) -> Dict:
+        """
+        Validate every task in the project at once
+        """
+        return self.dependency_index(project_data).validate_all()
+    
+    def dependency_index(self, project_data: Dict) -> DependencyIndex:
+        """
+        Cached dependency index for a project, kept for the max_dependency_indexes
+        most recently used projects
+        Rebuilt when the project's updated_at changes (or always, for projects without an ID)
+        """
+        key = project_key(project_data)
+        stamp = project_data.get("updated_at")
+        if not key:
+            return DependencyIndex.from_project(project_data)
+        with self._dependency_lock:
+            cached = self._dependency_indexes.get(key)
+            if cached is not None and stamp is not None and cached[0] == stamp:
+                self._dependency_indexes.move_to_end(key)
+                return cached[1]
+            index = DependencyIndex.from_project(project_data)
+            self._dependency_indexes[key] = (stamp, index)
+            self._dependency_indexes.move_to_end(key)
+            while len(self._dependency_indexes) > self.max_dependency_indexes:
+                self._dependency_indexes.popitem(last=False)
+        return index
+    
+    def record_task_status(self, project_data: Dict, task_id: str, status: str):
+        """
+        Apply a status change to the project's cached index in O(1)
+        """
+        key = project_key(project_data)
+        with self._dependency_lock:
+            cached = self._dependency_indexes.get(key) if key else None
+            if cached is not None:
+                cached[1].set_status(task_id, status)
+                self._dependency_indexes[key] = (project_data.get("updated_at"), cached[1])
     
     def suggest_next_tasks(self, project_data: Dict, team_capacity: Optional[Dict] = None) -> List[Dict]:
         """
         Suggest which tasks should be worked on next
         """
+        return self._run(self._suggest_next_tasks_request(project_data, team_capacity))
+    
+    async def suggest_next_tasks_async(self, project_data: Dict, team_capacity: Optional[Dict] = None) -> List[Dict]:
+        """Async variant of suggest_next_tasks"""
+        return await self._run_async(self._suggest_next_tasks_request(project_data, team_capacity))
+    
+    def _suggest_next_tasks_request(self, project_data: Dict, team_capacity: Optional[Dict] = None) -> LLMRequest:
         capacity_str = ""
         if team_capacity:
-            capacity_str = f"\n\nTeam Capacity:\n{json.dumps(team_capacity, indent=2)}"
+            capacity_str = f"\n\nTeam Capacity:\n{self.serializer.serialize(team_capacity)}"
         
-        prompt = f"""Suggest next tasks to work on:
-
-Project Data:
-{json.dumps(project_data, indent=2)}{capacity_str}
+        prompt = f"""Suggest next tasks to work on in the project above.{capacity_str}
 
 Prioritize based on:
 - Dependencies (tasks whose prerequisites are complete)
 - Critical path items
 - Priority levels
 - Deadlines
-- Resource availability
-
-Return JSON:
-{{
-  "recommended_tasks": [
-    {{
-      "task_id": "string",
-      "title": "string",
-      "priority": "high|medium|low",
-      "reason": "string",
-      "estimated_hours": number,
-      "suggested_assignee": "string or null",
-      "deadline": "YYYY-MM-DD",
-      "dependencies_met": boolean,
-      "on_critical_path": boolean
-    }}
-  ],
-  "parallel_opportunities": [
-    {{
-      "tasks": ["task_id"],
-      "description": "string",
-      "total_hours": number
-    }}
-  ],
-  "blocked_tasks": [
-    {{
-      "task_id": "string",
-      "title": "string",
-      "blocker": "string",
-      "action_to_unblock": "string"
-    }}
-  ],
-  "prioritization_rationale": "string"
-}}"""
+- Resource availability"""
 
-        response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=4000,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        return self._parse_json_response(response.content[0].text)
+        return LLMRequest("suggest_next_tasks", prompt, max_tokens=4000, schema=NextTasks,
+                          context=self._snapshot(project_data, 'suggest_next_tasks'))
     
     def handle_scope_change(self, change_request: Dict, project_data: Dict) -> Dict:
         """
         Handle scope change requests and assess impact
         """
+        return self._run(self._handle_scope_change_request(change_request, project_data))
+    
+    async def handle_scope_change_async(self, change_request: Dict, project_data: Dict) -> Dict:
+        """Async variant of handle_scope_change"""
+        return await self._run_async(self._handle_scope_change_request(change_request, project_data))
+    
+    def _handle_scope_change_request(self, change_request: Dict, project_data: Dict) -> LLMRequest:
         prompt = f"""Scope Change Request:
-{json.dumps(change_request, indent=2)}
-
-Current Project:
-{json.dumps(project_data, indent=2)}
+{self.serializer.serialize(change_request)}
 
-Analyze impact:
-{{
-  "change_summary": "string",
-  "impact_analysis": {{
-    "schedule_impact": {{
-      "additional_days": number,
-      "new_end_date": "YYYY-MM-DD",
-      "affected_milestones": ["string"]
-    }},
-    "resource_impact": {{
-      "additional_hours": number,
-      "additional_team_members": number,
-      "new_skills_required": ["string"]
-    }},
-    "budget_impact": {{
-      "estimated_additional_cost": "string",
-      "cost_categories": ["string"]
-    }},
-    "risk_impact": {{
-      "new_risks": ["string"],
-      "risk_level_change": "increased|decreased|unchanged"
-    }}
-  }},
-  "affected_components": [
-    {{
-      "component": "string",
-      "impact_description": "string",
-      "requires_rework": boolean
-    }}
-  ],
-  "recommendation": "approve|reject|modify",
-  "recommendation_rationale": "string",
-  "mitigation_strategies": ["string"],
-  "alternative_approaches": ["string"]
-}}"""
+Analyze the impact of this change and recommend whether to approve, reject or modify it."""
 
-        response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=4000,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        return self._parse_json_response(response.content[0].text)
+        return LLMRequest("handle_scope_change", prompt, max_tokens=4000, schema=ScopeChangeAssessment,
+                          context=self._snapshot(project_data, 'handle_scope_change', "Current Project"))
     
     def coordinate_team_assignment(self, task_id: str, available_team: List[Dict], project_data: Dict) -> Dict:
         """
         Suggest best team member assignment for a task
         """
+        return self._run(self._coordinate_team_assignment_request(task_id, available_team, project_data))
+    
+    async def coordinate_team_assignment_async(self, task_id: str, available_team: List[Dict], project_data: Dict) -> Dict:
+        """Async variant of coordinate_team_assignment"""
+        return await self._run_async(self._coordinate_team_assignment_request(task_id, available_team, project_data))
+    
+    def _coordinate_team_assignment_request(self, task_id: str, available_team: List[Dict], project_data: Dict) -> LLMRequest:
+        project_context = self.slicer.task_slice(project_data, task_id, self.dependency_index(project_data))
         prompt = f"""Task to Assign: {task_id}
 
 Available Team:
-{json.dumps(available_team, indent=2)}
+{self.serializer.serialize(available_team)}
 
-Project Context:
-{json.dumps(project_data, indent=2)}
+Recommend the best assignment for this task."""
 
-Recommend assignment:
-{{
-  "recommended_assignee": {{
-    "name": "string",
-    "reason": "string",
-    "skill_match": "excellent|good|adequate",
-    "availability": number,
-    "current_workload": "light|moderate|heavy"
-  }},
-  "alternative_assignees": [
-    {{
-      "name": "string",
-      "reason": "string",
-      "considerations": "string"
-    }}
-  ],
-  "collaboration_suggestions": [
-    {{
-      "members": ["string"],
-      "approach": "string",
-      "rationale": "string"
-    }}
-  ],
-  "skill_gaps": ["string"],
-  "training_needs": ["string"]
-}}"""
-
-        response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=2000,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        return self._parse_json_response(response.content[0].text)
+        return LLMRequest("coordinate_team_assignment", prompt, max_tokens=2000, schema=TeamAssignment,
+                          context=self._snapshot(project_context, 'coordinate_team_assignment', "Project Context"))
     
     # Internal helper methods
     def _handle_create_project(self, parameters: Dict) -> Dict:
@@ -309,16 +257,3 @@ Recommend assignment:
     
     def _handle_track_progress(self, project_data: Dict) -> Dict:
         return {"action": "track_progress", "data": project_data}
-    
-    def _parse_json_response(self, text: str) -> Dict:
-        """Extract and parse JSON from Claude's response"""
-        try:
-            start_idx = text.find('{')
-            end_idx = text.rfind('}') + 1
-            if start_idx != -1 and end_idx > start_idx:
-                json_str = text[start_idx:end_idx]
-                return json.loads(json_str)
-        except Exception as e:
-            print(f"Error parsing JSON: {e}")
-        
-        return {"raw_response": text, "error": "Failed to parse JSON"}
\ No newline at end of file
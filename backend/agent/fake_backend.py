@@ -0,0 +1,480 @@
+"""
+Fake Backend Module
+Local stand-in for the Messages API: cassette record/replay, schema-valid synthetic
+output and injectable latency, throughput and error profiles
+"""
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+import asyncio
+import hashlib
+import json
+import random
+import threading
+import time
+
+import httpx
+
+from .client import LLMClient
+from .serializer import CHARS_PER_TOKEN
+
+MODE_REPLAY = "replay"
+MODE_RECORD = "record"
+MODE_SYNTHESIZE = "synthesize"
+
+# Request fields that decide the response; "stream" is left out so both forms share a cassette
+CASSETTE_KEY_FIELDS = ("model", "system", "messages", "tools", "tool_choice", "max_tokens", "temperature")
+
+# Characters per streamed delta
+STREAM_CHUNK_CHARS = 24
+
+# Length of synthesized text replies, capped by the request's max_tokens
+DEFAULT_TEXT_TOKENS = 200
+
+# Nesting depth beyond which synthesized values are left empty (guards recursive schemas)
+MAX_SCHEMA_DEPTH = 12
+
+
+@dataclass
+class FaultProfile:
+    """Timing and failure behaviour of the fake backend"""
+    # Seconds before the response (or first streamed byte), plus up to +-jitter
+    latency: float = 0.0
+    jitter: float = 0.0
+    # Output pacing; None sends the whole response at once
+    tokens_per_second: Optional[float] = None
+    # Share of requests answered with 429 rate_limit_error, 500 api_error and 529 overloaded_error
+    rate_limit_rate: float = 0.0
+    server_error_rate: float = 0.0
+    overloaded_rate: float = 0.0
+    # retry-after header sent with 429s
+    retry_after: float = 1.0
+
+
+PROFILES = {
+    "instant": FaultProfile(),
+    "realistic": FaultProfile(latency=0.6, jitter=0.3, tokens_per_second=80),
+    "congested": FaultProfile(latency=1.5, jitter=1.0, tokens_per_second=40, rate_limit_rate=0.15, retry_after=2.0),
+    "flaky": FaultProfile(latency=0.3, jitter=0.2, tokens_per_second=150, rate_limit_rate=0.05,
+                          server_error_rate=0.05, overloaded_rate=0.05),
+}
+
+
+def cassette_key(body: Dict) -> str:
+    """Hash of the parts of a Messages API request body that decide its response"""
+    material = {field: body.get(field) for field in CASSETTE_KEY_FIELDS}
+    encoded = json.dumps(material, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class FakeLLMBackend(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """
+    httpx transport answering POST /v1/messages in-process, streamed or not.
+
+    Modes:
+      replay      answer from a recorded cassette, synthesizing on a miss
+      record      forward to the real API, saving each answer as a cassette
+      synthesize  always synthesize
+
+    Synthesized answers to tool-forced requests are generated from the tool's
+    input_schema, so they validate against the method's output schema; other
+    requests get deterministic filler text. The same prompt always gets the
+    same answer, and faults draw from a seeded generator, so runs are
+    reproducible. Plug it in with LLMClient(..., transport=backend) or
+    backend.client().
+    """
+
+    def __init__(self, mode: str = MODE_REPLAY, cassette_dir: Optional[str] = None,
+                 profile: Optional[FaultProfile] = None, seed: int = 0,
+                 text_tokens: int = DEFAULT_TEXT_TOKENS,
+                 upstream_base_url: str = "https://api.anthropic.com"):
+        if mode not in (MODE_REPLAY, MODE_RECORD, MODE_SYNTHESIZE):
+            raise ValueError(f"Unknown mode: {mode}")
+        if mode == MODE_RECORD and not cassette_dir:
+            raise ValueError("Recording needs a cassette_dir")
+        self.mode = mode
+        self.cassette_dir = Path(cassette_dir) if cassette_dir else None
+        self.profile = profile or FaultProfile()
+        self.text_tokens = text_tokens
+        self.upstream_base_url = upstream_base_url.rstrip("/")
+
+        self._random = random.Random(seed)
+        self._seed = seed
+        self._lock = threading.Lock()
+        self._counters = {
+            "requests": 0, "replayed": 0, "recorded": 0, "synthesized": 0,
+            "rate_limited": 0, "server_errors": 0, "overloaded": 0
+        }
+        self._upstream: Optional[httpx.HTTPTransport] = None
+        self._async_upstream: Optional[httpx.AsyncHTTPTransport] = None
+
+        if self.cassette_dir:
+            self.cassette_dir.mkdir(parents=True, exist_ok=True)
+
+    def client(self, api_key: str = "fake-key", **kwargs) -> LLMClient:
+        """An LLMClient whose calls are served by this backend"""
+        return LLMClient(api_key, transport=self, **kwargs)
+
+    #  TRANSPORT
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        body, fault = self._begin(request)
+        if fault is not None:
+            time.sleep(self._delay())
+            return fault
+        message = self._answer(request, body, self._forward)
+        time.sleep(self._delay())
+        if body.get("stream"):
+            return self._sse_response(_PacedStream(self._sse_chunks(message), self._chunk_delay(message)))
+        time.sleep(self._transfer_time(message))
+        return httpx.Response(200, json=message)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        body, fault = self._begin(request)
+        if fault is not None:
+            await asyncio.sleep(self._delay())
+            return fault
+        message = await self._answer_async(request, body)
+        await asyncio.sleep(self._delay())
+        if body.get("stream"):
+            return self._sse_response(_AsyncPacedStream(self._sse_chunks(message), self._chunk_delay(message)))
+        await asyncio.sleep(self._transfer_time(message))
+        return httpx.Response(200, json=message)
+
+    def close(self):
+        if self._upstream is not None:
+            self._upstream.close()
+
+    async def aclose(self):
+        if self._async_upstream is not None:
+            await self._async_upstream.aclose()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counters)
+
+    def _begin(self, request: httpx.Request) -> Tuple[Dict, Optional[httpx.Response]]:
+        """Parse the body and decide whether this request fails"""
+        request.read()
+        with self._lock:
+            self._counters["requests"] += 1
+        if request.method != "POST" or not request.url.path.endswith("/v1/messages"):
+            return {}, _error_response(404, "not_found_error", f"Fake backend does not serve {request.url.path}")
+        body = json.loads(request.content or b"{}")
+        return body, self._fault()
+
+    def _fault(self) -> Optional[httpx.Response]:
+        profile = self.profile
+        with self._lock:
+            roll = self._random.random()
+            if roll < profile.rate_limit_rate:
+                self._counters["rate_limited"] += 1
+                return _error_response(429, "rate_limit_error", "Fake rate limit",
+                                       {"retry-after": str(profile.retry_after)})
+            roll -= profile.rate_limit_rate
+            if roll < profile.server_error_rate:
+                self._counters["server_errors"] += 1
+                return _error_response(500, "api_error", "Fake internal server error")
+            roll -= profile.server_error_rate
+            if roll < profile.overloaded_rate:
+                self._counters["overloaded"] += 1
+                return _error_response(529, "overloaded_error", "Fake overload")
+        return None
+
+    #  ANSWERS
+
+    def _answer(self, request: httpx.Request, body: Dict, forward) -> Dict:
+        key = cassette_key(body)
+        if self.mode == MODE_RECORD:
+            message = forward(request, body)
+            self._save_cassette(key, message)
+            self._count("recorded")
+            return message
+        if self.mode == MODE_REPLAY:
+            message = self._load_cassette(key)
+            if message is not None:
+                self._count("replayed")
+                return message
+        self._count("synthesized")
+        return self.synthesize(body, key)
+
+    async def _answer_async(self, request: httpx.Request, body: Dict) -> Dict:
+        if self.mode != MODE_RECORD:
+            return self._answer(request, body, None)
+        message = await self._forward_async(request, body)
+        self._save_cassette(cassette_key(body), message)
+        self._count("recorded")
+        return message
+
+    def synthesize(self, body: Dict, key: Optional[str] = None) -> Dict:
+        """A Messages API response for the request body, deterministic per prompt"""
+        key = key or cassette_key(body)
+        rng = random.Random(f"{self._seed}:{key}")
+        tools = body.get("tools") or []
+        choice = body.get("tool_choice") or {}
+        tool = next((tool for tool in tools if tool.get("name") == choice.get("name")), tools[0] if tools else None)
+
+        if tool is not None:
+            value = synthesize_value(tool.get("input_schema") or {}, rng)
+            content = [{"type": "tool_use", "id": f"toolu_fake_{key[:20]}", "name": tool["name"], "input": value}]
+            stop_reason = "tool_use"
+            output_chars = len(json.dumps(value))
+        else:
+            tokens = min(self.text_tokens, body.get("max_tokens") or self.text_tokens)
+            text = synthesize_text(rng, tokens * CHARS_PER_TOKEN)
+            content = [{"type": "text", "text": text}]
+            stop_reason = "end_turn"
+            output_chars = len(text)
+
+        prompt_chars = len(json.dumps([body.get("system"), body.get("messages"), tools], default=str))
+        return {
+            "id": f"msg_fake_{key[:20]}",
+            "type": "message",
+            "role": "assistant",
+            "model": body.get("model") or "fake-model",
+            "content": content,
+            "stop_reason": stop_reason,
+            "stop_sequence": None,
+            "usage": {
+                "input_tokens": prompt_chars // CHARS_PER_TOKEN + 1,
+                "output_tokens": output_chars // CHARS_PER_TOKEN + 1,
+                "cache_creation_input_tokens": 0,
+                "cache_read_input_tokens": 0
+            }
+        }
+
+    def _count(self, counter: str):
+        with self._lock:
+            self._counters[counter] += 1
+
+    #  CASSETTES
+
+    def _cassette_path(self, key: str) -> Optional[Path]:
+        return self.cassette_dir / f"{key}.json" if self.cassette_dir else None
+
+    def _load_cassette(self, key: str) -> Optional[Dict]:
+        path = self._cassette_path(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)["response"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _save_cassette(self, key: str, message: Dict):
+        path = self._cassette_path(key)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"key": key, "recorded_at": datetime.now().isoformat(), "response": message}, f)
+        tmp.replace(path)
+
+    #  RECORDING
+
+    def _upstream_request(self, request: httpx.Request, body: Dict) -> httpx.Request:
+        # Always record the complete message; it is re-streamed locally when asked for
+        content = json.dumps({**body, "stream": False}).encode("utf-8")
+        headers = {k: v for k, v in request.headers.items() if k.lower() not in ("content-length", "host")}
+        return httpx.Request("POST", f"{self.upstream_base_url}/v1/messages", headers=headers, content=content)
+
+    def _forward(self, request: httpx.Request, body: Dict) -> Dict:
+        if self._upstream is None:
+            self._upstream = httpx.HTTPTransport()
+        response = self._upstream.handle_request(self._upstream_request(request, body))
+        response.read()
+        return _upstream_message(response)
+
+    async def _forward_async(self, request: httpx.Request, body: Dict) -> Dict:
+        if self._async_upstream is None:
+            self._async_upstream = httpx.AsyncHTTPTransport()
+        response = await self._async_upstream.handle_async_request(self._upstream_request(request, body))
+        await response.aread()
+        return _upstream_message(response)
+
+    #  TIMING AND STREAMING
+
+    def _delay(self) -> float:
+        profile = self.profile
+        with self._lock:
+            jitter = self._random.uniform(-profile.jitter, profile.jitter) if profile.jitter else 0.0
+        return max(profile.latency + jitter, 0.0)
+
+    def _transfer_time(self, message: Dict) -> float:
+        if not self.profile.tokens_per_second:
+            return 0.0
+        return message["usage"]["output_tokens"] / self.profile.tokens_per_second
+
+    def _chunk_delay(self, message: Dict) -> float:
+        if not self.profile.tokens_per_second:
+            return 0.0
+        return STREAM_CHUNK_CHARS / CHARS_PER_TOKEN / self.profile.tokens_per_second
+
+    @staticmethod
+    def _sse_response(stream) -> httpx.Response:
+        return httpx.Response(200, headers={"content-type": "text/event-stream"}, stream=stream)
+
+    @staticmethod
+    def _sse_chunks(message: Dict) -> List[bytes]:
+        """The message as server-sent events; one entry per event, deltas STREAM_CHUNK_CHARS long"""
+        start = {**message, "content": [], "stop_reason": None,
+                 "usage": {**message["usage"], "output_tokens": 1}}
+        events = [("message_start", {"type": "message_start", "message": start})]
+        for index, block in enumerate(message["content"]):
+            if block["type"] == "tool_use":
+                opening = {**block, "input": {}}
+                text, delta_type, field = json.dumps(block["input"]), "input_json_delta", "partial_json"
+            else:
+                opening = {"type": "text", "text": ""}
+                text, delta_type, field = block.get("text", ""), "text_delta", "text"
+            events.append(("content_block_start",
+                           {"type": "content_block_start", "index": index, "content_block": opening}))
+            for offset in range(0, len(text), STREAM_CHUNK_CHARS):
+                delta = {"type": delta_type, field: text[offset:offset + STREAM_CHUNK_CHARS]}
+                events.append(("content_block_delta", {"type": "content_block_delta", "index": index, "delta": delta}))
+            events.append(("content_block_stop", {"type": "content_block_stop", "index": index}))
+        events.append(("message_delta", {
+            "type": "message_delta",
+            "delta": {"stop_reason": message["stop_reason"], "stop_sequence": message.get("stop_sequence")},
+            "usage": {"output_tokens": message["usage"]["output_tokens"]}
+        }))
+        events.append(("message_stop", {"type": "message_stop"}))
+        return [f"event: {name}\ndata: {json.dumps(data)}\n\n".encode("utf-8") for name, data in events]
+
+
+class _PacedStream(httpx.SyncByteStream):
+    def __init__(self, chunks: List[bytes], delay: float):
+        self.chunks = chunks
+        self.delay = delay
+
+    def __iter__(self) -> Iterator[bytes]:
+        for chunk in self.chunks:
+            if self.delay and b"content_block_delta" in chunk:
+                time.sleep(self.delay)
+            yield chunk
+
+
+class _AsyncPacedStream(httpx.AsyncByteStream):
+    def __init__(self, chunks: List[bytes], delay: float):
+        self.chunks = chunks
+        self.delay = delay
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        for chunk in self.chunks:
+            if self.delay and b"content_block_delta" in chunk:
+                await asyncio.sleep(self.delay)
+            yield chunk
+
+
+def _error_response(status: int, error_type: str, message: str,
+                    headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+    return httpx.Response(status, headers=headers,
+                          json={"type": "error", "error": {"type": error_type, "message": message}})
+
+
+def _upstream_message(response: httpx.Response) -> Dict:
+    if response.status_code != 200:
+        raise RuntimeError(f"Upstream returned {response.status_code} while recording: {response.text[:200]}")
+    return response.json()
+
+
+#  SYNTHESIS
+
+def synthesize_value(schema: Dict, rng: random.Random, defs: Optional[Dict] = None,
+                     name: str = "", depth: int = 0) -> Any:
+    """A value satisfying a JSON schema (as produced by pydantic's model_json_schema)"""
+    defs = schema.get("$defs", {}) if defs is None else defs
+    if depth > MAX_SCHEMA_DEPTH:
+        return None
+    if "$ref" in schema:
+        target = defs.get(schema["$ref"].split("/")[-1], {})
+        return synthesize_value(target, rng, defs, name, depth + 1)
+    if "const" in schema:
+        return schema["const"]
+    if schema.get("enum"):
+        return rng.choice(schema["enum"])
+    for combinator in ("anyOf", "oneOf"):
+        if schema.get(combinator):
+            options = [option for option in schema[combinator] if option.get("type") != "null"]
+            return synthesize_value(rng.choice(options or schema[combinator]), rng, defs, name, depth + 1)
+    if schema.get("allOf"):
+        return synthesize_value(schema["allOf"][0], rng, defs, name, depth + 1)
+
+    kind = schema.get("type")
+    if isinstance(kind, list):
+        kind = next((option for option in kind if option != "null"), "null")
+    if kind is None:
+        if "properties" in schema:
+            kind = "object"
+        elif "default" in schema:
+            return schema["default"]
+        else:
+            kind = "string"
+
+    if kind == "object":
+        return {
+            key: synthesize_value(value, rng, defs, key, depth + 1)
+            for key, value in (schema.get("properties") or {}).items()
+        }
+    if kind == "array":
+        low = schema.get("minItems", 1)
+        high = max(schema.get("maxItems", low + 2), low)
+        return [
+            synthesize_value(schema.get("items") or {}, rng, defs, name, depth + 1)
+            for _ in range(rng.randint(low, min(high, low + 2)))
+        ]
+    if kind == "integer":
+        low, high = _bounds(schema, 0, 100)
+        return rng.randint(int(low), int(high))
+    if kind == "number":
+        low, high = _bounds(schema, 0.0, 100.0)
+        return round(rng.uniform(low, high), 2)
+    if kind == "boolean":
+        return rng.random() < 0.5
+    if kind == "null":
+        return None
+    return _synthesize_string(schema, rng, name)
+
+
+def _bounds(schema: Dict, low: float, span: float) -> Tuple[float, float]:
+    low = schema.get("minimum", schema.get("exclusiveMinimum", low))
+    high = schema.get("maximum", schema.get("exclusiveMaximum", low + span))
+    if schema.get("type") == "integer":
+        low += 1 if "exclusiveMinimum" in schema else 0
+        high -= 1 if "exclusiveMaximum" in schema else 0
+    return low, max(high, low)
+
+
+def _synthesize_string(schema: Dict, rng: random.Random, name: str) -> str:
+    day = date(2026, 1, 1) + timedelta(days=rng.randint(0, 364))
+    if schema.get("format") == "date" or name.endswith("date") or name in ("deadline", "start", "end"):
+        return day.isoformat()
+    if schema.get("format") == "date-time":
+        return f"{day.isoformat()}T09:00:00"
+    label = (name or "value").replace("_", " ")
+    text = f"{label} {rng.randint(1, 999)}"
+    min_length = schema.get("minLength", 0)
+    if len(text) < min_length:
+        text = text.ljust(min_length, "x")
+    if schema.get("maxLength") is not None:
+        text = text[:schema["maxLength"]]
+    return text
+
+
+FILLER_WORDS = (
+    "project", "milestone", "task", "team", "progress", "risk", "schedule", "delivery", "scope",
+    "review", "dependency", "phase", "estimate", "status", "update", "plan", "blocker", "resource",
+)
+
+
+def synthesize_text(rng: random.Random, max_chars: int) -> str:
+    """Deterministic markdown filler of about max_chars characters"""
+    lines = ["# Synthetic Response", ""]
+    length = sum(len(line) + 1 for line in lines)
+    while length < max_chars:
+        sentence = " ".join(rng.choice(FILLER_WORDS) for _ in range(rng.randint(6, 14))).capitalize() + "."
+        line = f"- {sentence}"
+        lines.append(line)
+        length += len(line) + 1
+    return "\n".join(lines)[:max(max_chars, 0)]
@@ -0,0 +1,415 @@
+"""
+Intent Module
+Local intent classification for chat messages: keyword rules, a naive Bayes
+model and regex entity extraction, so most messages need no model call
+"""
+from collections import Counter, defaultdict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+import math
+import re
+
+INTENTS = (
+    "create_project", "update_task", "view_status", "generate_report", "create_timeline",
+    "track_progress", "identify_risks", "ask_question", "other"
+)
+
+# Local results at or above this confidence are used without asking the model
+DEFAULT_INTENT_THRESHOLD = 0.6
+
+# Share of the final score given to keyword rules when any rule matches
+RULE_WEIGHT = 0.6
+
+# Rule weight at which matches count in full; weaker matches count proportionally
+RULE_SATURATION = 2.0
+
+# Keyword rules: (pattern, weight) per intent
+KEYWORD_RULES: Dict[str, List[Tuple[str, float]]] = {
+    "create_project": [
+        (r"\b(create|start|set up|setup|kick ?off|plan|launch|new)\b.{0,30}\bproject\b", 2.0),
+        (r"\bbreak (it |this )?down\b|\bproject plan\b", 1.0),
+        (r"\bi (want|need) to (build|launch|develop|create)\b", 1.0),
+    ],
+    "update_task": [
+        (r"\b(mark|set|move|update|change)\b.{0,40}\b(task|status|t-\d+)", 1.5),
+        (r"\b(is|as|now) (done|complete|completed|finished|blocked|in progress|started)\b", 1.5),
+        (r"\b(finished|completed|started|blocked on)\b.{0,20}\b(task|t-?\d+)", 1.5),
+        (r"\bassign\b.{0,30}\bto\b", 1.0),
+    ],
+    "view_status": [
+        (r"\b(status|state|health)\b.{0,20}\b(of|for)?\b.{0,20}\bproject\b", 1.5),
+        (r"\bhow (is|are)\b.{0,30}\b(going|doing)\b", 1.5),
+        (r"\b(show|give|what'?s)\b.{0,20}\b(status|overview|dashboard)\b", 1.5),
+    ],
+    "generate_report": [
+        (r"\b(report|summary|brief|update for (the )?(stakeholders|executives|leadership))\b", 1.5),
+        (r"\b(generate|create|write|prepare|draft|send)\b.{0,30}\b(report|summary|update)\b", 2.0),
+    ],
+    "create_timeline": [
+        (r"\b(timeline|schedule|gantt|roadmap)\b", 1.5),
+        (r"\bwhen (will|should|can)\b.{0,40}\b(finish|complete|done|ship|launch)\b", 1.0),
+    ],
+    "track_progress": [
+        (r"\b(progress|burndown|burn-down|velocity|completion|percent(age)? (done|complete))\b", 1.5),
+        (r"\bhow (much|many)\b.{0,30}\b(done|left|remaining|completed)\b", 1.5),
+        (r"\b(milestone|deadline)s?\b", 0.5),
+    ],
+    "identify_risks": [
+        (r"\b(risk|risks|risky|bottleneck|blocker|blockers|blocking|issue|issues|concern)\b", 1.5),
+        (r"\bwhat could go wrong\b|\bat risk\b|\bbehind schedule\b", 1.5),
+    ],
+    "ask_question": [
+        (r"^(what|how|why|when|who|which|can|could|should|is|are|do|does)\b.*\?$", 0.4),
+        (r"\b(explain|what is|what are|best practice|advice|tips?)\b", 1.0),
+    ],
+    "other": [
+        (r"^(hi|hello|hey|thanks|thank you|ok|okay|bye|good (morning|afternoon|evening))\b[\s!.]*$", 2.0),
+    ],
+}
+
+# Seed corpus the naive Bayes model is trained on
+TRAINING_EXAMPLES: List[Tuple[str, str]] = [
+    ("create a new project for our mobile app launch", "create_project"),
+    ("I want to start a project to migrate our database to the cloud", "create_project"),
+    ("plan a website redesign project", "create_project"),
+    ("set up a project for the Q3 marketing campaign", "create_project"),
+    ("help me plan building an e-commerce platform in 3 months", "create_project"),
+    ("break down this goal into phases and tasks", "create_project"),
+    ("new project: internal analytics dashboard", "create_project"),
+    ("kick off a project for the office move", "create_project"),
+    ("mark task T-12 as completed", "update_task"),
+    ("I finished the login page task", "update_task"),
+    ("set task_4 to in progress", "update_task"),
+    ("the API integration task is blocked", "update_task"),
+    ("update the status of task 7 to done", "update_task"),
+    ("task_3 is done, it took 6 hours", "update_task"),
+    ("move the design review to completed", "update_task"),
+    ("assign the testing task to Priya", "update_task"),
+    ("what is the status of the project", "view_status"),
+    ("how is the project going", "view_status"),
+    ("show me the current project status", "view_status"),
+    ("give me an overview of where we are", "view_status"),
+    ("project health check", "view_status"),
+    ("what's the state of the website project", "view_status"),
+    ("show the dashboard", "view_status"),
+    ("generate a weekly status report", "generate_report"),
+    ("write an executive summary for leadership", "generate_report"),
+    ("prepare a report for the stakeholders", "generate_report"),
+    ("create a monthly report", "generate_report"),
+    ("draft a stakeholder update email", "generate_report"),
+    ("send me a summary report of this week", "generate_report"),
+    ("I need a milestone report", "generate_report"),
+    ("create a timeline for the project", "create_timeline"),
+    ("build a schedule with dates for every task", "create_timeline"),
+    ("when will the project be finished", "create_timeline"),
+    ("make a gantt chart", "create_timeline"),
+    ("show the roadmap for next quarter", "create_timeline"),
+    ("reschedule the timeline starting next monday", "create_timeline"),
+    ("how much progress have we made", "track_progress"),
+    ("what percentage of tasks are complete", "track_progress"),
+    ("show the burndown chart", "track_progress"),
+    ("are we on track for the beta milestone", "track_progress"),
+    ("how many tasks are left", "track_progress"),
+    ("track our velocity this sprint", "track_progress"),
+    ("which deadlines are coming up", "track_progress"),
+    ("what are the biggest risks", "identify_risks"),
+    ("identify bottlenecks in the project", "identify_risks"),
+    ("what is blocking us", "identify_risks"),
+    ("are there any blockers", "identify_risks"),
+    ("what could go wrong with the launch", "identify_risks"),
+    ("which tasks are at risk of slipping", "identify_risks"),
+    ("list the issues and concerns", "identify_risks"),
+    ("what is the critical path method", "ask_question"),
+    ("how should I estimate task effort", "ask_question"),
+    ("what's the difference between a milestone and a deliverable", "ask_question"),
+    ("can you explain agile sprints", "ask_question"),
+    ("any tips for running a retrospective", "ask_question"),
+    ("why do projects usually run late", "ask_question"),
+    ("what are best practices for stakeholder communication", "ask_question"),
+    ("hello", "other"),
+    ("thanks", "other"),
+    ("hi there", "other"),
+    ("ok great", "other"),
+    ("good morning", "other"),
+    ("tell me a joke", "other"),
+]
+
+STOPWORDS = {
+    "a", "an", "the", "to", "of", "for", "and", "or", "in", "on", "at", "is", "it", "me", "my",
+    "our", "we", "i", "you", "this", "that", "be", "with", "as", "by", "please", "can", "could",
+}
+
+REQUIRED_ACTIONS = {
+    "create_project": "Generate a project plan with phases, milestones and tasks",
+    "update_task": "Update the task and analyze the impact",
+    "view_status": "Show the current project status",
+    "generate_report": "Generate a status report",
+    "create_timeline": "Create a project timeline",
+    "track_progress": "Report progress and completion metrics",
+    "identify_risks": "Identify risks and bottlenecks",
+    "ask_question": "Answer the question",
+    "other": "Respond conversationally",
+}
+
+# Entity patterns
+TASK_ID_PATTERN = re.compile(r"\b(task[_-]\d+|t-\d+|[a-z]{2,6}-\d+)\b|\btask\s+#?(\d+)\b|#(\d+)\b", re.IGNORECASE)
+PROJECT_ID_PATTERN = re.compile(r"\b(proj_\w+)\b", re.IGNORECASE)
+ISO_DATE_PATTERN = re.compile(r"\b(\d{4}-\d{2}-\d{2})\b")
+SLASH_DATE_PATTERN = re.compile(r"\b(\d{1,2})/(\d{1,2})(?:/(\d{2,4}))?\b")
+RELATIVE_DAY_PATTERN = re.compile(r"\b(today|tomorrow|yesterday)\b", re.IGNORECASE)
+IN_PERIOD_PATTERN = re.compile(r"\bin (\d+) (day|week)s?\b", re.IGNORECASE)
+WEEKDAY_PATTERN = re.compile(r"\b(next )?(monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b", re.IGNORECASE)
+# Full month names or their abbreviations only ("mark 5" is not March 5). A day
+# followed by a counted noun is a quantity, not a date ("may 3 tasks slip").
+MONTH_DAY_PATTERN = re.compile(
+    r"\b(jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?"
+    r"|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?\s+(\d{1,2})(?:st|nd|rd|th)?\b"
+    r"(?!\s+(?:more\s+|other\s+)?(?:tasks?|items?|things?|days?|weeks?|hours?|people|members?|bugs?"
+    r"|issues?|tickets?|stories|story|points?|milestones?|phases?|deliverables?)\b)",
+    re.IGNORECASE
+)
+MILESTONE_PATTERN = re.compile(r"\bmilestone\s+[\"']([^\"']+)[\"']|[\"']([^\"']+)[\"']\s+milestone\b", re.IGNORECASE)
+STATUS_PATTERNS = [
+    ("completed", re.compile(r"\b(done|complete|completed|finished)\b", re.IGNORECASE)),
+    ("in_progress", re.compile(r"\b(in progress|started|working on)\b", re.IGNORECASE)),
+    ("blocked", re.compile(r"\bblocked\b", re.IGNORECASE)),
+    ("at_risk", re.compile(r"\bat risk\b", re.IGNORECASE)),
+    ("not_started", re.compile(r"\bnot started\b", re.IGNORECASE)),
+]
+WEEKDAYS = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+MONTHS = ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased words (minus stopwords) plus adjacent-word bigrams"""
+    words = [word for word in re.findall(r"[a-z']+", text.lower()) if word not in STOPWORDS]
+    return words + [f"{first}_{second}" for first, second in zip(words, words[1:])]
+
+
+class NaiveBayesIntentModel:
+    """Multinomial naive Bayes over word and bigram counts, with add-one smoothing"""
+
+    def __init__(self, examples: Iterable[Tuple[str, str]] = ()):
+        self.class_counts: Counter = Counter()
+        self.token_counts: Dict[str, Counter] = defaultdict(Counter)
+        self.token_totals: Counter = Counter()
+        self.vocabulary = set()
+        self.train(examples)
+
+    def train(self, examples: Iterable[Tuple[str, str]]):
+        for text, intent in examples:
+            self.learn(text, intent)
+
+    def learn(self, text: str, intent: str):
+        """Add one labelled example"""
+        tokens = tokenize(text)
+        self.class_counts[intent] += 1
+        self.token_counts[intent].update(tokens)
+        self.token_totals[intent] += len(tokens)
+        self.vocabulary.update(tokens)
+
+    def predict_proba(self, text: str) -> Dict[str, float]:
+        """Posterior over intents; uniform-ish (low confidence) when no token is known"""
+        tokens = [token for token in tokenize(text) if token in self.vocabulary]
+        total_examples = sum(self.class_counts.values())
+        if not total_examples:
+            return {}
+        vocabulary_size = len(self.vocabulary)
+
+        log_scores = {}
+        for intent, count in self.class_counts.items():
+            score = math.log(count / total_examples)
+            denominator = self.token_totals[intent] + vocabulary_size
+            for token in tokens:
+                score += math.log((self.token_counts[intent][token] + 1) / denominator)
+            log_scores[intent] = score
+
+        # Temper long messages so many weak tokens do not compound into certainty
+        temperature = max(1.0, math.sqrt(len(tokens)))
+        peak = max(log_scores.values())
+        weights = {intent: math.exp((score - peak) / temperature) for intent, score in log_scores.items()}
+        total = sum(weights.values())
+        return {intent: weight / total for intent, weight in weights.items()}
+
+
+class IntentClassifier:
+    """
+    Classifies a chat message into one of INTENTS and extracts entities.
+
+    Keyword rule hits and naive Bayes probabilities are blended into a score
+    per intent; the best score is the confidence. Results have the same shape
+    as the model's parse_user_intent output, with "source": "local".
+    """
+
+    def __init__(self, examples: Optional[Iterable[Tuple[str, str]]] = None):
+        self.model = NaiveBayesIntentModel(TRAINING_EXAMPLES if examples is None else examples)
+        self.rules = {
+            intent: [(re.compile(pattern, re.IGNORECASE), weight) for pattern, weight in rules]
+            for intent, rules in KEYWORD_RULES.items()
+        }
+
+    def learn(self, text: str, intent: str):
+        """Add a labelled message (e.g. a confident model classification)"""
+        if intent in INTENTS:
+            self.model.learn(text, intent)
+
+    def scores(self, text: str) -> Dict[str, float]:
+        text = text.strip()
+        probabilities = self.model.predict_proba(text)
+        rule_hits = {
+            intent: sum(weight for pattern, weight in rules if pattern.search(text))
+            for intent, rules in self.rules.items()
+        }
+        rule_total = max(sum(rule_hits.values()), RULE_SATURATION)
+        if not any(rule_hits.values()):
+            return {intent: probabilities.get(intent, 0.0) for intent in INTENTS}
+        return {
+            intent: (1 - RULE_WEIGHT) * probabilities.get(intent, 0.0) + RULE_WEIGHT * rule_hits.get(intent, 0.0) / rule_total
+            for intent in INTENTS
+        }
+
+    def classify(self, text: str, project_context: Optional[Dict] = None,
+                 today: Optional[date] = None) -> Dict:
+        scores = self.scores(text)
+        intent = max(scores, key=scores.get)
+        entities = extract_entities(text, project_context, today)
+
+        questions = []
+        if intent == "update_task" and not entities["task_id"]:
+            questions.append("Which task should be updated?")
+        if intent == "update_task" and not entities["status"]:
+            questions.append("What is the task's new status?")
+
+        return {
+            "intent": intent,
+            "confidence": round(scores[intent], 3),
+            "entities": entities,
+            "required_action": REQUIRED_ACTIONS[intent],
+            "parameters": {key: value for key, value in entities.items() if value is not None},
+            "clarification_needed": bool(questions),
+            "clarification_questions": questions,
+            "source": "local"
+        }
+
+
+def extract_entities(text: str, project_context: Optional[Dict] = None,
+                     today: Optional[date] = None) -> Dict[str, Optional[str]]:
+    """Task/project IDs, milestone name, date (ISO) and status mentioned in a message"""
+    today = today or date.today()
+    entities: Dict[str, Optional[str]] = {
+        "project_id": None, "task_id": None, "milestone_name": None, "date": None, "status": None
+    }
+
+    match = PROJECT_ID_PATTERN.search(text)
+    if match:
+        entities["project_id"] = match.group(1)
+    elif project_context:
+        entities["project_id"] = project_context.get("project_id") or project_context.get("id")
+
+    entities["task_id"] = _find_task_id(text, project_context)
+
+    match = MILESTONE_PATTERN.search(text)
+    if match:
+        entities["milestone_name"] = (match.group(1) or match.group(2)).strip()
+    elif project_context:
+        entities["milestone_name"] = _find_named(text, _milestone_names(project_context))
+
+    entities["date"] = _find_date(text, today)
+
+    for status, pattern in STATUS_PATTERNS:
+        if pattern.search(text):
+            entities["status"] = status
+            break
+    return entities
+
+
+def _find_task_id(text: str, project_context: Optional[Dict]) -> Optional[str]:
+    # A task named in the message that exists in the project wins over a guessed ID
+    known = {}
+    for phase in (project_context or {}).get("phases", []) or []:
+        for task in phase.get("tasks", []) or []:
+            if isinstance(task, dict) and task.get("task_id"):
+                known[str(task["task_id"]).lower()] = task
+    lowered = text.lower()
+    for task_id, task in known.items():
+        if re.search(rf"\b{re.escape(task_id)}\b", lowered):
+            return task["task_id"]
+    for task in known.values():
+        title = str(task.get("title") or "").lower()
+        if len(title) > 3 and title in lowered:
+            return task["task_id"]
+
+    match = TASK_ID_PATTERN.search(text)
+    if not match:
+        return None
+    if match.group(1):
+        return match.group(1)
+    number = match.group(2) or match.group(3)
+    return f"task_{number}"
+
+
+def _milestone_names(project_context: Dict) -> List[str]:
+    names = []
+    for phase in project_context.get("phases", []) or []:
+        for milestone in phase.get("milestones", []) or []:
+            name = milestone.get("name") if isinstance(milestone, dict) else milestone
+            if name:
+                names.append(str(name))
+    return names
+
+
+def _find_named(text: str, names: List[str]) -> Optional[str]:
+    lowered = text.lower()
+    for name in sorted(names, key=len, reverse=True):
+        if len(name) > 3 and name.lower() in lowered:
+            return name
+    return None
+
+
+def _find_date(text: str, today: date) -> Optional[str]:
+    match = ISO_DATE_PATTERN.search(text)
+    if match:
+        try:
+            return datetime.strptime(match.group(1), "%Y-%m-%d").date().isoformat()
+        except ValueError:
+            pass
+
+    match = RELATIVE_DAY_PATTERN.search(text)
+    if match:
+        offset = {"today": 0, "tomorrow": 1, "yesterday": -1}[match.group(1).lower()]
+        return (today + timedelta(days=offset)).isoformat()
+
+    match = IN_PERIOD_PATTERN.search(text)
+    if match:
+        days = int(match.group(1)) * (7 if match.group(2).lower() == "week" else 1)
+        return (today + timedelta(days=days)).isoformat()
+
+    match = WEEKDAY_PATTERN.search(text)
+    if match:
+        ahead = (WEEKDAYS.index(match.group(2).lower()) - today.weekday()) % 7
+        if ahead == 0 or match.group(1):
+            ahead = ahead or 7
+        return (today + timedelta(days=ahead)).isoformat()
+
+    match = MONTH_DAY_PATTERN.search(text)
+    if match:
+        return _resolve_month_day(today, MONTHS.index(match.group(1).lower()[:3]) + 1, int(match.group(2)))
+
+    match = SLASH_DATE_PATTERN.search(text)
+    if match:
+        year = int(match.group(3)) if match.group(3) else None
+        if year is not None and year < 100:
+            year += 2000
+        return _resolve_month_day(today, int(match.group(1)), int(match.group(2)), year)
+    return None
+
+
+def _resolve_month_day(today: date, month: int, day: int, year: Optional[int] = None) -> Optional[str]:
+    """Month/day (US order) as ISO; without a year, the next such date from today"""
+    try:
+        resolved = date(year or today.year, month, day)
+        if year is None and resolved < today:
+            resolved = date(today.year + 1, month, day)
+    except ValueError:
+        return None
+    return resolved.isoformat()
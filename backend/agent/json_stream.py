@@ -0,0 +1,251 @@
+"""
+JSON Stream Module
+Incremental extraction of JSON from (streamed) model output, with truncation repair
+"""
+from typing import Any, Callable, List, Optional, Tuple
+import json
+import re
+
+# (top-level key or None for a root array, completed element)
+ItemCallback = Callable[[Optional[str], Any], None]
+
+WHITESPACE = " \t\r\n"
+LITERALS = ("true", "false", "null")
+FENCE_PATTERN = re.compile(r"```(?:json)?\s*\n(.*?)(?:```|$)", re.DOTALL)
+# Trailing run of backslashes + "u" + up to three hex digits (a cut-off \uXXXX escape if the run is odd)
+PARTIAL_UNICODE_ESCAPE = re.compile(r"(\\+)u[0-9a-fA-F]{0,3}$")
+
+# Container frame states
+EXPECT_KEY = "key"        # object: next token is a key or "}"
+EXPECT_COLON = "colon"    # object: key read, ":" next
+EXPECT_VALUE = "value"    # object or array: next token is a value (or "]")
+EXPECT_COMMA = "comma"    # value read, "," or closer next
+
+
+class _Frame:
+    __slots__ = ("kind", "state", "key", "item_start")
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.state = EXPECT_KEY if kind == "{" else EXPECT_VALUE
+        self.key: Optional[str] = None
+        self.item_start: Optional[int] = None
+
+
+class IncrementalJSONParser:
+    """
+    Character-level scanner over a growing buffer of model output.
+
+    feed() returns elements of top-level arrays (e.g. "phases", "risks", or the
+    root array) as soon as each one closes; close() returns the whole document,
+    repairing it first if the output was cut off mid-structure.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.repaired = False
+        self._pos = 0
+        self._root_start: Optional[int] = None
+        self._root_end: Optional[int] = None
+        self._stack: List[_Frame] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._scalar_start: Optional[int] = None
+
+    @property
+    def done(self) -> bool:
+        return self._root_end is not None
+
+    def feed(self, text: str) -> List[Tuple[Optional[str], Any]]:
+        """Add a chunk of output; returns newly completed top-level array elements"""
+        self.buffer += text
+        items: List[Tuple[Optional[str], Any]] = []
+        buffer = self.buffer
+        pos = self._pos
+
+        while pos < len(buffer) and not self.done:
+            char = buffer[pos]
+
+            if self._root_start is None:
+                if char in "{[":
+                    self._root_start = pos
+                    self._stack.append(_Frame(char))
+                pos += 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    self._end_string(pos, items)
+                pos += 1
+                continue
+
+            if self._scalar_start is not None:
+                if char not in WHITESPACE and char not in ",:]}":
+                    pos += 1
+                    continue
+                self._end_value(pos, items)
+                self._scalar_start = None
+
+            frame = self._stack[-1]
+            if char in WHITESPACE:
+                pass
+            elif char == '"':
+                self._start_value(frame, pos)
+                self._in_string = True
+                self._string_start = pos
+            elif char in "{[":
+                self._start_value(frame, pos)
+                frame.state = EXPECT_COMMA
+                self._stack.append(_Frame(char))
+            elif char in "}]":
+                self._stack.pop()
+                if not self._stack:
+                    self._root_end = pos + 1
+                else:
+                    self._end_value(pos + 1, items)
+            elif char == ":":
+                frame.state = EXPECT_VALUE
+            elif char == ",":
+                frame.state = EXPECT_KEY if frame.kind == "{" else EXPECT_VALUE
+            else:
+                self._start_value(frame, pos)
+                self._scalar_start = pos
+            pos += 1
+
+        self._pos = pos
+        return items
+
+    def close(self) -> Any:
+        """The complete document; truncated output is repaired. Raises ValueError if there is none."""
+        if self._root_start is None:
+            raise ValueError("No JSON object or array found")
+        if self.done:
+            return json.loads(self.buffer[self._root_start:self._root_end])
+        self.repaired = True
+        return json.loads(self._repaired_text())
+
+    #  SCANNER HELPERS
+
+    def _item_frame(self) -> Optional[_Frame]:
+        """The array whose elements are emitted: the root array, or an array directly under the root object"""
+        depth = len(self._stack)
+        if depth == 1 and self._stack[0].kind == "[":
+            return self._stack[0]
+        if depth == 2 and self._stack[0].kind == "{" and self._stack[1].kind == "[":
+            return self._stack[1]
+        return None
+
+    def _start_value(self, frame: _Frame, pos: int):
+        if frame.kind == "[" and frame is self._item_frame():
+            frame.item_start = pos
+
+    def _end_string(self, pos: int, items: List):
+        frame = self._stack[-1]
+        if frame.kind == "{" and frame.state == EXPECT_KEY:
+            try:
+                frame.key = json.loads(self.buffer[self._string_start:pos + 1])
+            except ValueError:
+                frame.key = None
+            frame.state = EXPECT_COLON
+        else:
+            self._end_value(pos + 1, items)
+
+    def _end_value(self, end: int, items: List):
+        """A value ended at `end` inside the current top frame"""
+        frame = self._stack[-1]
+        frame.state = EXPECT_COMMA
+        if frame.item_start is None or frame is not self._item_frame():
+            return
+        start, frame.item_start = frame.item_start, None
+        try:
+            value = json.loads(self.buffer[start:end])
+        except ValueError:
+            return
+        key = self._stack[0].key if len(self._stack) == 2 else None
+        items.append((key, value))
+
+    def _repaired_text(self) -> str:
+        """Close any open string/literal/containers so a truncated document parses"""
+        text = self.buffer[self._root_start:]
+        stack = self._stack
+        frame = stack[-1]
+        state = frame.state
+
+        if self._in_string:
+            if self._escape:
+                text = text[:-1]
+            # Drop a partial \\uXXXX escape (an odd run of backslashes; an even run is
+            # escaped backslashes followed by a literal "u")
+            partial = PARTIAL_UNICODE_ESCAPE.search(text)
+            if partial and len(partial.group(1)) % 2 == 1:
+                text = text[:partial.end(1) - 1]
+            text += '"'
+            state = EXPECT_COLON if frame.kind == "{" and state == EXPECT_KEY else EXPECT_COMMA
+        elif self._scalar_start is not None:
+            offset = self._scalar_start - self._root_start
+            text = text[:offset] + _complete_literal(text[offset:])
+            state = EXPECT_COMMA
+
+        text = text.rstrip(WHITESPACE)
+        if state == EXPECT_COLON:
+            text += ":null"
+        elif state == EXPECT_VALUE and frame.kind == "{":
+            text += "null"
+        elif text.endswith(","):
+            text = text[:-1]
+
+        for open_frame in reversed(stack):
+            text += "}" if open_frame.kind == "{" else "]"
+        return text
+
+
+def _complete_literal(token: str) -> str:
+    """Best completion of a literal cut off mid-token"""
+    for literal in LITERALS:
+        if literal.startswith(token):
+            return literal
+    number = token.rstrip(".eE+-")
+    try:
+        json.loads(number)
+        return number
+    except ValueError:
+        return "null"
+
+
+def extract_json_text(text: str) -> str:
+    """The body of the first ```json fence if there is one, else the text itself"""
+    match = FENCE_PATTERN.search(text)
+    return match.group(1) if match else text
+
+
+def parse_json_response(text: str) -> Any:
+    """
+    Parse the JSON document in a model response
+    Ignores surrounding prose and code fences; repairs truncated output.
+    Returns {"raw_response", "error"} when no JSON can be recovered.
+    """
+    body = extract_json_text(text)
+    starts = [index for index in (body.find("{"), body.find("[")) if index != -1]
+    if starts:
+        try:
+            return json.JSONDecoder().raw_decode(body, min(starts))[0]
+        except ValueError:
+            pass
+
+        parser = IncrementalJSONParser()
+        parser.feed(body)
+        try:
+            value = parser.close()
+            if parser.repaired:
+                print("Repaired truncated JSON response")
+            return value
+        except ValueError as e:
+            print(f"Error parsing JSON: {e}")
+
+    return {"raw_response": text, "error": "Failed to parse JSON"}
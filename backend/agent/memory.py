@@ -0,0 +1,183 @@
+"""
+Memory Module
+Token-budgeted conversation memory with a rolling summary of older turns
+"""
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+import threading
+
+from .serializer import CHARS_PER_TOKEN, PromptSerializer
+
+# User/assistant exchanges kept verbatim once older ones have been summarized
+DEFAULT_RECENT_TURNS = 10
+
+# Estimated input tokens (system prompt, summary and messages) never exceeded per chat call
+DEFAULT_INPUT_BUDGET = 12000
+
+SUMMARY_HEADER = "Summary of the earlier conversation:"
+TRUNCATION_MARKER = "\n[...truncated]"
+
+# (previous summary, messages to fold in) -> updated summary
+Summarizer = Callable[[str, List[Dict]], str]
+
+
+class ConversationMemory:
+    """
+    Chat history for one conversation, bounded in both turns and tokens.
+
+    The last recent_turns exchanges are kept verbatim. Older ones are folded
+    into a rolling summary on a background thread after a reply completes,
+    so summarization never delays a response; until a fold finishes, the
+    turns it covers are still sent verbatim. build() assembles the request
+    context within input_budget, dropping the oldest turns (and truncating
+    the summary or latest message as a last resort), and reports what it cut.
+    """
+
+    def __init__(self, summarize: Optional[Summarizer] = None,
+                 recent_turns: int = DEFAULT_RECENT_TURNS,
+                 input_budget: int = DEFAULT_INPUT_BUDGET):
+        self.summarize = summarize
+        self.recent_turns = recent_turns
+        self.input_budget = input_budget
+
+        self.messages: List[Dict] = []
+        self.summary = ""
+        self.summarized_messages = 0
+        self.dropped_messages = 0
+        self.last_report: Dict = {}
+
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._folder: Optional[ThreadPoolExecutor] = None
+        self._fold: Optional[Future] = None
+
+    estimate_tokens = staticmethod(PromptSerializer.estimate_tokens)
+
+    #  HISTORY
+
+    def append(self, role: str, content: str):
+        with self._lock:
+            self.messages.append({"role": role, "content": content})
+
+    def discard_last(self, role: str):
+        """Drop the latest message if it has this role (e.g. a user turn whose reply never arrived)"""
+        with self._lock:
+            if self.messages and self.messages[-1]["role"] == role:
+                self.messages.pop()
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self.messages = []
+            self.summary = ""
+            self.summarized_messages = 0
+            self.dropped_messages = 0
+            self.last_report = {}
+
+    #  CONTEXT
+
+    def build(self, system: str) -> Tuple[str, List[Dict], Dict]:
+        """System prompt (with the summary) and messages for the next call, plus a trimming report"""
+        with self._lock:
+            summary = self.summary
+            messages = list(self.messages)
+            total = self.summarized_messages + self.dropped_messages + len(messages)
+
+        report = {
+            "budget": self.input_budget,
+            "total_messages": total,
+            "summarized_messages": self.summarized_messages,
+            "trimmed_messages": self.dropped_messages,
+            "trimmed_tokens": 0,
+            "summary_truncated": False,
+            "message_truncated": False
+        }
+
+        system_tokens = self.estimate_tokens(system)
+        message_tokens = [self.estimate_tokens(message["content"]) for message in messages]
+        summary_tokens = self.estimate_tokens(summary) if summary else 0
+
+        # Oldest turns go first; keep the history starting on a user turn
+        start = 0
+        used = system_tokens + summary_tokens + sum(message_tokens)
+        while start < len(messages) - 1 and (used > self.input_budget or messages[start]["role"] != "user"):
+            used -= message_tokens[start]
+            report["trimmed_tokens"] += message_tokens[start]
+            start += 1
+        report["trimmed_messages"] += start
+        messages, message_tokens = messages[start:], message_tokens[start:]
+
+        over = used - self.input_budget
+        if over > 0 and summary:
+            summary, cut = _truncate(summary, summary_tokens - over)
+            report["summary_truncated"] = True
+            report["trimmed_tokens"] += cut
+            summary_tokens -= cut
+            over -= cut
+        if over > 0 and messages:
+            content, cut = _truncate(messages[-1]["content"], message_tokens[-1] - over)
+            messages[-1] = {**messages[-1], "content": content}
+            report["message_truncated"] = True
+            report["trimmed_tokens"] += cut
+
+        if summary:
+            system = f"{system}\n\n{SUMMARY_HEADER}\n{summary}"
+        report["sent_messages"] = len(messages)
+        report["estimated_tokens"] = self.estimate_tokens(system) + sum(
+            self.estimate_tokens(message["content"]) for message in messages
+        )
+        report["summary_pending"] = self._fold is not None and not self._fold.done()
+        self.last_report = report
+        return system, messages, report
+
+    #  SUMMARIZATION
+
+    def compact(self):
+        """
+        Fold exchanges beyond recent_turns into the summary, in the background
+        Without a summarizer they are dropped instead.
+        """
+        with self._lock:
+            excess = len(self.messages) - 2 * self.recent_turns
+            excess -= excess % 2
+            if excess <= 0 or (self._fold is not None and not self._fold.done()):
+                return
+            folded = self.messages[:excess]
+            if self.summarize is None:
+                del self.messages[:excess]
+                self.dropped_messages += excess
+                return
+            if self._folder is None:
+                self._folder = ThreadPoolExecutor(max_workers=1)
+            self._fold = self._folder.submit(self._fold_into_summary, self.summary, folded, self._generation)
+
+    def wait_for_summary(self, timeout: Optional[float] = None):
+        """Block until a running fold has finished"""
+        if self._fold is not None:
+            self._fold.result(timeout)
+
+    def _fold_into_summary(self, previous: str, folded: List[Dict], generation: int):
+        try:
+            summary = self.summarize(previous, folded)
+        except Exception as e:
+            # Keep the turns verbatim; the next compact() retries
+            print(f"Error summarizing conversation: {e}")
+            return
+        with self._lock:
+            # Discard the result if the conversation was reset or changed underneath
+            head = self.messages[:len(folded)]
+            if generation != self._generation or len(head) < len(folded) or any(
+                    kept is not old for kept, old in zip(head, folded)):
+                return
+            del self.messages[:len(folded)]
+            self.summary = summary.strip()
+            self.summarized_messages += len(folded)
+
+
+def _truncate(text: str, max_tokens: int) -> Tuple[str, int]:
+    """Cut text to about max_tokens; returns (text, tokens removed)"""
+    keep = max((max_tokens - 1) * CHARS_PER_TOKEN - len(TRUNCATION_MARKER), 0)
+    if len(text) <= keep:
+        return text, 0
+    removed = (len(text) - keep) // CHARS_PER_TOKEN
+    return text[:keep] + TRUNCATION_MARKER, removed
@@ -0,0 +1,683 @@
+"""
+Metrics Module
+Local, deterministic project metrics computed directly from task data
+"""
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from .tools import CalculationTools, DateTimeTools
+
+PRIORITIES = ("high", "medium", "low")
+
+# Fields that may carry the date a task was completed, in order of preference
+COMPLETION_DATE_FIELDS = ("completed_at", "actual_end_date", "end_date", "updated_at")
+
+# Trailing window used for velocity trend detection
+VELOCITY_WINDOW_DAYS = 14
+
+# Project field holding the append-only list of task status change events
+STATUS_HISTORY_FIELD = "status_history"
+
+RISK_LEVELS = ("critical", "high", "medium", "low")
+
+# Number of risks / activities listed on the dashboard
+DASHBOARD_TOP_RISKS = 5
+DASHBOARD_RECENT_ACTIVITIES = 10
+
+ACTIVITY_TYPES = {"completed": "completion", "in_progress": "start", "blocked": "blocker", "at_risk": "blocker"}
+
+# Judgement fields an optional model assessment may overwrite: section -> keys (None = whole section)
+AGGREGATE_QUALITATIVE_FIELDS = {
+    "performance_metrics": ("velocity_trend",),
+    "risk_metrics": ("overall_risk_level",),
+}
+DASHBOARD_QUALITATIVE_FIELDS = {
+    "progress_indicators": ("completion_trend",),
+    "health_indicators": ("overall_health", "schedule_health", "resource_health", "quality_health", "risk_health"),
+    "top_risks": None,
+}
+
+
+def parse_day(value: Any) -> Optional[date]:
+    """Best-effort conversion of a date/ISO timestamp string to a date"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = str(value)
+    try:
+        return datetime.fromisoformat(text.replace("Z", "+00:00")).date()
+    except ValueError:
+        pass
+    try:
+        return DateTimeTools.parse_date(text).date()
+    except ValueError:
+        return None
+
+
+def iter_phases(project_data: Dict) -> List[Dict]:
+    """Phases of a project or plan (never the duplicated plan.phases copy)"""
+    phases = project_data.get("phases")
+    if phases is None and isinstance(project_data.get("plan"), dict):
+        phases = project_data["plan"].get("phases")
+    return [phase for phase in (phases or []) if isinstance(phase, dict)]
+
+
+def normalize_status(status: Any) -> str:
+    return str(status or "not_started").strip().lower().replace(" ", "_").replace("-", "_")
+
+
+def normalize_priority(priority: Any) -> str:
+    value = str(priority or "medium").strip().lower()
+    return value if value in PRIORITIES else "medium"
+
+
+@dataclass
+class TaskTable:
+    """
+    Column-oriented view of every task in a project, built in a single pass.
+    Row i of each column describes the same task.
+    """
+    task_ids: List[str] = field(default_factory=list)
+    titles: List[str] = field(default_factory=list)
+    phase_index: List[int] = field(default_factory=list)
+    statuses: List[str] = field(default_factory=list)
+    priorities: List[str] = field(default_factory=list)
+    estimated_hours: List[float] = field(default_factory=list)
+    actual_hours: List[float] = field(default_factory=list)
+    completed_on: List[Optional[date]] = field(default_factory=list)
+    deadlines: List[Optional[date]] = field(default_factory=list)
+    assignees: List[Optional[str]] = field(default_factory=list)
+    phase_names: List[str] = field(default_factory=list)
+    phases: List[Dict] = field(default_factory=list)
+
+    @classmethod
+    def from_project(cls, project_data: Dict) -> "TaskTable":
+        table = cls()
+        table.phases = iter_phases(project_data)
+        groups = [(index, phase.get("tasks") or []) for index, phase in enumerate(table.phases)]
+        table.phase_names = [
+            phase.get("name") or f"Phase {phase.get('phase_number', index + 1)}"
+            for index, phase in enumerate(table.phases)
+        ]
+        if project_data.get("tasks"):
+            groups.append((-1, project_data["tasks"]))
+
+        for phase_index, tasks in groups:
+            for task in tasks:
+                if isinstance(task, dict):
+                    table._append(task, phase_index)
+        return table
+
+    def _append(self, task: Dict, phase_index: int):
+        status = normalize_status(task.get("status"))
+        self.task_ids.append(str(task.get("task_id") or task.get("id") or f"task_{len(self.task_ids) + 1}"))
+        self.titles.append(task.get("title") or "")
+        self.phase_index.append(phase_index)
+        self.statuses.append(status)
+        self.priorities.append(normalize_priority(task.get("priority")))
+        self.estimated_hours.append(_as_float(task.get("estimated_hours")))
+        self.actual_hours.append(_as_float(task.get("actual_hours")))
+        completed_on = None
+        if status == "completed":
+            for name in COMPLETION_DATE_FIELDS:
+                completed_on = parse_day(task.get(name))
+                if completed_on:
+                    break
+        self.completed_on.append(completed_on)
+        self.deadlines.append(parse_day(task.get("deadline") or task.get("due_date") or task.get("end_date")))
+        self.assignees.append(task.get("assignee"))
+
+    def __len__(self) -> int:
+        return len(self.task_ids)
+
+
+def _as_float(value: Any) -> float:
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _pct(part: float, whole: float) -> float:
+    return CalculationTools.calculate_completion_percentage(part, whole)
+
+
+class MetricsEngine:
+    """Computes the numeric project metrics the agent modules used to ask the model for"""
+
+    def __init__(self, at_risk_gap: float = 25.0):
+        # A milestone is at risk when expected progress exceeds actual by this many points
+        self.at_risk_gap = at_risk_gap
+
+    def completion(self, project_data: Dict, current_date: Optional[str] = None,
+                   table: Optional[TaskTable] = None) -> Dict:
+        """
+        Same shape as ProgressTracker.calculate_completion_percentage:
+        overall_completion, by_phase, by_priority, milestone_progress, velocity
+        """
+        table = table or TaskTable.from_project(project_data)
+        today = parse_day(current_date) or date.today()
+        phase_count = len(table.phases)
+
+        total_tasks = len(table)
+        completed_tasks = 0
+        total_hours = 0.0
+        completed_hours = 0.0
+        phase_total = [0] * phase_count
+        phase_done = [0] * phase_count
+        phase_started = [0] * phase_count
+        priority_total = dict.fromkeys(PRIORITIES, 0)
+        priority_done = dict.fromkeys(PRIORITIES, 0)
+        done_by_id = {}
+
+        for i in range(total_tasks):
+            done = table.statuses[i] == "completed"
+            hours = table.estimated_hours[i]
+            phase = table.phase_index[i]
+            priority = table.priorities[i]
+
+            total_hours += hours
+            priority_total[priority] += 1
+            if phase >= 0:
+                phase_total[phase] += 1
+                if table.statuses[i] != "not_started":
+                    phase_started[phase] += 1
+            if done:
+                completed_tasks += 1
+                completed_hours += hours
+                priority_done[priority] += 1
+                if phase >= 0:
+                    phase_done[phase] += 1
+            done_by_id[table.task_ids[i]] = done
+
+        by_phase = []
+        for index in range(phase_count):
+            if phase_total[index] and phase_done[index] == phase_total[index]:
+                status = "completed"
+            elif phase_started[index]:
+                status = "in_progress"
+            else:
+                status = "not_started"
+            by_phase.append({
+                "phase_name": table.phase_names[index],
+                "completion_percentage": _pct(phase_done[index], phase_total[index]),
+                "status": status
+            })
+
+        return {
+            "overall_completion": {
+                "percentage": _pct(completed_tasks, total_tasks),
+                "completed_tasks": completed_tasks,
+                "total_tasks": total_tasks,
+                "completed_hours": round(completed_hours, 1),
+                "total_estimated_hours": round(total_hours, 1)
+            },
+            "by_phase": by_phase,
+            "by_priority": {
+                priority: {
+                    "completed": priority_done[priority],
+                    "total": priority_total[priority],
+                    "percentage": _pct(priority_done[priority], priority_total[priority])
+                }
+                for priority in PRIORITIES
+            },
+            "milestone_progress": self.milestone_progress(project_data, table, done_by_id, by_phase, today),
+            "velocity": self.velocity(project_data, table, today)
+        }
+
+    def milestone_progress(self, project_data: Dict, table: TaskTable, done_by_id: Dict[str, bool],
+                           by_phase: List[Dict], today: date) -> List[Dict]:
+        project_start = project_start_date(project_data)
+        progress = []
+        for index, phase in enumerate(table.phases):
+            for milestone in phase.get("milestones") or []:
+                if isinstance(milestone, str):
+                    milestone = {"name": milestone}
+                associated = milestone.get("associated_tasks") or []
+                if associated:
+                    done = sum(1 for task_id in associated if done_by_id.get(task_id))
+                    percentage = _pct(done, len(associated))
+                else:
+                    percentage = by_phase[index]["completion_percentage"]
+
+                target = milestone_target_date(milestone, project_start)
+                progress.append({
+                    "milestone": milestone.get("name", ""),
+                    "completion_percentage": percentage,
+                    "status": self._milestone_status(percentage, target, project_start, today)
+                })
+        return progress
+
+    def _milestone_status(self, percentage: float, target: Optional[date],
+                          project_start: Optional[date], today: date) -> str:
+        if percentage >= 100:
+            return "achieved"
+        if target is None:
+            return "on_track"
+        if today > target:
+            return "missed"
+        if project_start and target > project_start:
+            expected = min(100.0, 100.0 * (today - project_start).days / (target - project_start).days)
+            if expected - percentage > self.at_risk_gap:
+                return "at_risk"
+        return "on_track"
+
+    def velocity(self, project_data: Dict, table: TaskTable, today: date) -> Dict:
+        """Completed tasks/hours per week since project start, with a recent-window trend"""
+        dated = [
+            (table.completed_on[i], table.estimated_hours[i])
+            for i in range(len(table)) if table.completed_on[i] is not None
+        ]
+        completed = sum(1 for status in table.statuses if status == "completed")
+        completed_hours = sum(
+            table.estimated_hours[i] for i in range(len(table)) if table.statuses[i] == "completed"
+        )
+
+        start = project_start_date(project_data)
+        if start is None and dated:
+            start = min(day for day, _ in dated)
+        elapsed_days = max((today - start).days, 1) if start else 0
+
+        recent = previous = 0
+        window_start = today - timedelta(days=VELOCITY_WINDOW_DAYS)
+        previous_start = window_start - timedelta(days=VELOCITY_WINDOW_DAYS)
+        for day, _ in dated:
+            if window_start < day <= today:
+                recent += 1
+            elif previous_start < day <= window_start:
+                previous += 1
+
+        if recent > previous * 1.1 and recent - previous >= 1:
+            trend = "increasing"
+        elif recent < previous * 0.9:
+            trend = "decreasing"
+        else:
+            trend = "stable"
+
+        return {
+            "tasks_per_week": CalculationTools.calculate_velocity(completed, elapsed_days),
+            "hours_per_week": round(completed_hours / (elapsed_days / 7), 2) if elapsed_days else 0.0,
+            "trend": trend
+        }
+
+
+    #  AGGREGATES
+
+    def stats(self, project_data: Dict, current_date: Optional[str] = None,
+              table: Optional[TaskTable] = None) -> Dict:
+        """
+        Every number behind aggregate_metrics and the metrics dashboard,
+        gathered in a single pass over the task table
+        """
+        table = table or TaskTable.from_project(project_data)
+        today = parse_day(current_date) or date.today()
+        phase_count = len(table.phases)
+
+        by_status = {"not_started": 0, "in_progress": 0, "completed": 0, "blocked": 0}
+        priority_total = dict.fromkeys(PRIORITIES, 0)
+        priority_done = dict.fromkeys(PRIORITIES, 0)
+        phase_total = [0] * phase_count
+        phase_done = [0] * phase_count
+        done_by_id = {}
+        active_by_assignee: Dict[str, int] = {}
+        estimated = completed_estimated = actual = overtime = 0.0
+        completed_actual = completed_actual_estimated = 0.0
+        completed_with_actual = on_time = late = 0
+
+        for i in range(len(table)):
+            status = table.statuses[i]
+            hours = table.estimated_hours[i]
+            spent = table.actual_hours[i]
+            phase = table.phase_index[i]
+            done = status == "completed"
+
+            by_status[status] = by_status.get(status, 0) + 1
+            priority_total[table.priorities[i]] += 1
+            estimated += hours
+            actual += spent
+            if spent > hours:
+                overtime += spent - hours
+            if phase >= 0:
+                phase_total[phase] += 1
+            if status == "in_progress" and table.assignees[i]:
+                active_by_assignee[table.assignees[i]] = active_by_assignee.get(table.assignees[i], 0) + 1
+            if done:
+                priority_done[table.priorities[i]] += 1
+                completed_estimated += hours
+                if phase >= 0:
+                    phase_done[phase] += 1
+                if spent > 0:
+                    completed_with_actual += 1
+                    completed_actual += spent
+                    completed_actual_estimated += hours
+                if table.completed_on[i] and table.deadlines[i]:
+                    if table.completed_on[i] <= table.deadlines[i]:
+                        on_time += 1
+                    else:
+                        late += 1
+            done_by_id[table.task_ids[i]] = done
+
+        by_phase = [{"completion_percentage": _pct(phase_done[i], phase_total[i])} for i in range(phase_count)]
+        start = project_start_date(project_data)
+        planned_end = parse_day(project_data.get("deadline") or project_data.get("end_date"))
+        if planned_end is None:
+            planned_end = max((day for day in table.deadlines if day), default=None)
+
+        team = project_data.get("team_members") or []
+        team_size = len(team) if team else len({name for name in table.assignees if name})
+
+        return {
+            "today": today,
+            "total_tasks": len(table),
+            "by_status": by_status,
+            "priority_total": priority_total,
+            "priority_done": priority_done,
+            "estimated_hours": estimated,
+            "completed_estimated_hours": completed_estimated,
+            "actual_hours": actual,
+            "overtime_hours": overtime,
+            "completed_with_actual": completed_with_actual,
+            "completed_actual_hours": completed_actual,
+            "completed_actual_estimated_hours": completed_actual_estimated,
+            "on_time": on_time,
+            "late": late,
+            "total_phases": phase_count,
+            "completed_phases": sum(1 for i in range(phase_count) if phase_total[i] and phase_done[i] == phase_total[i]),
+            "milestones": self.milestone_progress(project_data, table, done_by_id, by_phase, today),
+            "velocity": self.velocity(project_data, table, today),
+            "start": start,
+            "planned_end": planned_end,
+            "team_size": team_size,
+            "active_by_assignee": active_by_assignee,
+            "rework_tasks": _reopened_tasks(project_data.get(STATUS_HISTORY_FIELD) or []),
+            "risks": _risk_levels(project_data.get("risks") or []),
+        }
+
+    def aggregate_metrics(self, project_data: Dict, current_date: Optional[str] = None) -> Dict:
+        """Same shape as ProjectSummarizer.aggregate_metrics"""
+        stats = self.stats(project_data, current_date)
+        today = stats["today"]
+        total = stats["total_tasks"]
+        completed = stats["by_status"]["completed"]
+        completion = _pct(completed, total)
+        schedule = self._schedule(stats, completion)
+
+        risk_counts = {level: 0 for level in RISK_LEVELS}
+        for _, level in stats["risks"]:
+            risk_counts[level] += 1
+        efficiency = None
+        if stats["completed_actual_hours"]:
+            efficiency = round(min(100.0, 100.0 * stats["completed_actual_estimated_hours"] / stats["completed_actual_hours"]), 1)
+        team_size = stats["team_size"]
+
+        return {
+            "summary_metrics": {
+                "total_tasks": total,
+                "completed_tasks": completed,
+                "in_progress_tasks": stats["by_status"]["in_progress"],
+                "blocked_tasks": stats["by_status"]["blocked"],
+                "completion_percentage": completion,
+                "total_estimated_hours": round(stats["estimated_hours"], 1),
+                "hours_completed": round(stats["completed_estimated_hours"], 1),
+                "hours_remaining": round(stats["estimated_hours"] - stats["completed_estimated_hours"], 1),
+                "total_phases": stats["total_phases"],
+                "completed_phases": stats["completed_phases"],
+                "total_milestones": len(stats["milestones"]),
+                "achieved_milestones": sum(1 for item in stats["milestones"] if item["status"] == "achieved")
+            },
+            "timeline_metrics": {
+                "project_start_date": _iso(stats["start"]),
+                "current_date": today.isoformat(),
+                "planned_end_date": _iso(stats["planned_end"]),
+                "projected_end_date": _iso(schedule["projected_end"]),
+                "elapsed_days": schedule["elapsed_days"],
+                "remaining_days": schedule["remaining_days"],
+                "schedule_variance_days": schedule["variance_days"],
+                "on_schedule": schedule["on_schedule"]
+            },
+            "performance_metrics": {
+                "tasks_completed_per_week": stats["velocity"]["tasks_per_week"],
+                "average_task_completion_time": (
+                    round(stats["completed_actual_hours"] / stats["completed_with_actual"], 1)
+                    if stats["completed_with_actual"] else None
+                ),
+                "velocity_trend": stats["velocity"]["trend"],
+                "efficiency_score": efficiency
+            },
+            "quality_metrics": {
+                "tasks_completed_on_time": stats["on_time"],
+                "tasks_completed_late": stats["late"],
+                "rework_percentage": _pct(stats["rework_tasks"], completed + stats["rework_tasks"]),
+                "quality_score": self._quality_score(stats)
+            },
+            "risk_metrics": {
+                "total_risks": len(stats["risks"]),
+                "high_priority_risks": risk_counts["critical"] + risk_counts["high"],
+                "medium_priority_risks": risk_counts["medium"],
+                "low_priority_risks": risk_counts["low"],
+                "overall_risk_level": _overall_risk_level(risk_counts)
+            },
+            "resource_metrics": {
+                "team_size": team_size,
+                "team_utilization_percentage": _pct(len(stats["active_by_assignee"]), team_size),
+                "overtime_hours": round(stats["overtime_hours"], 1),
+                "resource_constraints": sum(1 for count in stats["active_by_assignee"].values() if count > 1)
+            }
+        }
+
+    def dashboard(self, project_data: Dict, current_date: Optional[str] = None) -> Dict:
+        """Same shape as ReportGenerator.generate_metrics_dashboard"""
+        stats = self.stats(project_data, current_date)
+        total = stats["total_tasks"]
+        completed = stats["by_status"]["completed"]
+        completion = _pct(completed, total)
+        schedule = self._schedule(stats, completion)
+        spi = schedule["spi"]
+        cpi = round(stats["completed_estimated_hours"] / stats["actual_hours"], 2) if stats["actual_hours"] else 1.0
+
+        risk_counts = {level: 0 for level in RISK_LEVELS}
+        for _, level in stats["risks"]:
+            risk_counts[level] += 1
+        quality = self._quality_score(stats)
+        health = {
+            "schedule_health": "green" if spi >= 0.95 else "yellow" if spi >= 0.8 else "red",
+            "resource_health": _resource_health(stats),
+            "quality_health": "green" if quality is None or quality >= 85 else "yellow" if quality >= 70 else "red",
+            "risk_health": {"low": "green", "medium": "yellow"}.get(_overall_risk_level(risk_counts), "red"),
+        }
+        health = {"overall_health": _worst_health(health.values()), **health}
+
+        ranked_risks = sorted(stats["risks"], key=lambda item: RISK_LEVELS.index(item[1]))
+        return {
+            "key_metrics": {
+                "overall_completion": completion,
+                "tasks_completed": completed,
+                "tasks_total": total,
+                "hours_spent": round(stats["actual_hours"], 1),
+                "hours_estimated": round(stats["estimated_hours"], 1),
+                "days_elapsed": schedule["elapsed_days"],
+                "days_remaining": schedule["remaining_days"],
+                # No cost data is tracked, so budget use is measured in hours
+                "budget_used_percentage": _pct(stats["actual_hours"], stats["estimated_hours"])
+            },
+            "progress_indicators": {
+                "completion_trend": {"increasing": "accelerating", "decreasing": "slowing"}.get(
+                    stats["velocity"]["trend"], "steady"),
+                "schedule_performance_index": spi,
+                "cost_performance_index": cpi,
+                "velocity": stats["velocity"]["tasks_per_week"]
+            },
+            "health_indicators": health,
+            "task_breakdown": {
+                "by_status": stats["by_status"],
+                "by_priority": {
+                    priority: {"total": stats["priority_total"][priority], "completed": stats["priority_done"][priority]}
+                    for priority in PRIORITIES
+                }
+            },
+            "milestone_status": [
+                {"name": item["milestone"], "progress": item["completion_percentage"], "status": item["status"]}
+                for item in stats["milestones"]
+            ],
+            "top_risks": [
+                {"risk": description, "severity": "high" if level == "critical" else level}
+                for description, level in ranked_risks[:DASHBOARD_TOP_RISKS]
+            ],
+            "recent_activities": _recent_activities(project_data.get(STATUS_HISTORY_FIELD) or [])
+        }
+
+    @staticmethod
+    def _schedule(stats: Dict, completion: float) -> Dict:
+        """Elapsed/remaining days, projected end from velocity and the schedule performance index"""
+        today = stats["today"]
+        start = stats["start"]
+        planned_end = stats["planned_end"]
+        remaining_tasks = stats["total_tasks"] - stats["by_status"]["completed"]
+        per_week = stats["velocity"]["tasks_per_week"]
+
+        if remaining_tasks <= 0:
+            projected_end = today
+        elif per_week > 0:
+            projected_end = today + timedelta(weeks=remaining_tasks / per_week)
+        else:
+            projected_end = None
+
+        spi = 1.0
+        if start and planned_end and planned_end > start and today > start:
+            expected = min(100.0, 100.0 * (today - start).days / (planned_end - start).days)
+            spi = round(completion / expected, 2) if expected else 1.0
+
+        variance = (projected_end - planned_end).days if projected_end and planned_end else None
+        return {
+            "elapsed_days": max((today - start).days, 0) if start else 0,
+            "remaining_days": max((planned_end - today).days, 0) if planned_end else None,
+            "projected_end": projected_end,
+            "variance_days": variance,
+            "on_schedule": variance <= 0 if variance is not None else spi >= 1.0,
+            "spi": spi
+        }
+
+    @staticmethod
+    def _quality_score(stats: Dict) -> Optional[float]:
+        dated = stats["on_time"] + stats["late"]
+        completed = stats["by_status"]["completed"]
+        if not dated and not completed:
+            return None
+        on_time_ratio = stats["on_time"] / dated if dated else 1.0
+        rework_ratio = stats["rework_tasks"] / (completed + stats["rework_tasks"]) if completed or stats["rework_tasks"] else 0.0
+        return round(100.0 * on_time_ratio * (1 - rework_ratio), 1)
+
+
+def apply_assessment(metrics: Dict, assessment: Dict, fields: Dict) -> Dict:
+    """Overlay model-judged qualitative fields onto locally computed metrics"""
+    if not isinstance(assessment, dict):
+        return metrics
+    for section, keys in fields.items():
+        value = assessment.get(section)
+        if keys is None:
+            if isinstance(value, list):
+                metrics[section] = value
+        elif isinstance(value, dict) and isinstance(metrics.get(section), dict):
+            metrics[section].update({key: value[key] for key in keys if key in value})
+    return metrics
+
+
+def _iso(day: Optional[date]) -> Optional[str]:
+    return day.isoformat() if day else None
+
+
+def _reopened_tasks(history: List[Dict]) -> int:
+    """Tasks that went back from completed to another status at least once"""
+    completed = set()
+    reopened = set()
+    for event in history:
+        if not isinstance(event, dict):
+            continue
+        task_id = event.get("task_id")
+        if normalize_status(event.get("status")) == "completed":
+            completed.add(task_id)
+        elif task_id in completed:
+            reopened.add(task_id)
+    return len(reopened)
+
+
+def _risk_levels(risks: List[Any]) -> List[tuple]:
+    """(description, level) for each project risk, whatever shape it was recorded in"""
+    levels = []
+    for risk in risks:
+        if isinstance(risk, str):
+            levels.append((risk, "medium"))
+            continue
+        if not isinstance(risk, dict):
+            continue
+        level = str(risk.get("severity") or risk.get("impact") or risk.get("probability") or "").lower()
+        if level not in RISK_LEVELS:
+            score = _as_float(risk.get("risk_score"))
+            level = "high" if score >= 15 else "medium" if score >= 8 or not score else "low"
+        levels.append((risk.get("description") or risk.get("risk") or risk.get("risk_id") or "", level))
+    return levels
+
+
+def _overall_risk_level(counts: Dict[str, int]) -> str:
+    if counts["critical"] or counts["high"] >= 3:
+        return "critical"
+    for level in ("high", "medium"):
+        if counts[level]:
+            return level
+    return "low"
+
+
+def _resource_health(stats: Dict) -> str:
+    overloaded = sum(1 for count in stats["active_by_assignee"].values() if count > 1)
+    blocked = stats["by_status"]["blocked"]
+    if overloaded > 1 or blocked >= 3:
+        return "red"
+    if overloaded or blocked:
+        return "yellow"
+    return "green"
+
+
+def _worst_health(values) -> str:
+    values = set(values)
+    for colour in ("red", "yellow"):
+        if colour in values:
+            return colour
+    return "green"
+
+
+def _recent_activities(history: List[Dict]) -> List[Dict]:
+    activities = []
+    for event in reversed(history):
+        if not isinstance(event, dict):
+            continue
+        status = normalize_status(event.get("status"))
+        day = parse_day(event.get("timestamp") or event.get("date"))
+        if status not in ACTIVITY_TYPES or day is None:
+            continue
+        activities.append({
+            "date": day.isoformat(),
+            "activity": f"{event.get('task_id')} marked {status.replace('_', ' ')}",
+            "type": ACTIVITY_TYPES[status]
+        })
+        if len(activities) >= DASHBOARD_RECENT_ACTIVITIES:
+            break
+    return activities
+
+
+def project_start_date(project_data: Dict) -> Optional[date]:
+    return parse_day(project_data.get("start_date")) or parse_day(project_data.get("created_at"))
+
+
+def milestone_target_date(milestone: Dict, project_start: Optional[date]) -> Optional[date]:
+    """Explicit target date, or project start + target_week weeks"""
+    target = parse_day(milestone.get("target_date") or milestone.get("date"))
+    if target is None and project_start and milestone.get("target_week") is not None:
+        try:
+            target = project_start + timedelta(weeks=float(milestone["target_week"]))
+        except (TypeError, ValueError):
+            target = None
+    return target
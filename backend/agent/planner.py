@@ -1,20 +1,44 @@
 
-from anthropic import Anthropic
-from typing import Dict, List, Optional
+from typing import Dict, Optional
+import asyncio
 from datetime import datetime, timedelta
-import json
 
-class ProjectPlanner:
-    def __init__(self, api_key: str):
-        self.client = Anthropic(api_key=api_key)
+from .base import AgentModule
+from .client import LLMClient, LLMRequest
+from .json_stream import ItemCallback
+from .critical_path import CriticalPathEngine, DependencyCycleError
+from .schemas import ProjectPlan, ProjectTimeline, ResourceEstimate
+from .serializer import PromptSerializer
+
+class ProjectPlanner(AgentModule):
+    def __init__(self, api_key: Optional[str] = None, llm_client: Optional[LLMClient] = None,
+                 serializer: Optional[PromptSerializer] = None):
+        super().__init__(api_key, llm_client, serializer)
+        self.critical_path_engine = CriticalPathEngine()
         
-    def break_down_goals(self, project_goal: str, constraints: Optional[Dict] = None) -> Dict:
+    def break_down_goals(self, project_goal: str, constraints: Optional[Dict] = None,
+                         on_item: Optional[ItemCallback] = None) -> Dict:
         """
         Break down high-level project goals into phases, milestones, and tasks
+        With on_item, the response is streamed and on_item("phases", phase) fires as each phase closes
         """
+        request = self._break_down_goals_request(project_goal, constraints)
+        if on_item:
+            return self._run_streaming(request, on_item)
+        return self._run(request)
+    
+    async def break_down_goals_async(self, project_goal: str, constraints: Optional[Dict] = None,
+                                     on_item: Optional[ItemCallback] = None) -> Dict:
+        """Async variant of break_down_goals"""
+        request = self._break_down_goals_request(project_goal, constraints)
+        if on_item:
+            return await self._run_streaming_async(request, on_item)
+        return await self._run_async(request)
+    
+    def _break_down_goals_request(self, project_goal: str, constraints: Optional[Dict] = None) -> LLMRequest:
         constraint_text = ""
         if constraints:
-            constraint_text = f"\n\nConstraints:\n{json.dumps(constraints, indent=2)}"
+            constraint_text = f"\n\nConstraints:\n{self.serializer.serialize(constraints)}"
         
         prompt = f"""You are a project planning expert. Break down the following project goal into a detailed plan:
 
@@ -28,190 +52,63 @@ Provide a comprehensive breakdown including:
    - Priority levels (high/medium/low)
    - Estimated effort in hours
    - Dependencies on other tasks
-   - Skills/resources required
+   - Skills/resources required"""
 
-Format your response as JSON:
-{{
-  "project_name": "string",
-  "total_estimated_weeks": number,
-  "phases": [
-    {{
-      "phase_number": number,
-      "name": "string",
-      "description": "string",
-      "duration_weeks": number,
-      "milestones": [
-        {{
-          "name": "string",
-          "description": "string",
-          "target_week": number,
-          "success_criteria": ["string"]
-        }}
-      ],
-      "tasks": [
-        {{
-          "task_id": "string",
-          "title": "string",
-          "description": "string",
-          "priority": "high|medium|low",
-          "estimated_hours": number,
-          "dependencies": ["task_id"],
-          "required_skills": ["string"],
-          "deliverables": ["string"]
-        }}
-      ]
-    }}
-  ],
-  "critical_path": ["task_id"],
-  "key_risks": ["string"],
-  "resource_requirements": {{
-    "team_size": number,
-    "key_roles": ["string"]
-  }}
-}}"""
-
-        response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=8000,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        return self._parse_json_response(response.content[0].text)
+        return LLMRequest("break_down_goals", prompt, max_tokens=8000, schema=ProjectPlan)
     
     def create_timeline(self, project_plan: Dict, start_date: Optional[str] = None) -> Dict:
         """
         Create a detailed timeline with dates from the project plan
         """
+        return self._run(self._create_timeline_request(project_plan, start_date))
+    
+    async def create_timeline_async(self, project_plan: Dict, start_date: Optional[str] = None) -> Dict:
+        """Async variant of create_timeline"""
+        return await self._run_async(self._create_timeline_request(project_plan, start_date))
+    
+    def _create_timeline_request(self, project_plan: Dict, start_date: Optional[str] = None) -> LLMRequest:
         if not start_date:
             start_date = datetime.now().strftime("%Y-%m-%d")
         
-        prompt = f"""Given this project plan and start date {start_date}, create a detailed timeline:
-
-{json.dumps(project_plan, indent=2)}
-
-Generate a timeline in JSON format:
-{{
-  "project_timeline": {{
-    "start_date": "{start_date}",
-    "end_date": "YYYY-MM-DD",
-    "total_weeks": number,
-    "phases": [
-      {{
-        "phase_name": "string",
-        "start_date": "YYYY-MM-DD",
-        "end_date": "YYYY-MM-DD",
-        "milestones": [
-          {{
-            "name": "string",
-            "target_date": "YYYY-MM-DD",
-            "buffer_days": number
-          }}
-        ],
-        "tasks": [
-          {{
-            "task_id": "string",
-            "title": "string",
-            "start_date": "YYYY-MM-DD",
-            "end_date": "YYYY-MM-DD",
-            "duration_days": number
-          }}
-        ]
-      }}
-    ],
-    "critical_milestones": [
-      {{
-        "name": "string",
-        "date": "YYYY-MM-DD",
-        "importance": "string"
-      }}
-    ]
-  }}
-}}
+        prompt = f"""Given the project plan above and start date {start_date}, create a detailed timeline.
 
 Ensure tasks are scheduled considering:
 - Dependencies (dependent tasks start after prerequisites)
 - Resource availability (don't overload parallel tasks)
 - Buffer time for high-risk tasks (add 20% buffer)"""
 
-        response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=6000,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        return self._parse_json_response(response.content[0].text)
+        return LLMRequest("create_timeline", prompt, max_tokens=6000, schema=ProjectTimeline,
+                          context=self._snapshot(project_plan, 'create_timeline', "Project Plan"))
     
     def estimate_resources(self, project_plan: Dict) -> Dict:
         """
         Estimate required resources, effort, and team composition
         """
-        prompt = f"""Analyze this project plan and provide resource estimates:
-
-{json.dumps(project_plan, indent=2)}
-
-Provide estimates in JSON format:
-{{
-  "effort_summary": {{
-    "total_hours": number,
-    "total_weeks": number,
-    "phases": [
-      {{
-        "phase_name": "string",
-        "hours": number,
-        "weeks": number
-      }}
-    ]
-  }},
-  "team_requirements": {{
-    "recommended_team_size": number,
-    "roles": [
-      {{
-        "role": "string",
-        "count": number,
-        "skills": ["string"],
-        "allocation_percentage": number
-      }}
-    ]
-  }},
-  "budget_estimate": {{
-    "hours_by_priority": {{
-      "high": number,
-      "medium": number,
-      "low": number
-    }},
-    "phases": [
-      {{
-        "phase_name": "string",
-        "hours": number
-      }}
-    ]
-  }},
-  "risks": [
-    {{
-      "risk": "string",
-      "impact": "high|medium|low",
-      "mitigation": "string"
-    }}
-  ]
-}}"""
+        return self._run(self._estimate_resources_request(project_plan))
+    
+    async def estimate_resources_async(self, project_plan: Dict) -> Dict:
+        """Async variant of estimate_resources"""
+        return await self._run_async(self._estimate_resources_request(project_plan))
+    
+    def _estimate_resources_request(self, project_plan: Dict) -> LLMRequest:
+        prompt = "Analyze the project plan above and provide resource estimates."
 
-        response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=4000,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        return self._parse_json_response(response.content[0].text)
+        return LLMRequest("estimate_resources", prompt, max_tokens=4000, schema=ResourceEstimate,
+                          context=self._snapshot(project_plan, 'estimate_resources', "Project Plan"))
     
     def adjust_timeline(self, current_plan: Dict, adjustments: Dict) -> Dict:
         """
         Adjust timeline based on changes (delays, scope changes, resource changes)
         """
-        prompt = f"""Current project plan:
-{json.dumps(current_plan, indent=2)}
-
-Requested adjustments:
-{json.dumps(adjustments, indent=2)}
+        return self._run(self._adjust_timeline_request(current_plan, adjustments))
+    
+    async def adjust_timeline_async(self, current_plan: Dict, adjustments: Dict) -> Dict:
+        """Async variant of adjust_timeline"""
+        return await self._run_async(self._adjust_timeline_request(current_plan, adjustments))
+    
+    def _adjust_timeline_request(self, current_plan: Dict, adjustments: Dict) -> LLMRequest:
+        prompt = f"""Requested adjustments to the current project plan above:
+{self.serializer.serialize(adjustments)}
 
 Create an updated timeline that accommodates these changes while:
 - Maintaining critical dependencies
@@ -219,61 +116,34 @@ Create an updated timeline that accommodates these changes while:
 - Suggesting mitigation strategies
 - Recalculating end dates and milestones
 
-Return updated plan in the same JSON structure as the original."""
-
-        response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=6000,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        return self._parse_json_response(response.content[0].text)
+Return the updated plan in the same structure as the original."""
+
+        # Answer in the structure of whatever was passed in: a timeline or a plan
+        if "project_timeline" in current_plan:
+            schema = ProjectTimeline
+        elif "phases" in current_plan:
+            schema = ProjectPlan
+        else:
+            schema = None
+        return LLMRequest("adjust_timeline", prompt, max_tokens=6000, schema=schema,
+                          context=self._snapshot(current_plan, 'adjust_timeline', "Current project plan"))
     
-    def identify_critical_path(self, project_plan: Dict) -> List[str]:
+    def identify_critical_path(self, project_plan: Dict) -> Dict:
         """
         Identify the critical path through the project
+        Computed locally with CPM over task dependencies and estimated hours
         """
-        prompt = f"""Analyze this project plan and identify the critical path:
-
-{json.dumps(project_plan, indent=2)}
-
-Return JSON:
-{{
-  "critical_path": [
-    {{
-      "task_id": "string",
-      "task_title": "string",
-      "reason": "string",
-      "impact_if_delayed": "string"
-    }}
-  ],
-  "parallel_opportunities": [
-    {{
-      "tasks": ["task_id"],
-      "description": "string"
-    }}
-  ],
-  "bottlenecks": ["string"]
-}}"""
-
-        response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=3000,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        return self._parse_json_response(response.content[0].text)
-    
-    def _parse_json_response(self, text: str) -> Dict:
-        """Extract and parse JSON from Claude's response"""
         try:
-            # Find JSON in the response
-            start_idx = text.find('{')
-            end_idx = text.rfind('}') + 1
-            if start_idx != -1 and end_idx > start_idx:
-                json_str = text[start_idx:end_idx]
-                return json.loads(json_str)
-        except Exception as e:
-            print(f"Error parsing JSON: {e}")
-        
-        return {"raw_response": text, "error": "Failed to parse JSON"}
\ No newline at end of file
+            return self.critical_path_engine.analyze(project_plan)
+        except DependencyCycleError as e:
+            return {
+                "critical_path": [],
+                "parallel_opportunities": [],
+                "bottlenecks": [str(e)],
+                "cycle": e.cycle,
+                "error": str(e)
+            }
+    
+    async def identify_critical_path_async(self, project_plan: Dict) -> Dict:
+        """Async variant of identify_critical_path; the CPM pass runs on a worker thread"""
+        return await asyncio.to_thread(self.identify_critical_path, project_plan)
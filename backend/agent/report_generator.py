@@ -2,23 +2,66 @@
 Report Generator Module
 Generates comprehensive project status reports
 """
-from anthropic import Anthropic
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, Iterator, List, Optional
 from datetime import datetime
-import json
-
-class ReportGenerator:
-    def __init__(self, api_key: str):
-        self.client = Anthropic(api_key=api_key)
+import asyncio
+
+from .base import AgentModule
+from .batch import BatchBackend, MessageBatchBackend, ReportBatch
+from .client import LLMClient, LLMRequest, StreamEvent
+from .json_stream import ItemCallback
+from .metrics import DASHBOARD_QUALITATIVE_FIELDS, MetricsEngine, apply_assessment
+from .scheduler import PRIORITY_BATCH
+from .schemas import DashboardAssessment, ExecutiveSummary, ProgressSummary, RiskAnalysis
+from .serializer import PromptSerializer
+
+class ReportGenerator(AgentModule):
+    def __init__(self, api_key: Optional[str] = None, llm_client: Optional[LLMClient] = None,
+                 serializer: Optional[PromptSerializer] = None):
+        super().__init__(api_key, llm_client, serializer)
+        # Numeric metrics are computed locally; the model only judges qualitative fields
+        self.metrics = MetricsEngine()
         
     def generate_status_report(self, project_data: Dict, report_type: str = "weekly") -> str:
         """
         Generate a comprehensive status report
         report_type: weekly, monthly, executive, detailed
         """
-        prompt = f"""Generate a {report_type} project status report for:
-
-{json.dumps(project_data, indent=2)}
+        return self._run(self._generate_status_report_request(project_data, report_type))
+    
+    async def generate_status_report_async(self, project_data: Dict, report_type: str = "weekly") -> str:
+        """Async variant of generate_status_report"""
+        return await self._run_async(self._generate_status_report_request(project_data, report_type))
+    
+    def stream_status_report(self, project_data: Dict, report_type: str = "weekly") -> Iterator[StreamEvent]:
+        """
+        Streaming variant of generate_status_report
+        Yields message_start, delta (report text) and message_end (full response and usage)
+        """
+        return self.client.stream(self._generate_status_report_request(project_data, report_type))
+    
+    def stream_status_report_async(self, project_data: Dict, report_type: str = "weekly") -> AsyncIterator[StreamEvent]:
+        """Async variant of stream_status_report"""
+        return self.client.stream_async(self._generate_status_report_request(project_data, report_type))
+    
+    def create_report_batch(self, projects: List[Dict], report_type: str = "weekly",
+                            backend: Optional[BatchBackend] = None, reports_dir: str = "reports",
+                            poll_interval: float = 30.0) -> ReportBatch:
+        """
+        Collect status report requests for many projects into one batch (not yet submitted)
+        backend defaults to the Message Batches API; pass a LocalBatchBackend to run locally
+        """
+        batch = ReportBatch(backend or MessageBatchBackend(self.client), reports_dir, poll_interval)
+        for index, project_data in enumerate(projects):
+            project_id = project_data.get("project_id") or f"project_{index}"
+            request = self._generate_status_report_request(project_data, report_type)
+            # Yields to interactive calls when the batch runs locally through the scheduler
+            request.priority = PRIORITY_BATCH
+            batch.add(project_id, request)
+        return batch
+    
+    def _generate_status_report_request(self, project_data: Dict, report_type: str = "weekly") -> LLMRequest:
+        prompt = f"""Generate a {report_type} project status report for the project above.
 
 Create a professional, well-structured report with:
 
@@ -107,179 +150,82 @@ For each phase:
 
 Format the report in clear, professional markdown."""
 
-        response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=8000,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        return response.content[0].text
+        return LLMRequest("generate_status_report", prompt, max_tokens=8000, parse_json=False,
+                          context=self._snapshot(project_data, 'generate_status_report'))
     
     def generate_executive_summary(self, project_data: Dict) -> Dict:
         """
         Generate a brief executive summary
         """
-        prompt = f"""Create a concise executive summary for:
-
-{json.dumps(project_data, indent=2)}
-
-Return JSON:
-{{
-  "executive_summary": {{
-    "project_name": "string",
-    "overall_status": "on_track|at_risk|delayed|critical",
-    "health_indicator": "green|yellow|red",
-    "completion_percentage": number,
-    "key_achievements": ["string (max 3)"],
-    "major_concerns": ["string (max 3)"],
-    "next_milestone": {{
-      "name": "string",
-      "date": "YYYY-MM-DD",
-      "confidence": "high|medium|low"
-    }},
-    "resource_status": "adequate|constrained|critical",
-    "budget_status": "on_budget|over_budget|under_budget",
-    "recommendation": "continue|adjust|escalate",
-    "executive_message": "One paragraph summary for leadership"
-  }}
-}}"""
-
-        response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=2000,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        return self._parse_json_response(response.content[0].text)
+        return self._run(self._generate_executive_summary_request(project_data))
+    
+    async def generate_executive_summary_async(self, project_data: Dict) -> Dict:
+        """Async variant of generate_executive_summary"""
+        return await self._run_async(self._generate_executive_summary_request(project_data))
     
-    def identify_risks_and_bottlenecks(self, project_data: Dict) -> Dict:
+    def _generate_executive_summary_request(self, project_data: Dict) -> LLMRequest:
+        prompt = "Create a concise executive summary for the project above."
+
+        return LLMRequest("generate_executive_summary", prompt, max_tokens=2000, schema=ExecutiveSummary,
+                          context=self._snapshot(project_data, 'generate_executive_summary'))
+    
+    def identify_risks_and_bottlenecks(self, project_data: Dict, on_item: Optional[ItemCallback] = None) -> Dict:
         """
         Identify and analyze project risks and bottlenecks
+        With on_item, the response is streamed and each risk/bottleneck is reported as it closes
         """
-        prompt = f"""Analyze risks and bottlenecks for:
-
-{json.dumps(project_data, indent=2)}
-
-Return comprehensive risk analysis:
-{{
-  "risk_summary": {{
-    "overall_risk_level": "low|medium|high|critical",
-    "total_risks": number,
-    "high_priority_risks": number
-  }},
-  "risks": [
-    {{
-      "risk_id": "string",
-      "category": "schedule|resource|technical|external|quality",
-      "description": "string",
-      "probability": "low|medium|high",
-      "impact": "low|medium|high",
-      "risk_score": number,
-      "mitigation_strategy": "string",
-      "contingency_plan": "string",
-      "owner": "string",
-      "status": "identified|monitoring|mitigating|closed"
-    }}
-  ],
-  "bottlenecks": [
-    {{
-      "type": "resource|skill|process|dependency",
-      "description": "string",
-      "affected_areas": ["string"],
-      "impact_on_timeline": "string",
-      "recommended_solution": "string"
-    }}
-  ],
-  "dependencies": [
-    {{
-      "dependency": "string",
-      "type": "internal|external",
-      "status": "on_track|at_risk|blocked",
-      "impact_if_delayed": "string"
-    }}
-  ],
-  "red_flags": [
-    {{
-      "flag": "string",
-      "severity": "high|medium|low",
-      "recommended_action": "string",
-      "urgency": "immediate|soon|monitor"
-    }}
-  ]
-}}"""
-
-        response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=4000,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        return self._parse_json_response(response.content[0].text)
+        request = self._identify_risks_and_bottlenecks_request(project_data)
+        if on_item:
+            return self._run_streaming(request, on_item)
+        return self._run(request)
+    
+    async def identify_risks_and_bottlenecks_async(self, project_data: Dict,
+                                                   on_item: Optional[ItemCallback] = None) -> Dict:
+        """Async variant of identify_risks_and_bottlenecks"""
+        request = self._identify_risks_and_bottlenecks_request(project_data)
+        if on_item:
+            return await self._run_streaming_async(request, on_item)
+        return await self._run_async(request)
+    
+    def _identify_risks_and_bottlenecks_request(self, project_data: Dict) -> LLMRequest:
+        prompt = """Analyze risks and bottlenecks for the project above.
+
+Provide a comprehensive analysis of risks, bottlenecks, dependencies and red flags."""
+
+        return LLMRequest("identify_risks_and_bottlenecks", prompt, max_tokens=4000, schema=RiskAnalysis,
+                          context=self._snapshot(project_data, 'identify_risks_and_bottlenecks'))
     
     def create_progress_summary(self, project_data: Dict, time_period: str = "this_week") -> Dict:
         """
         Create a summary of progress for a specific time period
         """
-        prompt = f"""Summarize progress for {time_period}:
-
-{json.dumps(project_data, indent=2)}
-
-Return JSON:
-{{
-  "period": "{time_period}",
-  "summary": {{
-    "tasks_completed": number,
-    "tasks_started": number,
-    "hours_logged": number,
-    "milestones_achieved": number,
-    "completion_percentage_change": number
-  }},
-  "highlights": [
-    {{
-      "type": "achievement|milestone|completion",
-      "description": "string",
-      "impact": "string"
-    }}
-  ],
-  "challenges": [
-    {{
-      "challenge": "string",
-      "impact": "string",
-      "resolution": "string"
-    }}
-  ],
-  "team_performance": {{
-    "velocity": "increasing|stable|decreasing",
-    "productivity_notes": "string",
-    "morale_indicators": "string"
-  }},
-  "comparison_to_plan": {{
-    "ahead_of_schedule": boolean,
-    "variance_days": number,
-    "on_track_percentage": number
-  }},
-  "next_period_outlook": "string"
-}}"""
-
-        response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=3000,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        return self._parse_json_response(response.content[0].text)
+        return self._run(self._create_progress_summary_request(project_data, time_period))
+    
+    async def create_progress_summary_async(self, project_data: Dict, time_period: str = "this_week") -> Dict:
+        """Async variant of create_progress_summary"""
+        return await self._run_async(self._create_progress_summary_request(project_data, time_period))
+    
+    def _create_progress_summary_request(self, project_data: Dict, time_period: str = "this_week") -> LLMRequest:
+        prompt = f"Summarize progress on the project above for {time_period}."
+
+        return LLMRequest("create_progress_summary", prompt, max_tokens=3000, schema=ProgressSummary,
+                          context=self._snapshot(project_data, 'create_progress_summary'))
     
     def generate_milestone_report(self, milestone_name: str, project_data: Dict) -> str:
         """
         Generate a detailed report for a specific milestone
         """
-        prompt = f"""Generate a milestone completion report:
+        return self._run(self._generate_milestone_report_request(milestone_name, project_data))
+    
+    async def generate_milestone_report_async(self, milestone_name: str, project_data: Dict) -> str:
+        """Async variant of generate_milestone_report"""
+        return await self._run_async(self._generate_milestone_report_request(milestone_name, project_data))
+    
+    def _generate_milestone_report_request(self, milestone_name: str, project_data: Dict) -> LLMRequest:
+        prompt = f"""Generate a milestone completion report for the project above:
 
 Milestone: {milestone_name}
 
-Project Data:
-{json.dumps(project_data, indent=2)}
-
 Create a detailed milestone report in markdown:
 
 # MILESTONE REPORT: [Milestone Name]
@@ -337,108 +283,37 @@ For each criterion:
 - What could be improved
 - Best practices identified"""
 
-        response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=4000,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        return response.content[0].text
+        return LLMRequest("generate_milestone_report", prompt, max_tokens=4000, parse_json=False,
+                          context=self._snapshot(project_data, 'generate_milestone_report'))
     
-    def generate_metrics_dashboard(self, project_data: Dict) -> Dict:
+    def generate_metrics_dashboard(self, project_data: Dict, current_date: Optional[str] = None,
+                                   include_assessment: bool = False) -> Dict:
         """
         Generate data for a metrics dashboard
+        Computed locally; include_assessment lets the model judge health, trend and top risks
         """
-        prompt = f"""Generate dashboard metrics for:
-
-{json.dumps(project_data, indent=2)}
-
-Return comprehensive metrics:
-{{
-  "key_metrics": {{
-    "overall_completion": number,
-    "tasks_completed": number,
-    "tasks_total": number,
-    "hours_spent": number,
-    "hours_estimated": number,
-    "days_elapsed": number,
-    "days_remaining": number,
-    "budget_used_percentage": number
-  }},
-  "progress_indicators": {{
-    "completion_trend": "accelerating|steady|slowing",
-    "schedule_performance_index": number,
-    "cost_performance_index": number,
-    "velocity": number
-  }},
-  "health_indicators": {{
-    "overall_health": "green|yellow|red",
-    "schedule_health": "green|yellow|red",
-    "resource_health": "green|yellow|red",
-    "quality_health": "green|yellow|red",
-    "risk_health": "green|yellow|red"
-  }},
-  "task_breakdown": {{
-    "by_status": {{
-      "not_started": number,
-      "in_progress": number,
-      "completed": number,
-      "blocked": number
-    }},
-    "by_priority": {{
-      "high": {{
-        "total": number,
-        "completed": number
-      }},
-      "medium": {{
-        "total": number,
-        "completed": number
-      }},
-      "low": {{
-        "total": number,
-        "completed": number
-      }}
-    }}
-  }},
-  "milestone_status": [
-    {{
-      "name": "string",
-      "progress": number,
-      "status": "achieved|on_track|at_risk|missed"
-    }}
-  ],
-  "top_risks": [
-    {{
-      "risk": "string",
-      "severity": "high|medium|low"
-    }}
-  ],
-  "recent_activities": [
-    {{
-      "date": "YYYY-MM-DD",
-      "activity": "string",
-      "type": "completion|start|milestone|blocker"
-    }}
-  ]
-}}"""
-
-        response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=4000,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        return self._parse_json_response(response.content[0].text)
+        metrics = self.metrics.dashboard(project_data, current_date)
+        if include_assessment:
+            assessment = self._run(self._metrics_dashboard_assessment_request(project_data, metrics))
+            apply_assessment(metrics, assessment, DASHBOARD_QUALITATIVE_FIELDS)
+        return metrics
     
-    def _parse_json_response(self, text: str) -> Dict:
-        """Extract and parse JSON from Claude's response"""
-        try:
-            start_idx = text.find('{')
-            end_idx = text.rfind('}') + 1
-            if start_idx != -1 and end_idx > start_idx:
-                json_str = text[start_idx:end_idx]
-                return json.loads(json_str)
-        except Exception as e:
-            print(f"Error parsing JSON: {e}")
-        
-        return {"raw_response": text, "error": "Failed to parse JSON"}
\ No newline at end of file
+    async def generate_metrics_dashboard_async(self, project_data: Dict, current_date: Optional[str] = None,
+                                               include_assessment: bool = False) -> Dict:
+        """Async variant of generate_metrics_dashboard"""
+        metrics = await asyncio.to_thread(self.metrics.dashboard, project_data, current_date)
+        if include_assessment:
+            assessment = await self._run_async(self._metrics_dashboard_assessment_request(project_data, metrics))
+            apply_assessment(metrics, assessment, DASHBOARD_QUALITATIVE_FIELDS)
+        return metrics
+    
+    def _metrics_dashboard_assessment_request(self, project_data: Dict, metrics: Dict) -> LLMRequest:
+        prompt = f"""These dashboard metrics were computed for the project above:
+
+{self.serializer.serialize(metrics)}
+
+Judge only the qualitative fields, taking context the numbers miss into account."""
+
+        return LLMRequest("generate_metrics_dashboard_assessment", prompt, max_tokens=800,
+                          schema=DashboardAssessment,
+                          context=self._snapshot(project_data, 'generate_metrics_dashboard', "Project"))
@@ -0,0 +1,143 @@
+"""
+Routing Module
+Per-method model selection by tier, with escalation of failed small-model results
+"""
+from dataclasses import replace
+from typing import Any, Dict, Iterable, Mapping, Optional
+import os
+import threading
+
+TIER_SMALL = "small"
+TIER_DEFAULT = "default"
+TIER_LARGE = "large"
+TIERS = (TIER_SMALL, TIER_DEFAULT, TIER_LARGE)
+
+# Tiers whose failed results are retried one tier up; larger tiers are not
+# escalated by default so a validation failure never adds a large-model call
+DEFAULT_ESCALATION_TIERS = (TIER_SMALL,)
+
+DEFAULT_MODEL = "claude-sonnet-4-20250514"
+
+DEFAULT_TIER_MODELS = {
+    TIER_SMALL: "claude-3-5-haiku-20241022",
+    TIER_DEFAULT: DEFAULT_MODEL,
+    TIER_LARGE: "claude-opus-4-20250514",
+}
+
+# Methods not listed here use the default tier
+DEFAULT_METHOD_TIERS = {
+    # Classification and short summaries
+    "parse_user_intent": TIER_SMALL,
+    "summarize_conversation": TIER_SMALL,
+    "create_executive_brief": TIER_SMALL,
+    "generate_highlights": TIER_SMALL,
+    "generate_executive_summary": TIER_SMALL,
+    "generate_metrics_dashboard_assessment": TIER_SMALL,
+    "aggregate_metrics_assessment": TIER_SMALL,
+    "completion_narrative": TIER_SMALL,
+    # Open-ended planning and impact analysis
+    "break_down_goals": TIER_LARGE,
+    "handle_scope_change": TIER_LARGE,
+}
+
+# Environment configuration: AGENT_MODEL_SMALL / _DEFAULT / _LARGE name the tier models,
+# AGENT_MODEL_ROUTES maps methods ("method=tier" or "method=model", comma-separated),
+# AGENT_MODEL_ESCALATION_TIERS lists the tiers that escalate (comma-separated)
+# and AGENT_MODEL_ESCALATION=0 turns escalation off
+ENV_PREFIX = "AGENT_MODEL_"
+
+
+def needs_escalation(result: Any) -> bool:
+    """True for parsed output that failed schema validation or could not be parsed"""
+    return isinstance(result, dict) and ("validation_errors" in result or "raw_response" in result)
+
+
+class ModelRouter:
+    """
+    Picks the model for each request from its method.
+
+    Methods map to a tier (small, default, large) or directly to a model
+    name. Requests that name a model explicitly are left alone. When a
+    small-model result fails validation, escalate() returns the request
+    retargeted at the next tier up, so cheap models serve the common case
+    and larger ones only the calls they get wrong. Only the tiers in
+    escalation_tiers (the small tier by default) escalate; default- and
+    large-tier failures are returned as they are.
+    """
+
+    def __init__(self, tier_models: Optional[Mapping[str, str]] = None,
+                 method_tiers: Optional[Mapping[str, str]] = None,
+                 default_tier: str = TIER_DEFAULT, escalation: bool = True,
+                 escalation_tiers: Iterable[str] = DEFAULT_ESCALATION_TIERS):
+        self.tier_models = {**DEFAULT_TIER_MODELS, **(tier_models or {})}
+        self.method_tiers = {**DEFAULT_METHOD_TIERS, **(method_tiers or {})}
+        self.default_tier = default_tier
+        self.escalation = escalation
+        self.escalation_tiers = frozenset(escalation_tiers)
+
+        self._lock = threading.Lock()
+        self._routed: Dict[str, int] = {}
+        self._escalated: Dict[str, int] = {}
+
+    @classmethod
+    def from_env(cls, environ: Optional[Mapping[str, str]] = None) -> "ModelRouter":
+        environ = os.environ if environ is None else environ
+        tier_models = {
+            tier: environ[f"{ENV_PREFIX}{tier.upper()}"]
+            for tier in TIERS if environ.get(f"{ENV_PREFIX}{tier.upper()}")
+        }
+        method_tiers = {}
+        for route in environ.get(f"{ENV_PREFIX}ROUTES", "").split(","):
+            method, _, target = route.partition("=")
+            if method.strip() and target.strip():
+                method_tiers[method.strip()] = target.strip()
+        escalation = environ.get(f"{ENV_PREFIX}ESCALATION", "1").strip().lower() not in ("0", "false", "no", "off")
+        escalation_tiers = DEFAULT_ESCALATION_TIERS
+        if environ.get(f"{ENV_PREFIX}ESCALATION_TIERS"):
+            escalation_tiers = [
+                tier.strip().lower() for tier in environ[f"{ENV_PREFIX}ESCALATION_TIERS"].split(",") if tier.strip()
+            ]
+        return cls(tier_models, method_tiers, escalation=escalation, escalation_tiers=escalation_tiers)
+
+    def model_for(self, method: str) -> str:
+        target = self.method_tiers.get(method, self.default_tier)
+        # A route may name a model instead of a tier
+        return self.tier_models.get(target, target)
+
+    def route(self, request):
+        """The request with its model filled in, unless it already names one"""
+        if request.model:
+            return request
+        model = self.model_for(request.method)
+        with self._lock:
+            self._routed[model] = self._routed.get(model, 0) + 1
+        return replace(request, model=model)
+
+    def escalate(self, request, result: Any):
+        """
+        The request retargeted at the next tier if result failed validation and
+        the request's tier is an escalation tier, else None
+        """
+        if not self.escalation or not needs_escalation(result):
+            return None
+        tier = self.tier_of(request.model)
+        if tier not in self.escalation_tiers or tier == TIERS[-1]:
+            return None
+        next_model = self.tier_models[TIERS[TIERS.index(tier) + 1]]
+        if next_model == request.model:
+            return None
+        with self._lock:
+            self._escalated[request.method] = self._escalated.get(request.method, 0) + 1
+        return replace(request, model=next_model)
+
+    def tier_of(self, model: Optional[str]) -> Optional[str]:
+        # Highest tier first, in case several tiers share a model
+        for tier in reversed(TIERS):
+            if self.tier_models[tier] == model:
+                return tier
+        return None
+
+    def stats(self) -> Dict:
+        """Requests routed per model and escalations per method"""
+        with self._lock:
+            return {"routed": dict(self._routed), "escalated": dict(self._escalated)}
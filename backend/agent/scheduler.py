@@ -0,0 +1,352 @@
+"""
+Scheduler Module
+Priority-aware admission of LLM requests under shared rate limits
+"""
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Callable, Dict, List, Optional
+import asyncio
+import heapq
+import itertools
+import json
+import threading
+import time
+
+from anthropic import APIStatusError, RateLimitError
+
+from .serializer import PromptSerializer
+
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_ON_DEMAND = "on_demand"
+PRIORITY_BATCH = "batch"
+PRIORITIES = (PRIORITY_INTERACTIVE, PRIORITY_ON_DEMAND, PRIORITY_BATCH)
+
+# Priority of requests that do not set one, by LLMRequest.method
+METHOD_PRIORITIES = {
+    "chat": PRIORITY_INTERACTIVE,
+    "parse_user_intent": PRIORITY_INTERACTIVE,
+    "summarize_conversation": PRIORITY_INTERACTIVE,
+    "compare_progress_over_time": PRIORITY_BATCH,
+    "summarize_team_performance": PRIORITY_BATCH,
+}
+
+WINDOW_SECONDS = 60.0
+
+# Pause after a 429 without a retry-after header
+DEFAULT_RATE_LIMIT_PAUSE = 5.0
+
+# Smoothing factor of the latency and wait-time averages
+EWMA_ALPHA = 0.2
+
+
+class Ticket:
+    """One request's place in the queue, and its admission once granted"""
+
+    def __init__(self, priority: str, rank: int, seq: int, tokens: int, notify: Callable[[], None]):
+        self.priority = priority
+        self.rank = rank
+        self.seq = seq
+        self.tokens = tokens
+        self.notify = notify
+        self.enqueued_at = time.monotonic()
+        self.granted_at: Optional[float] = None
+        self.cancelled = False
+        self.used_tokens: Optional[int] = None
+        # [timestamp, tokens] entry in the token window, reconciled on release
+        self.window_entry: Optional[List] = None
+
+    def __lt__(self, other: "Ticket") -> bool:
+        return (self.rank, self.seq) < (other.rank, other.seq)
+
+    def record(self, response):
+        """Replace the token reservation with what the response actually used"""
+        usage = response.usage or {}
+        self.used_tokens = (
+            usage.get("input_tokens", 0) + usage.get("cache_creation_input_tokens", 0)
+            + usage.get("output_tokens", 0)
+        )
+
+
+class RequestScheduler:
+    """
+    Central admission control for every model call made through LLMClient.
+
+    Requests queue by priority (interactive > on_demand > batch, FIFO within
+    a class) and are admitted while in-flight calls are under the concurrency
+    limit and the last minute's requests and tokens stay within
+    requests_per_minute / tokens_per_minute. A request reserves its estimated
+    input plus max_tokens; the reservation is replaced by actual usage once
+    it completes. reserved_interactive slots are kept free for interactive
+    requests, so background work can never occupy every slot.
+
+    The concurrency limit adapts: a 429 halves it and pauses admission for
+    the retry-after period, latency above latency_target shrinks it by one,
+    and a full limit's worth of fast successes grows it by one, up to
+    max_concurrency.
+    """
+
+    def __init__(self, max_concurrency: int = 8, requests_per_minute: Optional[int] = None,
+                 tokens_per_minute: Optional[int] = None, reserved_interactive: int = 1,
+                 latency_target: float = 30.0, min_concurrency: int = 1):
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min(min_concurrency, max_concurrency)
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.reserved_interactive = reserved_interactive
+        self.latency_target = latency_target
+
+        self.limit = max_concurrency
+        self.in_flight = 0
+        self.paused_until = 0.0
+
+        self._lock = threading.Lock()
+        self._queue: List[Ticket] = []
+        self._seq = itertools.count()
+        self._request_times: deque = deque()
+        self._token_window: deque = deque()
+        self._timer: Optional[threading.Timer] = None
+        self._timer_due = 0.0
+        self._successes = 0
+
+        self._counters = {
+            priority: {"admitted": 0, "completed": 0, "failed": 0, "cancelled": 0}
+            for priority in PRIORITIES
+        }
+        self._wait_avg = {priority: 0.0 for priority in PRIORITIES}
+        self._latency_avg = 0.0
+        self._rate_limited = 0
+
+    #  ADMISSION
+
+    @contextmanager
+    def slot(self, request):
+        """Block until the request is admitted; release on exit"""
+        granted = threading.Event()
+        ticket = self._enqueue(request, granted.set)
+        granted.wait()
+        started = time.monotonic()
+        try:
+            yield ticket
+        except BaseException as e:
+            self._release(ticket, error=e)
+            raise
+        self._release(ticket, error=None, latency=time.monotonic() - started)
+
+    @asynccontextmanager
+    async def slot_async(self, request):
+        """Async variant of slot; a cancelled waiter leaves the queue"""
+        loop = asyncio.get_running_loop()
+        granted = loop.create_future()
+
+        def notify():
+            loop.call_soon_threadsafe(lambda: granted.done() or granted.set_result(None))
+
+        ticket = self._enqueue(request, notify)
+        try:
+            await granted
+        except asyncio.CancelledError:
+            with self._lock:
+                admitted = ticket.granted_at is not None
+                ticket.cancelled = True
+                if not admitted:
+                    self._counters[ticket.priority]["cancelled"] += 1
+            if admitted:
+                self._release(ticket, error=None)
+            raise
+        started = time.monotonic()
+        try:
+            yield ticket
+        except BaseException as e:
+            self._release(ticket, error=e)
+            raise
+        self._release(ticket, error=None, latency=time.monotonic() - started)
+
+    def priority_of(self, request) -> str:
+        priority = getattr(request, "priority", None) or METHOD_PRIORITIES.get(request.method, PRIORITY_ON_DEMAND)
+        return priority if priority in PRIORITIES else PRIORITY_ON_DEMAND
+
+    @staticmethod
+    def estimate_tokens(request) -> int:
+        """Estimated input tokens plus the output allowance"""
+        kwargs = request.to_api_kwargs()
+        payload = json.dumps([kwargs.get("system"), kwargs["messages"], kwargs.get("tools")], default=str)
+        return PromptSerializer.estimate_tokens(payload) + request.max_tokens
+
+    def _enqueue(self, request, notify: Callable[[], None]) -> Ticket:
+        priority = self.priority_of(request)
+        ticket = Ticket(priority, PRIORITIES.index(priority), next(self._seq),
+                        self.estimate_tokens(request), notify)
+        with self._lock:
+            heapq.heappush(self._queue, ticket)
+            granted = self._dispatch()
+        _notify_all(granted)
+        return ticket
+
+    def _dispatch(self) -> List[Ticket]:
+        """Admit queued tickets in priority order while capacity allows (lock held)"""
+        granted = []
+        now = time.monotonic()
+        self._expire_window(now)
+        while self._queue:
+            ticket = self._queue[0]
+            if ticket.cancelled:
+                heapq.heappop(self._queue)
+                continue
+            wait = self._admission_delay(ticket, now)
+            if wait is None:
+                # Concurrency-bound: a release will dispatch again
+                break
+            if wait > 0:
+                self._schedule_dispatch(wait)
+                break
+            heapq.heappop(self._queue)
+            self._admit(ticket, now)
+            granted.append(ticket)
+        return granted
+
+    def _admission_delay(self, ticket: Ticket, now: float) -> Optional[float]:
+        """0 if the ticket can go now, seconds until a budget frees, or None if waiting on a slot"""
+        if now < self.paused_until:
+            return self.paused_until - now
+        limit = self.limit
+        if ticket.priority != PRIORITY_INTERACTIVE and limit > self.reserved_interactive:
+            limit -= self.reserved_interactive
+        if self.in_flight >= limit:
+            return None
+
+        delays = [0.0]
+        if self.requests_per_minute and len(self._request_times) >= self.requests_per_minute:
+            delays.append(self._request_times[0] + WINDOW_SECONDS - now)
+        if self.tokens_per_minute and self._token_window:
+            # An oversized request still goes once the window is empty
+            excess = self._window_tokens() + ticket.tokens - self.tokens_per_minute
+            freed = 0
+            for timestamp, tokens in self._token_window:
+                if excess <= freed:
+                    break
+                freed += tokens
+                delays.append(timestamp + WINDOW_SECONDS - now)
+        return max(delays)
+
+    def _admit(self, ticket: Ticket, now: float):
+        ticket.granted_at = now
+        ticket.window_entry = [now, ticket.tokens]
+        self._request_times.append(now)
+        self._token_window.append(ticket.window_entry)
+        self.in_flight += 1
+        self._counters[ticket.priority]["admitted"] += 1
+        waited = now - ticket.enqueued_at
+        self._wait_avg[ticket.priority] += EWMA_ALPHA * (waited - self._wait_avg[ticket.priority])
+
+    def _release(self, ticket: Ticket, error: Optional[BaseException], latency: Optional[float] = None):
+        with self._lock:
+            self.in_flight -= 1
+            if ticket.used_tokens is not None and ticket.window_entry is not None:
+                ticket.window_entry[1] = ticket.used_tokens
+            counters = self._counters[ticket.priority]
+            if error is None and latency is not None:
+                counters["completed"] += 1
+                self._adapt_to_latency(latency)
+            elif isinstance(error, (asyncio.CancelledError, GeneratorExit)) or error is None:
+                counters["cancelled"] += 1
+            else:
+                counters["failed"] += 1
+                if _is_rate_limit(error):
+                    self._adapt_to_rate_limit(error)
+            granted = self._dispatch()
+        _notify_all(granted)
+
+    #  ADAPTIVE CONCURRENCY
+
+    def _adapt_to_latency(self, latency: float):
+        self._latency_avg += EWMA_ALPHA * (latency - self._latency_avg)
+        if latency > self.latency_target:
+            self._successes = 0
+            self.limit = max(self.min_concurrency, self.limit - 1)
+            return
+        self._successes += 1
+        if self._successes >= self.limit:
+            self._successes = 0
+            self.limit = min(self.max_concurrency, self.limit + 1)
+
+    def _adapt_to_rate_limit(self, error: BaseException):
+        self._rate_limited += 1
+        self._successes = 0
+        self.limit = max(self.min_concurrency, self.limit // 2)
+        self.paused_until = max(self.paused_until, time.monotonic() + _retry_after(error))
+
+    #  WINDOWS
+
+    def _expire_window(self, now: float):
+        cutoff = now - WINDOW_SECONDS
+        while self._request_times and self._request_times[0] <= cutoff:
+            self._request_times.popleft()
+        while self._token_window and self._token_window[0][0] <= cutoff:
+            self._token_window.popleft()
+
+    def _window_tokens(self) -> int:
+        return sum(tokens for _, tokens in self._token_window)
+
+    def _schedule_dispatch(self, delay: float):
+        """Re-run dispatch once a budget frees up (one pending timer at a time)"""
+        due = time.monotonic() + delay
+        if self._timer is not None and self._timer.is_alive() and self._timer_due <= due:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(delay, self._on_timer)
+        self._timer.daemon = True
+        self._timer_due = due
+        self._timer.start()
+
+    def _on_timer(self):
+        with self._lock:
+            self._timer = None
+            granted = self._dispatch()
+        _notify_all(granted)
+
+    #  METRICS
+
+    def stats(self) -> Dict:
+        """Queue depths, in-flight count, concurrency limit, budget usage and per-priority counters"""
+        with self._lock:
+            self._expire_window(time.monotonic())
+            depths = {priority: 0 for priority in PRIORITIES}
+            for ticket in self._queue:
+                if not ticket.cancelled:
+                    depths[ticket.priority] += 1
+            return {
+                "queue_depth": depths,
+                "queued": sum(depths.values()),
+                "in_flight": self.in_flight,
+                "concurrency_limit": self.limit,
+                "max_concurrency": self.max_concurrency,
+                "requests_last_minute": len(self._request_times),
+                "requests_per_minute": self.requests_per_minute,
+                "tokens_last_minute": self._window_tokens(),
+                "tokens_per_minute": self.tokens_per_minute,
+                "rate_limited": self._rate_limited,
+                "paused_for": round(max(self.paused_until - time.monotonic(), 0.0), 2),
+                "average_latency": round(self._latency_avg, 3),
+                "average_wait": {priority: round(value, 3) for priority, value in self._wait_avg.items()},
+                "by_priority": {priority: dict(counters) for priority, counters in self._counters.items()}
+            }
+
+
+def _notify_all(tickets: List[Ticket]):
+    for ticket in tickets:
+        ticket.notify()
+
+
+def _is_rate_limit(error: BaseException) -> bool:
+    return isinstance(error, RateLimitError) or (isinstance(error, APIStatusError) and error.status_code == 429)
+
+
+def _retry_after(error: BaseException) -> float:
+    response = getattr(error, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        return DEFAULT_RATE_LIMIT_PAUSE
+
@@ -0,0 +1,708 @@
+"""
+Schemas Module
+Structured output schemas for the JSON-returning agent methods
+
+Each model is sent to the API as the input schema of a forced tool call, so the
+response arrives as structured tool input instead of free text, and is
+validated against the same model on arrival.
+"""
+from pydantic import BaseModel, ConfigDict, Field, ValidationError
+from typing import Any, Dict, List, Literal, Optional, Type
+
+from .domain import HealthIndicator, Priority, Risk, RiskLevel, TaskStatus
+
+Level = Literal["high", "medium", "low"]
+Trend = Literal["increasing", "stable", "decreasing"]
+Impact = Literal["positive", "negative", "neutral"]
+
+
+class AgentOutput(BaseModel):
+    """Base of all structured outputs; keys outside the schema are kept"""
+
+    model_config = ConfigDict(extra="allow", use_enum_values=True)
+
+
+#  EXECUTOR
+
+class IntentEntities(AgentOutput):
+    project_id: Optional[str] = None
+    task_id: Optional[str] = None
+    milestone_name: Optional[str] = None
+    date: Optional[str] = None
+    status: Optional[str] = None
+
+
+class UserIntent(AgentOutput):
+    """The classified intent of a user message and its extracted parameters"""
+    intent: Literal["create_project", "update_task", "view_status", "generate_report", "create_timeline",
+                    "track_progress", "identify_risks", "ask_question", "other"]
+    confidence: float = Field(ge=0, le=1)
+    entities: IntentEntities = Field(default_factory=IntentEntities)
+    required_action: str
+    parameters: Dict[str, Any] = Field(default_factory=dict)
+    clarification_needed: bool = False
+    clarification_questions: List[str] = Field(default_factory=list)
+
+
+class RecommendedTask(AgentOutput):
+    task_id: str
+    title: str
+    priority: Priority
+    reason: str
+    estimated_hours: Optional[float] = None
+    suggested_assignee: Optional[str] = None
+    deadline: Optional[str] = Field(None, description="YYYY-MM-DD")
+    dependencies_met: bool
+    on_critical_path: bool
+
+
+class ParallelOpportunity(AgentOutput):
+    tasks: List[str] = Field(description="task_ids")
+    description: str
+    total_hours: float
+
+
+class BlockedTask(AgentOutput):
+    task_id: str
+    title: str
+    blocker: str
+    action_to_unblock: str
+
+
+class NextTasks(AgentOutput):
+    """Tasks to work on next, parallelisable groups and blocked work"""
+    recommended_tasks: List[RecommendedTask]
+    parallel_opportunities: List[ParallelOpportunity]
+    blocked_tasks: List[BlockedTask]
+    prioritization_rationale: str
+
+
+class ScheduleImpact(AgentOutput):
+    additional_days: float
+    new_end_date: str = Field(description="YYYY-MM-DD")
+    affected_milestones: List[str]
+
+
+class ResourceImpact(AgentOutput):
+    additional_hours: float
+    additional_team_members: float
+    new_skills_required: List[str]
+
+
+class BudgetImpact(AgentOutput):
+    estimated_additional_cost: str
+    cost_categories: List[str]
+
+
+class RiskImpact(AgentOutput):
+    new_risks: List[str]
+    risk_level_change: Literal["increased", "decreased", "unchanged"]
+
+
+class ImpactAnalysis(AgentOutput):
+    schedule_impact: ScheduleImpact
+    resource_impact: ResourceImpact
+    budget_impact: BudgetImpact
+    risk_impact: RiskImpact
+
+
+class AffectedComponent(AgentOutput):
+    component: str
+    impact_description: str
+    requires_rework: bool
+
+
+class ScopeChangeAssessment(AgentOutput):
+    """Impact of a scope change request and a recommendation on it"""
+    change_summary: str
+    impact_analysis: ImpactAnalysis
+    affected_components: List[AffectedComponent]
+    recommendation: Literal["approve", "reject", "modify"]
+    recommendation_rationale: str
+    mitigation_strategies: List[str]
+    alternative_approaches: List[str]
+
+
+class RecommendedAssignee(AgentOutput):
+    name: str
+    reason: str
+    skill_match: Literal["excellent", "good", "adequate"]
+    availability: float
+    current_workload: Literal["light", "moderate", "heavy"]
+
+
+class AlternativeAssignee(AgentOutput):
+    name: str
+    reason: str
+    considerations: str
+
+
+class CollaborationSuggestion(AgentOutput):
+    members: List[str]
+    approach: str
+    rationale: str
+
+
+class TeamAssignment(AgentOutput):
+    """Best assignee for a task, alternatives and skill gaps"""
+    recommended_assignee: RecommendedAssignee
+    alternative_assignees: List[AlternativeAssignee]
+    collaboration_suggestions: List[CollaborationSuggestion]
+    skill_gaps: List[str]
+    training_needs: List[str]
+
+
+#  PLANNER
+
+class PlannedMilestone(AgentOutput):
+    name: str
+    description: str
+    target_week: float
+    success_criteria: List[str]
+
+
+class PlannedTask(AgentOutput):
+    task_id: str
+    title: str
+    description: str
+    priority: Priority
+    estimated_hours: float
+    dependencies: List[str] = Field(description="task_ids")
+    required_skills: List[str]
+    deliverables: List[str]
+
+
+class PlannedPhase(AgentOutput):
+    phase_number: int
+    name: str
+    description: str
+    duration_weeks: float
+    milestones: List[PlannedMilestone]
+    tasks: List[PlannedTask]
+
+
+class ResourceRequirements(AgentOutput):
+    team_size: int
+    key_roles: List[str]
+
+
+class ProjectPlan(AgentOutput):
+    """A project broken down into phases, milestones and tasks"""
+    project_name: str
+    total_estimated_weeks: float
+    phases: List[PlannedPhase]
+    critical_path: List[str] = Field(description="task_ids")
+    key_risks: List[str]
+    resource_requirements: ResourceRequirements
+
+
+class TimelineMilestone(AgentOutput):
+    name: str
+    target_date: str = Field(description="YYYY-MM-DD")
+    buffer_days: float
+
+
+class TimelineTask(AgentOutput):
+    task_id: str
+    title: str
+    start_date: str = Field(description="YYYY-MM-DD")
+    end_date: str = Field(description="YYYY-MM-DD")
+    duration_days: float
+
+
+class TimelinePhase(AgentOutput):
+    phase_name: str
+    start_date: str = Field(description="YYYY-MM-DD")
+    end_date: str = Field(description="YYYY-MM-DD")
+    milestones: List[TimelineMilestone]
+    tasks: List[TimelineTask]
+
+
+class CriticalMilestone(AgentOutput):
+    name: str
+    date: str = Field(description="YYYY-MM-DD")
+    importance: str
+
+
+class Timeline(AgentOutput):
+    start_date: str = Field(description="YYYY-MM-DD")
+    end_date: str = Field(description="YYYY-MM-DD")
+    total_weeks: float
+    phases: List[TimelinePhase]
+    critical_milestones: List[CriticalMilestone]
+
+
+class ProjectTimeline(AgentOutput):
+    """A dated schedule for every phase, milestone and task of a plan"""
+    project_timeline: Timeline
+
+
+class PhaseEffort(AgentOutput):
+    phase_name: str
+    hours: float
+    weeks: float
+
+
+class EffortSummary(AgentOutput):
+    total_hours: float
+    total_weeks: float
+    phases: List[PhaseEffort]
+
+
+class RoleRequirement(AgentOutput):
+    role: str
+    count: int
+    skills: List[str]
+    allocation_percentage: float
+
+
+class TeamRequirements(AgentOutput):
+    recommended_team_size: int
+    roles: List[RoleRequirement]
+
+
+class HoursByPriority(AgentOutput):
+    high: float
+    medium: float
+    low: float
+
+
+class PhaseHours(AgentOutput):
+    phase_name: str
+    hours: float
+
+
+class BudgetEstimate(AgentOutput):
+    hours_by_priority: HoursByPriority
+    phases: List[PhaseHours]
+
+
+class ResourceRisk(AgentOutput):
+    risk: str
+    impact: Level
+    mitigation: str
+
+
+class ResourceEstimate(AgentOutput):
+    """Effort, team composition and budget estimates for a plan"""
+    effort_summary: EffortSummary
+    team_requirements: TeamRequirements
+    budget_estimate: BudgetEstimate
+    risks: List[ResourceRisk]
+
+
+#  REPORT GENERATOR
+
+class NextMilestone(AgentOutput):
+    name: str
+    date: str = Field(description="YYYY-MM-DD")
+    confidence: Level
+
+
+class ExecutiveSummaryBody(AgentOutput):
+    project_name: str
+    overall_status: Literal["on_track", "at_risk", "delayed", "critical"]
+    health_indicator: HealthIndicator
+    completion_percentage: float
+    key_achievements: List[str] = Field(max_length=3)
+    major_concerns: List[str] = Field(max_length=3)
+    next_milestone: Optional[NextMilestone] = None
+    resource_status: Literal["adequate", "constrained", "critical"]
+    budget_status: Literal["on_budget", "over_budget", "under_budget"]
+    recommendation: Literal["continue", "adjust", "escalate"]
+    executive_message: str = Field(description="One paragraph summary for leadership")
+
+
+class ExecutiveSummary(AgentOutput):
+    """A concise project summary for leadership"""
+    executive_summary: ExecutiveSummaryBody
+
+
+class RiskSummary(AgentOutput):
+    overall_risk_level: RiskLevel
+    total_risks: int
+    high_priority_risks: int
+
+
+class Bottleneck(AgentOutput):
+    type: Literal["resource", "skill", "process", "dependency"]
+    description: str
+    affected_areas: List[str]
+    impact_on_timeline: str
+    recommended_solution: str
+
+
+class DependencyStatus(AgentOutput):
+    dependency: str
+    type: Literal["internal", "external"]
+    status: Literal["on_track", "at_risk", "blocked"]
+    impact_if_delayed: str
+
+
+class RedFlag(AgentOutput):
+    flag: str
+    severity: Level
+    recommended_action: str
+    urgency: Literal["immediate", "soon", "monitor"]
+
+
+class RiskAnalysis(AgentOutput):
+    """Project risks, bottlenecks, external dependencies and red flags"""
+    risk_summary: RiskSummary
+    risks: List[Risk]
+    bottlenecks: List[Bottleneck]
+    dependencies: List[DependencyStatus]
+    red_flags: List[RedFlag]
+
+
+class PeriodCounts(AgentOutput):
+    tasks_completed: int
+    tasks_started: int
+    hours_logged: float
+    milestones_achieved: int
+    completion_percentage_change: float
+
+
+class ProgressHighlight(AgentOutput):
+    type: Literal["achievement", "milestone", "completion"]
+    description: str
+    impact: str
+
+
+class Challenge(AgentOutput):
+    challenge: str
+    impact: str
+    resolution: str
+
+
+class PeriodTeamPerformance(AgentOutput):
+    velocity: Trend
+    productivity_notes: str
+    morale_indicators: str
+
+
+class PlanComparison(AgentOutput):
+    ahead_of_schedule: bool
+    variance_days: float
+    on_track_percentage: float
+
+
+class ProgressSummary(AgentOutput):
+    """Progress made during a reporting period"""
+    period: str
+    summary: PeriodCounts
+    highlights: List[ProgressHighlight]
+    challenges: List[Challenge]
+    team_performance: PeriodTeamPerformance
+    comparison_to_plan: PlanComparison
+    next_period_outlook: str
+
+
+class DashboardProgressAssessment(AgentOutput):
+    completion_trend: Literal["accelerating", "steady", "slowing"]
+
+
+class DashboardHealthAssessment(AgentOutput):
+    overall_health: HealthIndicator
+    schedule_health: HealthIndicator
+    resource_health: HealthIndicator
+    quality_health: HealthIndicator
+    risk_health: HealthIndicator
+
+
+class TopRisk(AgentOutput):
+    risk: str
+    severity: Level
+
+
+class DashboardAssessment(AgentOutput):
+    """Qualitative judgements on locally computed dashboard metrics"""
+    progress_indicators: DashboardProgressAssessment
+    health_indicators: DashboardHealthAssessment
+    top_risks: List[TopRisk]
+
+
+#  SUMMARIZER
+
+class PerformanceAssessment(AgentOutput):
+    velocity_trend: Trend
+
+
+class RiskAssessment(AgentOutput):
+    overall_risk_level: RiskLevel
+
+
+class MetricsAssessment(AgentOutput):
+    """Qualitative judgements on locally computed project metrics"""
+    performance_metrics: PerformanceAssessment
+    risk_metrics: RiskAssessment
+
+
+class PhaseOverview(AgentOutput):
+    phase_name: str
+    status: Literal["not_started", "in_progress", "completed"]
+    completion_percentage: float
+    start_date: Optional[str] = Field(None, description="YYYY-MM-DD")
+    end_date: Optional[str] = Field(None, description="YYYY-MM-DD")
+    duration_weeks: float
+    overview: str = Field(description="2-3 sentences")
+
+
+class PhaseTaskCounts(AgentOutput):
+    total: int
+    completed: int
+    in_progress: int
+    not_started: int
+    blocked: int
+
+
+class PhaseMilestone(AgentOutput):
+    name: str
+    status: Literal["achieved", "pending", "at_risk"]
+    date: Optional[str] = Field(None, description="YYYY-MM-DD")
+
+
+class Deliverable(AgentOutput):
+    deliverable: str
+    status: Literal["completed", "in_progress", "not_started"]
+    quality: Literal["excellent", "good", "needs_improvement"]
+
+
+class PhaseSummary(AgentOutput):
+    """Status, work and outcomes of a single project phase"""
+    phase_summary: PhaseOverview
+    tasks: PhaseTaskCounts
+    milestones: List[PhaseMilestone]
+    key_deliverables: List[Deliverable]
+    challenges: List[str]
+    achievements: List[str]
+    next_steps: List[str]
+    health_indicator: HealthIndicator
+
+
+class TrendAnalysis(AgentOutput):
+    overall_trend: Literal["accelerating", "steady", "slowing", "stalled"]
+    completion_rate_trend: Literal["improving", "stable", "declining"]
+    velocity_trend: Trend
+
+
+class PeriodComparison(AgentOutput):
+    period: str
+    tasks_completed: int
+    completion_percentage: float
+    velocity: float
+    issues_encountered: int
+
+
+class NotableChange(AgentOutput):
+    change: str
+    date: str = Field(description="YYYY-MM-DD")
+    impact: Impact
+    description: str
+
+
+class CompletionPrediction(AgentOutput):
+    projected_completion_date: str = Field(description="YYYY-MM-DD")
+    confidence: Level
+    based_on: str
+
+
+class ProgressComparison(AgentOutput):
+    """Trends across historical project snapshots"""
+    trend_analysis: TrendAnalysis
+    period_comparisons: List[PeriodComparison]
+    notable_changes: List[NotableChange]
+    predictions: CompletionPrediction
+    recommendations: List[str]
+
+
+class Highlight(AgentOutput):
+    type: Literal["achievement", "milestone", "completion", "issue", "risk"]
+    title: str
+    description: str = Field(description="one sentence")
+    importance: Level
+
+
+class Highlights(AgentOutput):
+    """Key highlights, achievements and concerns for a period"""
+    highlights: List[Highlight]
+    top_3_achievements: List[str] = Field(max_length=3)
+    top_3_concerns: List[str] = Field(max_length=3)
+    key_decisions_made: List[str]
+    upcoming_focus_areas: List[str]
+
+
+class TeamPerformanceRating(AgentOutput):
+    overall_rating: Literal["excellent", "good", "satisfactory", "needs_improvement"]
+    productivity_level: Level
+    collaboration_quality: Literal["excellent", "good", "needs_improvement"]
+    velocity: float
+    velocity_trend: Trend
+
+
+class MemberContribution(AgentOutput):
+    member: str
+    tasks_completed: int
+    contribution_level: Level
+    key_achievements: List[str]
+    areas_for_growth: List[str]
+
+
+class MoraleIndicators(AgentOutput):
+    estimated_morale: Level
+    indicators: List[str]
+
+
+class TeamPerformance(AgentOutput):
+    """Team-level and individual performance"""
+    team_performance: TeamPerformanceRating
+    individual_contributions: List[MemberContribution]
+    team_strengths: List[str]
+    team_challenges: List[str]
+    morale_indicators: MoraleIndicators
+    recommendations: List[str]
+
+
+#  TRACKER
+
+class TaskUpdateRecord(AgentOutput):
+    task_id: str
+    previous_status: Optional[str] = None
+    new_status: TaskStatus
+    updated_at: str = Field(description="ISO timestamp")
+
+
+class AffectedTask(AgentOutput):
+    task_id: str
+    impact: str
+    action_needed: str
+
+
+class MilestoneImpact(AgentOutput):
+    milestone: str
+    original_date: str = Field(description="YYYY-MM-DD")
+    projected_date: str = Field(description="YYYY-MM-DD")
+    delay_days: float
+
+
+class StatusImpactAnalysis(AgentOutput):
+    affected_tasks: List[AffectedTask]
+    milestone_impact: List[MilestoneImpact]
+    critical_path_affected: bool
+
+
+class ProjectTaskMetrics(AgentOutput):
+    completion_percentage: float
+    tasks_completed: int
+    tasks_in_progress: int
+    tasks_blocked: int
+    tasks_not_started: int
+
+
+class Alert(AgentOutput):
+    severity: Level
+    message: str
+
+
+class TaskStatusUpdate(AgentOutput):
+    """Downstream impact of a task status change"""
+    task_update: TaskUpdateRecord
+    impact_analysis: StatusImpactAnalysis
+    project_metrics: ProjectTaskMetrics
+    recommendations: List[str]
+    alerts: List[Alert]
+
+
+class MilestoneState(AgentOutput):
+    name: str
+    target_date: str = Field(description="YYYY-MM-DD")
+    actual_completion_date: Optional[str] = Field(None, description="YYYY-MM-DD")
+    status: Literal["completed", "in_progress", "not_started"]
+
+
+class CompletionCriterion(AgentOutput):
+    criterion: str
+    met: bool
+    evidence: str
+
+
+class AssociatedTask(AgentOutput):
+    task_id: str
+    title: str
+    status: str
+    completion_percentage: float
+
+
+class MilestoneCompletion(AgentOutput):
+    """Whether a milestone's criteria and tasks are complete"""
+    milestone: MilestoneState
+    completion_criteria: List[CompletionCriterion]
+    associated_tasks: List[AssociatedTask]
+    completion_percentage: float
+    blockers: List[str]
+    next_steps: List[str]
+    ready_to_mark_complete: bool
+    recommendation: str
+
+
+class Blocker(AgentOutput):
+    blocker_id: str
+    type: Literal["technical", "resource", "dependency", "external"]
+    description: str
+    affected_tasks: List[str] = Field(description="task_ids")
+    severity: Level
+    estimated_delay: str
+    resolution_strategies: List[str]
+    owner: Optional[str] = None
+
+
+class BlockerBottleneck(AgentOutput):
+    type: Literal["resource", "skill", "process"]
+    description: str
+    impact: str
+    mitigation: str
+
+
+class DependencyAtRisk(AgentOutput):
+    dependency: str
+    risk: str
+    contingency_plan: str
+
+
+class Blockers(AgentOutput):
+    """Blockers, bottlenecks and at-risk dependencies in a project"""
+    blockers: List[Blocker]
+    bottlenecks: List[BlockerBottleneck]
+    dependencies_at_risk: List[DependencyAtRisk]
+
+
+#  TOOL CALLS AND VALIDATION
+
+def tool_definition(name: str, schema: Type[BaseModel]) -> Dict[str, Any]:
+    """Tool definition whose input schema is the output model"""
+    json_schema = schema.model_json_schema()
+    return {
+        "name": name,
+        "description": json_schema.pop("description", f"Record the {name} result"),
+        "input_schema": json_schema
+    }
+
+
+def validate_output(schema: Type[BaseModel], data: Any) -> Any:
+    """
+    Validate parsed model output against its schema
+    Valid output is returned normalised; invalid output is returned as parsed,
+    with a "validation_errors" list describing what did not match.
+    """
+    if not isinstance(data, dict) or "raw_response" in data:
+        return data
+    try:
+        return schema.model_validate(data).model_dump(mode="json")
+    except ValidationError as e:
+        print(f"Response failed {schema.__name__} validation ({e.error_count()} errors)")
+        return {
+            **data,
+            "validation_errors": [
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+            ]
+        }
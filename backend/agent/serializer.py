@@ -0,0 +1,389 @@
+"""
+Serializer Module
+Compact, token-budgeted encoding of project data for prompts
+"""
+from typing import Any, Dict, List, Optional, Set, Tuple
+import copy
+import hashlib
+import json
+
+# Rough characters-per-token ratio used for budget estimates
+CHARS_PER_TOKEN = 4
+
+DEFAULT_TOKEN_BUDGET = 8000
+
+# Subtrees smaller than this (in characters) are not worth replacing with a reference
+MIN_DEDUP_SIZE = 48
+
+# Free-text fields dropped first when a payload is over budget
+LOW_PRIORITY_TEXT_FIELDS = {
+    "description", "notes", "deliverables", "success_criteria",
+    "required_skills", "tags", "metadata"
+}
+
+# Top-level project fields that only local engines read (never sent to the model)
+LOCAL_ONLY_FIELDS = {"status_history"}
+
+TASK_SCHEDULE_FIELDS = {
+    "task_id", "title", "status", "priority", "estimated_hours", "actual_hours",
+    "dependencies", "assignee", "deadline", "start_date", "end_date"
+}
+
+# Per-method field allow-lists by entity kind; methods not listed keep every field
+FIELD_ALLOWLISTS: Dict[str, Dict[str, Set[str]]] = {
+    "calculate_completion_percentage": {
+        "project": {"name", "status", "start_date", "deadline", "completion_percentage", "phases"},
+        "phase": {"phase_number", "name", "status", "tasks", "milestones"},
+        "task": {"task_id", "status", "priority", "estimated_hours", "actual_hours", "end_date", "updated_at"},
+        "milestone": {"name", "target_week", "target_date", "status", "associated_tasks"},
+    },
+    "identify_blockers": {
+        "project": {"name", "status", "deadline", "team_members", "phases"},
+        "phase": {"phase_number", "name", "status", "tasks"},
+        "task": TASK_SCHEDULE_FIELDS | {"notes", "required_skills"},
+    },
+    "parse_user_intent": {
+        "project": {"project_id", "id", "name", "status", "phases"},
+        "phase": {"name", "tasks", "milestones"},
+        "task": {"task_id", "title", "status"},
+        "milestone": {"name"},
+    },
+    "suggest_next_tasks": {
+        "project": {"name", "status", "deadline", "team_members", "phases"},
+        "phase": {"phase_number", "name", "status", "tasks"},
+        "task": TASK_SCHEDULE_FIELDS | {"required_skills"},
+    },
+    "aggregate_metrics": {
+        "project": {"name", "status", "start_date", "deadline", "completion_percentage",
+                    "team_members", "budget", "phases", "risks"},
+        "phase": {"phase_number", "name", "status", "start_date", "end_date", "tasks", "milestones"},
+        "task": TASK_SCHEDULE_FIELDS,
+        "milestone": {"name", "target_week", "target_date", "status"},
+    },
+    "generate_metrics_dashboard": {
+        "project": {"name", "status", "start_date", "deadline", "completion_percentage",
+                    "health_indicator", "team_members", "budget", "phases", "risks"},
+        "phase": {"phase_number", "name", "status", "start_date", "end_date", "tasks", "milestones"},
+        "task": TASK_SCHEDULE_FIELDS,
+        "milestone": {"name", "target_week", "target_date", "status"},
+    },
+}
+
+# Task lists the truncation steps may shrink, and the counter recording what they dropped
+# (the slicer's keys included, so scoped slices obey the budget too)
+TASK_LIST_KEYS = {
+    "tasks": "omitted_tasks",
+    "milestone_tasks": "milestone_tasks_omitted",
+    "related_tasks": "related_tasks_omitted",
+}
+
+# Container keys whose list items are a known entity kind
+CHILD_KINDS = {"phases": "phase", "tasks": "task", "milestones": "milestone"}
+
+SCALARS = (str, int, float, bool, type(None))
+
+# Prepended when the compact encodings are used so the model can read them
+ENCODING_NOTE = ('(Compact JSON: {"columns": [...], "rows": [[...]]} is a list of records; '
+                 '{"$ref": "path"} repeats the value found at path.)')
+
+
+class PromptSerializer:
+    """
+    Encodes project data for prompts:
+    - drops fields outside the calling method's allow-list
+    - replaces repeated subtrees (e.g. plan.phases next to phases) with {"$ref": path}
+    - encodes uniform lists of records as {"columns": [...], "rows": [[...]]}
+    - enforces a token budget by shedding the lowest-priority content first
+    """
+
+    def __init__(self, token_budget: Optional[int] = DEFAULT_TOKEN_BUDGET,
+                 allowlists: Optional[Dict[str, Dict[str, Set[str]]]] = None):
+        self.token_budget = token_budget
+        self.allowlists = FIELD_ALLOWLISTS if allowlists is None else allowlists
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        return len(text) // CHARS_PER_TOKEN + 1
+
+    def serialize(self, data: Any, method: Optional[str] = None,
+                  token_budget: Optional[int] = None) -> str:
+        """Compact prompt encoding of `data` for `method`"""
+        return self.serialize_with_report(data, method, token_budget)[0]
+
+    def serialize_with_report(self, data: Any, method: Optional[str] = None,
+                              token_budget: Optional[int] = None) -> Tuple[str, Dict]:
+        """Like serialize, also returning size estimates and the trimming steps applied"""
+        budget = token_budget if token_budget is not None else self.token_budget
+        allowlist = self.allowlists.get(method) if method else None
+        if isinstance(data, dict) and not LOCAL_ONLY_FIELDS.isdisjoint(data):
+            data = {key: value for key, value in data.items() if key not in LOCAL_ONLY_FIELDS}
+
+        pruned = self._filter_fields(data, allowlist, "project")
+        text = self._encode(pruned)
+        report = {"method": method, "budget": budget, "steps": []}
+
+        if budget is not None:
+            for step in TRUNCATION_STEPS:
+                if self.estimate_tokens(text) <= budget:
+                    break
+                if step(pruned):
+                    report["steps"].append(step.__name__.lstrip("_"))
+                    text = self._encode(pruned)
+            # Then keep halving task tables until the payload fits
+            while self.estimate_tokens(text) > budget and _trim_task_rows(pruned):
+                if "trim_task_rows" not in report["steps"]:
+                    report["steps"].append("trim_task_rows")
+                text = self._encode(pruned)
+            # Last resort for any other shape: shrink the largest list or string
+            holder = [pruned]
+            while self.estimate_tokens(text) > budget and _trim_largest(holder):
+                if "trim_largest" not in report["steps"]:
+                    report["steps"].append("trim_largest")
+                text = self._encode(holder[0])
+            pruned = holder[0]
+            report["over_budget"] = self.estimate_tokens(text) > budget
+
+        report["estimated_tokens"] = self.estimate_tokens(text)
+        return text, report
+
+    #  ENCODING
+
+    def _encode(self, data: Any) -> str:
+        deduped = _dedupe(data)
+        tabular = _tabulate(deduped)
+        text = json.dumps(tabular, separators=(",", ":"), ensure_ascii=False, default=str)
+        if '"columns":' in text or '"$ref":' in text:
+            text = f"{ENCODING_NOTE}\n{text}"
+        return text
+
+    def _filter_fields(self, node: Any, allowlist: Optional[Dict[str, Set[str]]], kind: Optional[str]) -> Any:
+        """Deep copy of node without fields outside the allow-list for its kind"""
+        if allowlist is None:
+            return copy.deepcopy(node)
+        if isinstance(node, list):
+            return [self._filter_fields(item, allowlist, kind) for item in node]
+        if not isinstance(node, dict):
+            return node
+
+        allowed = allowlist.get(kind) if kind else None
+        result = {}
+        for key, value in node.items():
+            if allowed is not None and key not in allowed:
+                continue
+            result[key] = self._filter_fields(value, allowlist, CHILD_KINDS.get(key))
+        return result
+
+
+def _digest(node: Any, seen: Dict[str, str], path: str, refs: Dict[str, str]) -> Tuple[str, int]:
+    """Bottom-up content hash and size of node; records later duplicates in refs"""
+    if isinstance(node, dict):
+        parts = []
+        size = 2
+        for key, value in node.items():
+            child_hash, child_size = _digest(value, seen, f"{path}.{key}" if path else key, refs)
+            parts.append(f"{key}={child_hash}")
+            size += len(key) + child_size + 4
+        digest = hashlib.sha1(("{" + ",".join(sorted(parts))).encode("utf-8")).hexdigest()
+    elif isinstance(node, list):
+        parts = []
+        size = 2
+        for index, value in enumerate(node):
+            child_hash, child_size = _digest(value, seen, f"{path}[{index}]", refs)
+            parts.append(child_hash)
+            size += child_size + 1
+        digest = hashlib.sha1(("[" + ",".join(parts)).encode("utf-8")).hexdigest()
+    else:
+        encoded = json.dumps(node, default=str)
+        return hashlib.sha1(encoded.encode("utf-8")).hexdigest(), len(encoded)
+
+    if size >= MIN_DEDUP_SIZE:
+        if digest in seen:
+            refs[path] = seen[digest]
+        else:
+            seen[digest] = path
+    return digest, size
+
+
+def _dedupe(data: Any) -> Any:
+    """Replace repeated subtrees with {"$ref": path-of-first-occurrence}"""
+    # Keyed by path: the same object may legitimately appear at two paths
+    refs: Dict[str, str] = {}
+    _digest(data, {}, "", refs)
+    if not refs:
+        return data
+
+    def rebuild(node: Any, path: str) -> Any:
+        if path in refs:
+            return {"$ref": refs[path]}
+        if isinstance(node, dict):
+            return {key: rebuild(value, f"{path}.{key}" if path else key) for key, value in node.items()}
+        if isinstance(node, list):
+            return [rebuild(item, f"{path}[{index}]") for index, item in enumerate(node)]
+        return node
+
+    return rebuild(data, "")
+
+
+def _is_flat_record(item: Any) -> bool:
+    return isinstance(item, dict) and all(
+        isinstance(value, SCALARS) or (isinstance(value, list) and all(isinstance(v, SCALARS) for v in value))
+        for value in item.values()
+    )
+
+
+def _tabulate(node: Any) -> Any:
+    """Encode uniform lists of flat records as column/row tables"""
+    if isinstance(node, dict):
+        return {key: _tabulate(value) for key, value in node.items()}
+    if isinstance(node, list):
+        if len(node) >= 2 and all(_is_flat_record(item) for item in node):
+            columns: List[str] = []
+            for item in node:
+                for key in item:
+                    if key not in columns:
+                        columns.append(key)
+            return {"columns": columns, "rows": [[item.get(col) for col in columns] for item in node]}
+        return [_tabulate(item) for item in node]
+    return node
+
+
+#  TRUNCATION STEPS (lowest-priority content first; each returns True if it changed anything)
+
+def _walk_task_lists(node: Any):
+    """Yield (container, key, task_list) for every task list (TASK_LIST_KEYS) in the tree"""
+    if isinstance(node, dict):
+        for key in TASK_LIST_KEYS:
+            tasks = node.get(key)
+            if isinstance(tasks, list):
+                yield node, key, tasks
+        for value in node.values():
+            yield from _walk_task_lists(value)
+    elif isinstance(node, list):
+        for item in node:
+            yield from _walk_task_lists(item)
+
+
+def _shorten_long_text(node: Any, limit: int = 160) -> bool:
+    changed = False
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if isinstance(value, str) and len(value) > limit:
+                node[key] = value[:limit] + "..."
+                changed = True
+            else:
+                changed = _shorten_long_text(value, limit) or changed
+    elif isinstance(node, list):
+        for item in node:
+            changed = _shorten_long_text(item, limit) or changed
+    return changed
+
+
+def _drop_text_fields(node: Any) -> bool:
+    changed = False
+    if isinstance(node, dict):
+        for key in list(node):
+            if key in LOW_PRIORITY_TEXT_FIELDS:
+                del node[key]
+                changed = True
+            else:
+                changed = _drop_text_fields(node[key]) or changed
+    elif isinstance(node, list):
+        for item in node:
+            changed = _drop_text_fields(item) or changed
+    return changed
+
+
+def _drop_tasks_where(node: Any, predicate) -> bool:
+    changed = False
+    for container, key, tasks in list(_walk_task_lists(node)):
+        kept = [task for task in tasks if not (isinstance(task, dict) and predicate(task))]
+        if len(kept) != len(tasks):
+            _omit(container, key, len(tasks) - len(kept))
+            container[key] = kept
+            changed = True
+    return changed
+
+
+def _omit(container: Dict, key: str, count: int):
+    counter = TASK_LIST_KEYS[key]
+    container[counter] = container.get(counter, 0) + count
+
+
+def _drop_completed_tasks(node: Any) -> bool:
+    return _drop_tasks_where(node, lambda task: task.get("status") == "completed")
+
+
+def _drop_low_priority_tasks(node: Any) -> bool:
+    return _drop_tasks_where(node, lambda task: task.get("priority") == "low")
+
+
+def _drop_medium_priority_tasks(node: Any) -> bool:
+    return _drop_tasks_where(node, lambda task: task.get("priority") == "medium")
+
+
+def _drop_duplicate_plan(node: Any) -> bool:
+    if isinstance(node, dict) and "plan" in node and "phases" in node:
+        del node["plan"]
+        return True
+    return False
+
+
+def _trim_task_rows(node: Any) -> bool:
+    changed = False
+    for container, key, tasks in list(_walk_task_lists(node)):
+        if tasks:
+            keep = len(tasks) // 2
+            _omit(container, key, len(tasks) - keep)
+            container[key] = tasks[:keep]
+            changed = True
+    return changed
+
+
+# Strings shorter than this are left alone by _trim_largest
+MIN_TRIM_TEXT = 32
+
+
+def _trim_largest(node: Any) -> bool:
+    """Halve the largest list (by encoded size) or string anywhere in node"""
+    best: List = []
+
+    def scan(container: Any, key: Any) -> int:
+        """Encoded size of container[key], noting the largest candidate on the way"""
+        value = container[key]
+        if isinstance(value, dict):
+            size = 2 + sum(len(str(child_key)) + 4 + scan(value, child_key) for child_key in list(value))
+        elif isinstance(value, list):
+            size = 2 + sum(scan(value, index) + 1 for index in range(len(value)))
+        else:
+            size = len(json.dumps(value, ensure_ascii=False, default=str))
+        if (isinstance(value, list) and len(value) > 1) or (isinstance(value, str) and len(value) > MIN_TRIM_TEXT):
+            if not best or size > best[0]:
+                best[:] = [size, container, key]
+        return size
+
+    for index in range(len(node)):
+        scan(node, index)
+    if not best:
+        return False
+
+    _, container, key = best
+    value = container[key]
+    if isinstance(value, str):
+        container[key] = value[:len(value) // 2] + "..."
+    else:
+        keep = len(value) // 2
+        container[key] = value[:keep]
+        if isinstance(container, dict):
+            counter = TASK_LIST_KEYS.get(key, f"omitted_{key}")
+            container[counter] = container.get(counter, 0) + len(value) - keep
+    return True
+
+
+TRUNCATION_STEPS = [
+    _drop_duplicate_plan,
+    _shorten_long_text,
+    _drop_text_fields,
+    _drop_completed_tasks,
+    _drop_low_priority_tasks,
+    _drop_medium_priority_tasks,
+]
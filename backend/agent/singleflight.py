@@ -0,0 +1,114 @@
+"""
+Single-Flight Module
+Coalesces identical in-flight calls so concurrent callers share one execution
+"""
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict
+import asyncio
+import hashlib
+import json
+import threading
+
+
+def request_key(request) -> str:
+    """Hash of everything sent to the API for an LLMRequest"""
+    material = {"kwargs": request.to_api_kwargs(), "headers": request.extra_headers()}
+    encoded = json.dumps(material, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class _AsyncCall:
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    At most one execution per key at a time.
+
+    The first caller for a key runs the function; callers arriving while it is
+    in flight wait for the same result (or exception) instead of running it
+    again. Nothing is kept once the call finishes, so there is no staleness.
+
+    Async calls run as a task shared by all waiters: a waiter that is
+    cancelled just stops waiting, and the task itself is cancelled only when
+    the last waiter has left. Sync calls run on the first caller's thread.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sync_calls: Dict[str, Future] = {}
+        self._async_calls: Dict[str, _AsyncCall] = {}
+        self._counters = {"executed": 0, "shared": 0, "abandoned": 0}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            future = self._sync_calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._sync_calls[key] = future
+                self._counters["executed"] += 1
+            else:
+                self._counters["shared"] += 1
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                if self._sync_calls.get(key) is future:
+                    del self._sync_calls[key]
+
+    async def do_async(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            call = self._async_calls.get(key)
+            # Tasks belong to one event loop; a call from another loop is not joined
+            if call is None or call.task.done() or call.task.get_loop() is not loop:
+                call = _AsyncCall(loop.create_task(fn()))
+                self._async_calls[key] = call
+                call.task.add_done_callback(lambda _: self._forget(key, call))
+                self._counters["executed"] += 1
+            else:
+                self._counters["shared"] += 1
+            call.waiters += 1
+
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            with self._lock:
+                call.waiters -= 1
+                abandon = call.waiters == 0 and not call.task.done()
+                if abandon:
+                    # Last waiter gone: later callers must start afresh
+                    self._counters["abandoned"] += 1
+                    if self._async_calls.get(key) is call:
+                        del self._async_calls[key]
+            if abandon:
+                call.task.cancel()
+
+    def _forget(self, key: str, call: _AsyncCall):
+        with self._lock:
+            if self._async_calls.get(key) is call:
+                del self._async_calls[key]
+        # Retrieve the outcome so an abandoned failure is not reported as unhandled
+        if not call.task.cancelled():
+            call.task.exception()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._sync_calls) + len(self._async_calls)
+
+    def stats(self) -> Dict:
+        """Calls executed, calls that shared another's result, and calls cancelled after every waiter left"""
+        with self._lock:
+            return {**self._counters, "in_flight": len(self._sync_calls) + len(self._async_calls)}
@@ -0,0 +1,256 @@
+"""
+Slicer Module
+Scoped project context for calls that concern a single task, milestone or phase
+"""
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from .dependency_index import DependencyIndex
+from .metrics import MetricsEngine, TaskTable, iter_phases
+
+# Dependency hops followed from the target in each direction
+DEFAULT_HOPS = 2
+
+# Neighbouring tasks included at most; the nearest are kept
+DEFAULT_MAX_RELATED = 60
+
+# Fields kept for tasks other than a single target task
+RELATED_TASK_FIELDS = (
+    "task_id", "title", "status", "priority", "estimated_hours", "actual_hours",
+    "dependencies", "assignee", "deadline", "start_date", "end_date"
+)
+
+# Project fields carried into every slice (phases and tasks are replaced by the slice itself)
+PROJECT_FIELDS = (
+    "project_id", "id", "name", "project_name", "description", "status", "start_date", "deadline",
+    "health_indicator", "team_members", "budget"
+)
+
+
+class ContextSlicer:
+    """
+    Builds the part of a project a single-entity call needs: the target, its
+    dependency neighbourhood up to `hops` away (prerequisites and dependents),
+    its parent phase without the phase's other tasks, and project-wide stats
+    so the model can still reason about overall completion. Prompt size then
+    tracks the neighbourhood instead of the project.
+    """
+
+    def __init__(self, hops: int = DEFAULT_HOPS, max_related: int = DEFAULT_MAX_RELATED,
+                 metrics: Optional[MetricsEngine] = None):
+        self.hops = hops
+        self.max_related = max_related
+        self.metrics = metrics or MetricsEngine()
+
+    def task_slice(self, project_data: Dict, task_id: str,
+                   index: Optional[DependencyIndex] = None) -> Dict:
+        """One task, its k-hop dependency neighbourhood and its phase"""
+        tasks, phase_of = _locate_tasks(project_data)
+        task_id = str(task_id)
+        table = TaskTable.from_project(project_data)
+        sliced = self._base(project_data, table)
+
+        if task_id not in tasks:
+            sliced["scope"] = f"Task {task_id} was not found in the project"
+            return sliced
+
+        index = index or DependencyIndex.from_project(project_data)
+        related, omitted = self._neighbourhood(index, [task_id], tasks)
+        sliced["scope"] = (f"Task {task_id}, tasks within {self.hops} dependency hops of it and its phase; "
+                           "other tasks are omitted but counted in project_stats")
+        sliced["target_task"] = tasks[task_id]
+        sliced["phase"] = _phase_summary(phase_of.get(task_id))
+        sliced["related_tasks"] = related
+        if omitted:
+            sliced["related_tasks_omitted"] = omitted
+        return sliced
+
+    def milestone_slice(self, project_data: Dict, milestone_name: str,
+                        index: Optional[DependencyIndex] = None) -> Dict:
+        """One milestone, the tasks it covers (with their direct dependencies) and its phase"""
+        tasks, _ = _locate_tasks(project_data)
+        table = TaskTable.from_project(project_data)
+        sliced = self._base(project_data, table)
+
+        found = _find_milestone(project_data, milestone_name)
+        if found is None:
+            sliced["scope"] = f"Milestone {milestone_name!r} was not found in the project"
+            sliced["milestones"] = [name for name, _ in _milestones(project_data)]
+            return sliced
+
+        milestone, phase = found
+        associated = [str(task_id) for task_id in milestone.get("associated_tasks") or []]
+        if not associated:
+            # Without explicit associations a milestone covers its phase's tasks
+            associated = [
+                str(task.get("task_id") or task.get("id")) for task in phase.get("tasks") or []
+                if isinstance(task, dict) and (task.get("task_id") or task.get("id"))
+            ]
+        covered = [_compact(tasks[task_id]) for task_id in associated if task_id in tasks]
+        covered_omitted = max(len(covered) - self.max_related, 0)
+
+        index = index or DependencyIndex.from_project(project_data)
+        related, omitted = self._neighbourhood(index, [task_id for task_id in associated if task_id in tasks],
+                                               tasks, hops=1)
+        sliced["scope"] = (f"Milestone {milestone.get('name')!r}, the tasks it covers, their direct "
+                           "dependencies and its phase; other tasks are omitted but counted in project_stats")
+        sliced["target_milestone"] = milestone
+        sliced["phase"] = _phase_summary(phase)
+        sliced["milestone_tasks"] = covered[:self.max_related]
+        if covered_omitted:
+            sliced["milestone_tasks_omitted"] = covered_omitted
+        sliced["related_tasks"] = related
+        if omitted:
+            sliced["related_tasks_omitted"] = omitted
+        return sliced
+
+    def phase_slice(self, project_data: Dict, phase_name: str,
+                    index: Optional[DependencyIndex] = None) -> Dict:
+        """One phase with its tasks, plus tasks in other phases it depends on or blocks"""
+        tasks, _ = _locate_tasks(project_data)
+        table = TaskTable.from_project(project_data)
+        sliced = self._base(project_data, table)
+
+        phase = _find_phase(project_data, phase_name)
+        if phase is None:
+            sliced["scope"] = f"Phase {phase_name!r} was not found in the project"
+            return sliced
+
+        own = [
+            str(task.get("task_id") or task.get("id")) for task in phase.get("tasks") or []
+            if isinstance(task, dict) and (task.get("task_id") or task.get("id"))
+        ]
+        index = index or DependencyIndex.from_project(project_data)
+        related, omitted = self._neighbourhood(index, own, tasks, hops=1)
+        sliced["scope"] = (f"Phase {phase.get('name')!r} with all its tasks and the tasks in other "
+                           "phases directly linked to them; other phases are summarized in project_stats")
+        sliced["target_phase"] = {
+            **{key: value for key, value in phase.items() if key != "tasks"},
+            "tasks": [_compact(task) for task in phase.get("tasks") or [] if isinstance(task, dict)]
+        }
+        sliced["related_tasks"] = related
+        if omitted:
+            sliced["related_tasks_omitted"] = omitted
+        return sliced
+
+    def _base(self, project_data: Dict, table: TaskTable) -> Dict:
+        project = {key: project_data[key] for key in PROJECT_FIELDS if project_data.get(key) is not None}
+        return {"project": project, "project_stats": self._stats(project_data, table)}
+
+    def _stats(self, project_data: Dict, table: TaskTable) -> Dict:
+        completion = self.metrics.completion(project_data, table=table)
+        by_status: Dict[str, int] = {}
+        active_by_assignee: Dict[str, int] = {}
+        for status, assignee in zip(table.statuses, table.assignees):
+            by_status[status] = by_status.get(status, 0) + 1
+            if isinstance(assignee, str) and assignee and status in ("in_progress", "not_started", "blocked"):
+                active_by_assignee[assignee] = active_by_assignee.get(assignee, 0) + 1
+        return {
+            "overall_completion": completion["overall_completion"],
+            "tasks_by_status": by_status,
+            "open_tasks_by_assignee": active_by_assignee,
+            "by_phase": completion["by_phase"],
+            "milestone_progress": completion["milestone_progress"]
+        }
+
+    def _neighbourhood(self, index: DependencyIndex, seeds: List[str], tasks: Dict[str, Dict],
+                       hops: Optional[int] = None) -> Tuple[List[Dict], int]:
+        """
+        Tasks within `hops` of the seeds, nearest first, tagged with how they relate.
+        Returns (tasks, number omitted over max_related).
+        """
+        hops = self.hops if hops is None else hops
+        seen = set(seeds)
+        found: List[Tuple[int, str, str]] = []
+        queue = deque((seed, 0, None) for seed in seeds)
+        while queue:
+            task_id, distance, direction = queue.popleft()
+            if distance >= hops:
+                continue
+            steps = []
+            if direction in (None, "prerequisite"):
+                steps += [(dep, "prerequisite") for dep in index.prerequisites.get(task_id, [])]
+            if direction in (None, "dependent"):
+                steps += [(dep, "dependent") for dep in index.dependents_of(task_id)]
+            for neighbour, relation in steps:
+                if neighbour in seen:
+                    continue
+                seen.add(neighbour)
+                found.append((distance + 1, relation, neighbour))
+                queue.append((neighbour, distance + 1, relation))
+
+        related = []
+        for distance, relation, task_id in found[:self.max_related]:
+            task = tasks.get(task_id)
+            entry = _compact(task) if task else {"task_id": task_id, "status": "unknown (not in project)"}
+            entry["relation"] = relation
+            entry["hops"] = distance
+            related.append(entry)
+        return related, max(len(found) - self.max_related, 0)
+
+
+def _locate_tasks(project_data: Dict) -> Tuple[Dict[str, Dict], Dict[str, Dict]]:
+    """task_id -> task and task_id -> parent phase, in one pass"""
+    tasks: Dict[str, Dict] = {}
+    phase_of: Dict[str, Dict] = {}
+    groups = [(phase, phase.get("tasks") or []) for phase in iter_phases(project_data)]
+    groups.append((None, project_data.get("tasks") or []))
+    for phase, phase_tasks in groups:
+        for task in phase_tasks:
+            if not isinstance(task, dict):
+                continue
+            task_id = task.get("task_id") or task.get("id")
+            if task_id:
+                tasks[str(task_id)] = task
+                if phase is not None:
+                    phase_of[str(task_id)] = phase
+    return tasks, phase_of
+
+
+def _compact(task: Dict) -> Dict:
+    return {key: task[key] for key in RELATED_TASK_FIELDS if key in task}
+
+
+def _phase_summary(phase: Optional[Dict]) -> Optional[Dict]:
+    """A phase without its task list"""
+    if phase is None:
+        return None
+    summary = {key: value for key, value in phase.items() if key != "tasks"}
+    summary["task_count"] = len(phase.get("tasks") or [])
+    return summary
+
+
+def _milestones(project_data: Dict) -> List[Tuple[str, Tuple[Dict, Dict]]]:
+    found = []
+    for phase in iter_phases(project_data):
+        for milestone in phase.get("milestones") or []:
+            if isinstance(milestone, str):
+                milestone = {"name": milestone}
+            if isinstance(milestone, dict) and milestone.get("name"):
+                found.append((str(milestone["name"]), (milestone, phase)))
+    return found
+
+
+def _find_milestone(project_data: Dict, name: str) -> Optional[Tuple[Dict, Dict]]:
+    return _match_name(name, _milestones(project_data))
+
+
+def _find_phase(project_data: Dict, name: str) -> Optional[Dict]:
+    phases = []
+    for number, phase in enumerate(iter_phases(project_data), start=1):
+        label = phase.get("name") or f"Phase {phase.get('phase_number', number)}"
+        phases.append((str(label), phase))
+    return _match_name(name, phases)
+
+
+def _match_name(name: str, candidates: List[Tuple[str, object]]):
+    """Exact (case-insensitive) match first, then the shortest name containing or contained in it"""
+    wanted = str(name).strip().casefold()
+    for label, value in candidates:
+        if label.casefold() == wanted:
+            return value
+    partial = [
+        (len(label), value) for label, value in candidates
+        if wanted and (wanted in label.casefold() or label.casefold() in wanted)
+    ]
+    return min(partial, key=lambda item: item[0])[1] if partial else None
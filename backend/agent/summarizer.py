@@ -2,22 +2,35 @@
 Summarizer Module
 Summarizes project data and creates executive summaries
 """
-from anthropic import Anthropic
 from typing import Dict, List, Optional
-import json
-
-class ProjectSummarizer:
-    def __init__(self, api_key: str):
-        self.client = Anthropic(api_key=api_key)
+import asyncio
+
+from .base import AgentModule
+from .client import LLMClient, LLMRequest
+from .metrics import AGGREGATE_QUALITATIVE_FIELDS, MetricsEngine, apply_assessment
+from .schemas import Highlights, MetricsAssessment, PhaseSummary, ProgressComparison, TeamPerformance
+from .serializer import PromptSerializer
+
+class ProjectSummarizer(AgentModule):
+    def __init__(self, api_key: Optional[str] = None, llm_client: Optional[LLMClient] = None,
+                 serializer: Optional[PromptSerializer] = None):
+        super().__init__(api_key, llm_client, serializer)
+        # Numeric metrics are computed locally; the model only judges qualitative fields
+        self.metrics = MetricsEngine()
         
     def summarize_project_status(self, project_data: Dict, audience: str = "team") -> str:
         """
         Create a summary tailored to specific audience
         audience: team, executive, stakeholder, technical
         """
-        prompt = f"""Create a {audience}-focused summary of this project:
-
-{json.dumps(project_data, indent=2)}
+        return self._run(self._summarize_project_status_request(project_data, audience))
+    
+    async def summarize_project_status_async(self, project_data: Dict, audience: str = "team") -> str:
+        """Async variant of summarize_project_status"""
+        return await self._run_async(self._summarize_project_status_request(project_data, audience))
+    
+    def _summarize_project_status_request(self, project_data: Dict, audience: str = "team") -> LLMRequest:
+        prompt = f"""Create a {audience}-focused summary of the project above.
 
 Tailor the summary for {audience} audience:
 - Team: Focus on tasks, progress, blockers, next steps
@@ -27,90 +40,52 @@ Tailor the summary for {audience} audience:
 
 Provide a clear, concise summary (2-3 paragraphs) that addresses their primary concerns."""
 
-        response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=2000,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        return response.content[0].text
+        return LLMRequest("summarize_project_status", prompt, max_tokens=2000, parse_json=False,
+                          context=self._snapshot(project_data, 'summarize_project_status'))
     
-    def aggregate_metrics(self, project_data: Dict) -> Dict:
+    def aggregate_metrics(self, project_data: Dict, current_date: Optional[str] = None,
+                          include_assessment: bool = False) -> Dict:
         """
         Aggregate key metrics from project data
+        Computed locally; include_assessment lets the model judge the qualitative fields
         """
-        prompt = f"""Aggregate key metrics from this project:
+        metrics = self.metrics.aggregate_metrics(project_data, current_date)
+        if include_assessment:
+            assessment = self._run(self._aggregate_metrics_assessment_request(project_data, metrics))
+            apply_assessment(metrics, assessment, AGGREGATE_QUALITATIVE_FIELDS)
+        return metrics
+    
+    async def aggregate_metrics_async(self, project_data: Dict, current_date: Optional[str] = None,
+                                      include_assessment: bool = False) -> Dict:
+        """Async variant of aggregate_metrics"""
+        metrics = await asyncio.to_thread(self.metrics.aggregate_metrics, project_data, current_date)
+        if include_assessment:
+            assessment = await self._run_async(self._aggregate_metrics_assessment_request(project_data, metrics))
+            apply_assessment(metrics, assessment, AGGREGATE_QUALITATIVE_FIELDS)
+        return metrics
+    
+    def _aggregate_metrics_assessment_request(self, project_data: Dict, metrics: Dict) -> LLMRequest:
+        prompt = f"""These metrics were computed for the project above:
 
-{json.dumps(project_data, indent=2)}
+{self.serializer.serialize(metrics)}
 
-Return comprehensive metrics:
-{{
-  "summary_metrics": {{
-    "total_tasks": number,
-    "completed_tasks": number,
-    "in_progress_tasks": number,
-    "blocked_tasks": number,
-    "completion_percentage": number,
-    "total_estimated_hours": number,
-    "hours_completed": number,
-    "hours_remaining": number,
-    "total_phases": number,
-    "completed_phases": number,
-    "total_milestones": number,
-    "achieved_milestones": number
-  }},
-  "timeline_metrics": {{
-    "project_start_date": "YYYY-MM-DD",
-    "current_date": "YYYY-MM-DD",
-    "planned_end_date": "YYYY-MM-DD",
-    "projected_end_date": "YYYY-MM-DD",
-    "elapsed_days": number,
-    "remaining_days": number,
-    "schedule_variance_days": number,
-    "on_schedule": boolean
-  }},
-  "performance_metrics": {{
-    "tasks_completed_per_week": number,
-    "average_task_completion_time": number,
-    "velocity_trend": "increasing|stable|decreasing",
-    "efficiency_score": number
-  }},
-  "quality_metrics": {{
-    "tasks_completed_on_time": number,
-    "tasks_completed_late": number,
-    "rework_percentage": number,
-    "quality_score": number
-  }},
-  "risk_metrics": {{
-    "total_risks": number,
-    "high_priority_risks": number,
-    "medium_priority_risks": number,
-    "low_priority_risks": number,
-    "overall_risk_level": "low|medium|high|critical"
-  }},
-  "resource_metrics": {{
-    "team_size": number,
-    "team_utilization_percentage": number,
-    "overtime_hours": number,
-    "resource_constraints": number
-  }}
-}}"""
+Judge only the qualitative fields, taking context the numbers miss into account."""
 
-        response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=3000,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        return self._parse_json_response(response.content[0].text)
+        return LLMRequest("aggregate_metrics_assessment", prompt, max_tokens=300, schema=MetricsAssessment,
+                          context=self._snapshot(project_data, 'aggregate_metrics', "Project"))
     
     def create_executive_brief(self, project_data: Dict, max_length: int = 250) -> str:
         """
         Create a very brief executive summary (elevator pitch style)
         """
-        prompt = f"""Create a brief executive summary (max {max_length} words) for:
-
-{json.dumps(project_data, indent=2)}
+        return self._run(self._create_executive_brief_request(project_data, max_length))
+    
+    async def create_executive_brief_async(self, project_data: Dict, max_length: int = 250) -> str:
+        """Async variant of create_executive_brief"""
+        return await self._run_async(self._create_executive_brief_request(project_data, max_length))
+    
+    def _create_executive_brief_request(self, project_data: Dict, max_length: int = 250) -> LLMRequest:
+        prompt = f"""Create a brief executive summary (max {max_length} words) for the project above.
 
 The summary should be suitable for a quick elevator pitch or email. Include:
 1. Project name and goal
@@ -121,159 +96,71 @@ The summary should be suitable for a quick elevator pitch or email. Include:
 
 Keep it concise, clear, and actionable."""
 
-        response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=1000,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        return response.content[0].text
+        return LLMRequest("create_executive_brief", prompt, max_tokens=1000, parse_json=False,
+                          context=self._snapshot(project_data, 'create_executive_brief'))
     
     def summarize_phase(self, phase_name: str, project_data: Dict) -> Dict:
         """
         Summarize a specific project phase
         """
-        prompt = f"""Summarize the phase: {phase_name}
-
-Project Data:
-{json.dumps(project_data, indent=2)}
-
-Return JSON:
-{{
-  "phase_summary": {{
-    "phase_name": "string",
-    "status": "not_started|in_progress|completed",
-    "completion_percentage": number,
-    "start_date": "YYYY-MM-DD or null",
-    "end_date": "YYYY-MM-DD or null",
-    "duration_weeks": number,
-    "overview": "string (2-3 sentences)"
-  }},
-  "tasks": {{
-    "total": number,
-    "completed": number,
-    "in_progress": number,
-    "not_started": number,
-    "blocked": number
-  }},
-  "milestones": [
-    {{
-      "name": "string",
-      "status": "achieved|pending|at_risk",
-      "date": "YYYY-MM-DD"
-    }}
-  ],
-  "key_deliverables": [
-    {{
-      "deliverable": "string",
-      "status": "completed|in_progress|not_started",
-      "quality": "excellent|good|needs_improvement"
-    }}
-  ],
-  "challenges": ["string"],
-  "achievements": ["string"],
-  "next_steps": ["string"],
-  "health_indicator": "green|yellow|red"
-}}"""
+        return self._run(self._summarize_phase_request(phase_name, project_data))
+    
+    async def summarize_phase_async(self, phase_name: str, project_data: Dict) -> Dict:
+        """Async variant of summarize_phase"""
+        return await self._run_async(self._summarize_phase_request(phase_name, project_data))
+    
+    def _summarize_phase_request(self, phase_name: str, project_data: Dict) -> LLMRequest:
+        prompt = f"Summarize the phase of the project above: {phase_name}"
 
-        response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=3000,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        return self._parse_json_response(response.content[0].text)
+        return LLMRequest("summarize_phase", prompt, max_tokens=3000, schema=PhaseSummary,
+                          context=self._snapshot(self.slicer.phase_slice(project_data, phase_name), 'summarize_phase'))
     
     def compare_progress_over_time(self, historical_data: List[Dict]) -> Dict:
         """
         Compare project progress over time using historical snapshots
         """
-        prompt = f"""Analyze progress over time from these snapshots:
-
-{json.dumps(historical_data, indent=2)}
-
-Return comparison analysis:
-{{
-  "trend_analysis": {{
-    "overall_trend": "accelerating|steady|slowing|stalled",
-    "completion_rate_trend": "improving|stable|declining",
-    "velocity_trend": "increasing|stable|decreasing"
-  }},
-  "period_comparisons": [
-    {{
-      "period": "string",
-      "tasks_completed": number,
-      "completion_percentage": number,
-      "velocity": number,
-      "issues_encountered": number
-    }}
-  ],
-  "notable_changes": [
-    {{
-      "change": "string",
-      "date": "YYYY-MM-DD",
-      "impact": "positive|negative|neutral",
-      "description": "string"
-    }}
-  ],
-  "predictions": {{
-    "projected_completion_date": "YYYY-MM-DD",
-    "confidence": "high|medium|low",
-    "based_on": "string"
-  }},
-  "recommendations": ["string"]
-}}"""
+        return self._run(self._compare_progress_over_time_request(historical_data))
+    
+    async def compare_progress_over_time_async(self, historical_data: List[Dict]) -> Dict:
+        """Async variant of compare_progress_over_time"""
+        return await self._run_async(self._compare_progress_over_time_request(historical_data))
+    
+    def _compare_progress_over_time_request(self, historical_data: List[Dict]) -> LLMRequest:
+        prompt = "Analyze progress over time from the snapshots above."
 
-        response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=3000,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        return self._parse_json_response(response.content[0].text)
+        return LLMRequest("compare_progress_over_time", prompt, max_tokens=3000, schema=ProgressComparison,
+                          context=self._snapshot(historical_data, label="Project Snapshots"))
     
     def generate_highlights(self, project_data: Dict, period: str = "this_week") -> List[str]:
         """
         Generate key highlights for a time period
         """
-        prompt = f"""Generate key highlights for {period}:
-
-{json.dumps(project_data, indent=2)}
-
-Return JSON:
-{{
-  "highlights": [
-    {{
-      "type": "achievement|milestone|completion|issue|risk",
-      "title": "string",
-      "description": "string (one sentence)",
-      "importance": "high|medium|low"
-    }}
-  ],
-  "top_3_achievements": ["string"],
-  "top_3_concerns": ["string"],
-  "key_decisions_made": ["string"],
-  "upcoming_focus_areas": ["string"]
-}}"""
+        return self._run(self._generate_highlights_request(project_data, period))
+    
+    async def generate_highlights_async(self, project_data: Dict, period: str = "this_week") -> List[str]:
+        """Async variant of generate_highlights"""
+        return await self._run_async(self._generate_highlights_request(project_data, period))
+    
+    def _generate_highlights_request(self, project_data: Dict, period: str = "this_week") -> LLMRequest:
+        prompt = f"Generate key highlights of the project above for {period}."
 
-        response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=2000,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        return self._parse_json_response(response.content[0].text)
+        return LLMRequest("generate_highlights", prompt, max_tokens=2000, schema=Highlights,
+                          context=self._snapshot(project_data, 'generate_highlights'))
     
     def create_stakeholder_update(self, project_data: Dict, stakeholder_interests: List[str]) -> str:
         """
         Create an update tailored to stakeholder interests
         """
+        return self._run(self._create_stakeholder_update_request(project_data, stakeholder_interests))
+    
+    async def create_stakeholder_update_async(self, project_data: Dict, stakeholder_interests: List[str]) -> str:
+        """Async variant of create_stakeholder_update"""
+        return await self._run_async(self._create_stakeholder_update_request(project_data, stakeholder_interests))
+    
+    def _create_stakeholder_update_request(self, project_data: Dict, stakeholder_interests: List[str]) -> LLMRequest:
         interests_str = ", ".join(stakeholder_interests)
         
-        prompt = f"""Create a stakeholder update focusing on: {interests_str}
-
-Project Data:
-{json.dumps(project_data, indent=2)}
+        prompt = f"""Create a stakeholder update on the project above focusing on: {interests_str}
 
 Write a professional update (3-4 paragraphs) that:
 1. Addresses stakeholder interests directly
@@ -284,71 +171,48 @@ Write a professional update (3-4 paragraphs) that:
 
 Tone: Professional, transparent, solution-oriented"""
 
-        response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=2000,
-            messages=[{"role": "user", "content": prompt}]
-        )
+        return LLMRequest("create_stakeholder_update", prompt, max_tokens=2000, parse_json=False,
+                          context=self._snapshot(project_data, 'create_stakeholder_update'))
+    
+    def summarize_conversation(self, previous_summary: str, messages: List[Dict]) -> str:
+        """
+        Fold chat turns into a rolling conversation summary
+        """
+        return self._run(self._summarize_conversation_request(previous_summary, messages))
+    
+    async def summarize_conversation_async(self, previous_summary: str, messages: List[Dict]) -> str:
+        """Async variant of summarize_conversation"""
+        return await self._run_async(self._summarize_conversation_request(previous_summary, messages))
+    
+    def _summarize_conversation_request(self, previous_summary: str, messages: List[Dict]) -> LLMRequest:
+        summary_str = f"Summary so far:\n{previous_summary}\n\n" if previous_summary else ""
+        transcript = "\n\n".join(f"{message['role'].title()}: {message['content']}" for message in messages)
         
-        return response.content[0].text
+        prompt = f"""{summary_str}Update the summary of this project management conversation with these turns:
+
+{transcript}
+
+Keep decisions made, project/task/milestone identifiers, dates, numbers, open questions and user preferences.
+Drop greetings and repetition. Write at most 200 words of plain prose."""
+
+        return LLMRequest("summarize_conversation", prompt, max_tokens=500, parse_json=False)
     
     def summarize_team_performance(self, project_data: Dict, team_data: Optional[Dict] = None) -> Dict:
         """
         Summarize team performance and contributions
         """
+        return self._run(self._summarize_team_performance_request(project_data, team_data))
+    
+    async def summarize_team_performance_async(self, project_data: Dict, team_data: Optional[Dict] = None) -> Dict:
+        """Async variant of summarize_team_performance"""
+        return await self._run_async(self._summarize_team_performance_request(project_data, team_data))
+    
+    def _summarize_team_performance_request(self, project_data: Dict, team_data: Optional[Dict] = None) -> LLMRequest:
         team_str = ""
         if team_data:
-            team_str = f"\n\nTeam Data:\n{json.dumps(team_data, indent=2)}"
+            team_str = f"\n\nTeam Data:\n{self.serializer.serialize(team_data)}"
         
-        prompt = f"""Summarize team performance:
+        prompt = f"Summarize team performance on the project above.{team_str}"
 
-Project Data:
-{json.dumps(project_data, indent=2)}{team_str}
-
-Return JSON:
-{{
-  "team_performance": {{
-    "overall_rating": "excellent|good|satisfactory|needs_improvement",
-    "productivity_level": "high|medium|low",
-    "collaboration_quality": "excellent|good|needs_improvement",
-    "velocity": number,
-    "velocity_trend": "increasing|stable|decreasing"
-  }},
-  "individual_contributions": [
-    {{
-      "member": "string",
-      "tasks_completed": number,
-      "contribution_level": "high|medium|low",
-      "key_achievements": ["string"],
-      "areas_for_growth": ["string"]
-    }}
-  ],
-  "team_strengths": ["string"],
-  "team_challenges": ["string"],
-  "morale_indicators": {{
-    "estimated_morale": "high|medium|low",
-    "indicators": ["string"]
-  }},
-  "recommendations": ["string"]
-}}"""
-
-        response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=3000,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        return self._parse_json_response(response.content[0].text)
-    
-    def _parse_json_response(self, text: str) -> Dict:
-        """Extract and parse JSON from Claude's response"""
-        try:
-            start_idx = text.find('{')
-            end_idx = text.rfind('}') + 1
-            if start_idx != -1 and end_idx > start_idx:
-                json_str = text[start_idx:end_idx]
-                return json.loads(json_str)
-        except Exception as e:
-            print(f"Error parsing JSON: {e}")
-        
-        return {"raw_response": text, "error": "Failed to parse JSON"}
\ No newline at end of file
+        return LLMRequest("summarize_team_performance", prompt, max_tokens=3000, schema=TeamPerformance,
+                          context=self._snapshot(project_data, 'summarize_team_performance'))
@@ -2,14 +2,31 @@
 Tracker Module
 Tracks project progress, task status, and milestone completion
 """
-from anthropic import Anthropic
 from typing import Dict, List, Optional
-from datetime import datetime, timedelta
-import json
-
-class ProgressTracker:
-    def __init__(self, api_key: str):
-        self.client = Anthropic(api_key=api_key)
+import asyncio
+import threading
+
+from .base import AgentModule
+from .burndown import BurndownEngine, record_status_event
+from .client import LLMClient, LLMRequest
+from .deadline_index import DeadlineIndex
+from .dependency_index import project_key
+from .metrics import MetricsEngine
+from .schemas import Blockers, MilestoneCompletion, TaskStatusUpdate
+from .serializer import PromptSerializer
+
+class ProgressTracker(AgentModule):
+    def __init__(self, api_key: Optional[str] = None, llm_client: Optional[LLMClient] = None,
+                 serializer: Optional[PromptSerializer] = None):
+        super().__init__(api_key, llm_client, serializer)
+        # Arithmetic metrics are computed locally instead of by the model
+        self.metrics = MetricsEngine()
+        self.burndown = BurndownEngine()
+        # Shared across projects; project key -> updated_at stamp it was indexed at
+        self.deadline_index = DeadlineIndex()
+        self._deadline_stamps: Dict[str, Optional[str]] = {}
+        # Status calls run on worker threads; the stamp check and reindex must be atomic
+        self._deadline_lock = threading.Lock()
         
     def update_task_status(self, task_id: str, status: str, project_data: Dict, 
                           notes: Optional[str] = None, actual_hours: Optional[float] = None) -> Dict:
@@ -17,351 +34,155 @@ class ProgressTracker:
         Update task status and analyze impact on project
         Status: not_started, in_progress, completed, blocked, at_risk
         """
+        return self._run(self._update_task_status_request(task_id, status, project_data, notes, actual_hours))
+    
+    async def update_task_status_async(self, task_id: str, status: str, project_data: Dict, 
+                                notes: Optional[str] = None, actual_hours: Optional[float] = None) -> Dict:
+        """Async variant of update_task_status"""
+        return await self._run_async(self._update_task_status_request(task_id, status, project_data, notes, actual_hours))
+    
+    def _update_task_status_request(self, task_id: str, status: str, project_data: Dict, 
+                                   notes: Optional[str] = None, actual_hours: Optional[float] = None) -> LLMRequest:
         prompt = f"""Task Update:
 - Task ID: {task_id}
 - New Status: {status}
 - Notes: {notes or 'None'}
 - Actual Hours: {actual_hours or 'Not provided'}
 
-Current Project State:
-{json.dumps(project_data, indent=2)}
-
-Analyze this update and provide:
+Analyze this update against the current project state above and provide:
 1. Impact on dependent tasks
 2. Impact on milestone dates
 3. Overall project completion percentage
 4. Whether this affects the critical path
-5. Recommended actions
-
-Return JSON:
-{{
-  "task_update": {{
-    "task_id": "string",
-    "previous_status": "string",
-    "new_status": "string",
-    "updated_at": "ISO timestamp"
-  }},
-  "impact_analysis": {{
-    "affected_tasks": [
-      {{
-        "task_id": "string",
-        "impact": "string",
-        "action_needed": "string"
-      }}
-    ],
-    "milestone_impact": [
-      {{
-        "milestone": "string",
-        "original_date": "YYYY-MM-DD",
-        "projected_date": "YYYY-MM-DD",
-        "delay_days": number
-      }}
-    ],
-    "critical_path_affected": boolean
-  }},
-  "project_metrics": {{
-    "completion_percentage": number,
-    "tasks_completed": number,
-    "tasks_in_progress": number,
-    "tasks_blocked": number,
-    "tasks_not_started": number
-  }},
-  "recommendations": ["string"],
-  "alerts": [
-    {{
-      "severity": "high|medium|low",
-      "message": "string"
-    }}
-  ]
-}}"""
+5. Recommended actions"""
 
-        response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=4000,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        return self._parse_json_response(response.content[0].text)
+        return LLMRequest("update_task_status", prompt, max_tokens=4000, schema=TaskStatusUpdate,
+                          context=self._snapshot(self.slicer.task_slice(project_data, task_id),
+                                                 'update_task_status', "Current Project State"))
     
-    def calculate_completion_percentage(self, project_data: Dict) -> Dict:
+    def calculate_completion_percentage(self, project_data: Dict, current_date: Optional[str] = None,
+                                        include_narrative: bool = False) -> Dict:
         """
         Calculate project completion based on tasks, milestones, and phases
+        Computed locally; include_narrative adds a short model-written commentary
         """
-        prompt = f"""Calculate completion metrics for this project:
+        metrics = self.metrics.completion(project_data, current_date)
+        if include_narrative:
+            metrics["narrative"] = self._run(self._completion_narrative_request(project_data, metrics))
+        return metrics
+    
+    async def calculate_completion_percentage_async(self, project_data: Dict, current_date: Optional[str] = None,
+                                                    include_narrative: bool = False) -> Dict:
+        """Async variant of calculate_completion_percentage"""
+        metrics = await asyncio.to_thread(self.metrics.completion, project_data, current_date)
+        if include_narrative:
+            metrics["narrative"] = await self._run_async(self._completion_narrative_request(project_data, metrics))
+        return metrics
+    
+    def _completion_narrative_request(self, project_data: Dict, metrics: Dict) -> LLMRequest:
+        prompt = f"""These completion metrics were computed for the project above:
 
-{json.dumps(project_data, indent=2)}
+{self.serializer.serialize(metrics)}
 
-Return detailed completion metrics in JSON:
-{{
-  "overall_completion": {{
-    "percentage": number,
-    "completed_tasks": number,
-    "total_tasks": number,
-    "completed_hours": number,
-    "total_estimated_hours": number
-  }},
-  "by_phase": [
-    {{
-      "phase_name": "string",
-      "completion_percentage": number,
-      "status": "not_started|in_progress|completed"
-    }}
-  ],
-  "by_priority": {{
-    "high": {{
-      "completed": number,
-      "total": number,
-      "percentage": number
-    }},
-    "medium": {{
-      "completed": number,
-      "total": number,
-      "percentage": number
-    }},
-    "low": {{
-      "completed": number,
-      "total": number,
-      "percentage": number
-    }}
-  }},
-  "milestone_progress": [
-    {{
-      "milestone": "string",
-      "completion_percentage": number,
-      "status": "achieved|on_track|at_risk|missed"
-    }}
-  ],
-  "velocity": {{
-    "tasks_per_week": number,
-    "hours_per_week": number,
-    "trend": "increasing|stable|decreasing"
-  }}
-}}"""
+Write a short narrative (3-5 sentences) interpreting the metrics: where progress is strong,
+what is lagging, and what to watch next. Do not restate every number."""
 
-        response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=3000,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        return self._parse_json_response(response.content[0].text)
+        return LLMRequest("completion_narrative", prompt, max_tokens=600, parse_json=False,
+                          context=self._snapshot(project_data, 'calculate_completion_percentage', "Project"))
     
     def monitor_deadlines(self, project_data: Dict, current_date: Optional[str] = None) -> Dict:
         """
         Monitor deadlines and identify overdue or at-risk items
+        Answered from the portfolio deadline index with bisect range queries
         """
-        if not current_date:
-            current_date = datetime.now().strftime("%Y-%m-%d")
-        
-        prompt = f"""Current Date: {current_date}
-
-Project Data:
-{json.dumps(project_data, indent=2)}
-
-Analyze deadlines and return JSON:
-{{
-  "overdue_tasks": [
-    {{
-      "task_id": "string",
-      "task_title": "string",
-      "deadline": "YYYY-MM-DD",
-      "days_overdue": number,
-      "priority": "string",
-      "impact": "string"
-    }}
-  ],
-  "at_risk_tasks": [
-    {{
-      "task_id": "string",
-      "task_title": "string",
-      "deadline": "YYYY-MM-DD",
-      "days_remaining": number,
-      "completion_percentage": number,
-      "risk_level": "high|medium|low",
-      "reason": "string"
-    }}
-  ],
-  "upcoming_deadlines": [
-    {{
-      "task_id": "string",
-      "task_title": "string",
-      "deadline": "YYYY-MM-DD",
-      "days_remaining": number,
-      "status": "string"
-    }}
-  ],
-  "milestone_status": [
-    {{
-      "milestone": "string",
-      "target_date": "YYYY-MM-DD",
-      "status": "on_track|at_risk|delayed",
-      "completion_percentage": number
-    }}
-  ],
-  "overall_schedule_health": {{
-    "status": "on_track|minor_delays|significant_delays|critical",
-    "on_time_percentage": number,
-    "average_delay_days": number
-  }},
-  "recommendations": ["string"]
-}}"""
-
-        response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=4000,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        return self._parse_json_response(response.content[0].text)
+        key = self._index_deadlines(project_data)
+        if key is None:
+            index = DeadlineIndex()
+            index.index_project("", project_data)
+            return index.report("", current_date)
+        return self.deadline_index.report(key, current_date)
+    
+    async def monitor_deadlines_async(self, project_data: Dict, current_date: Optional[str] = None) -> Dict:
+        """Async variant of monitor_deadlines; indexing runs on a worker thread"""
+        return await asyncio.to_thread(self.monitor_deadlines, project_data, current_date)
+    
+    def monitor_portfolio_deadlines(self, projects: List[Dict], current_date: Optional[str] = None) -> Dict:
+        """
+        Deadline report across every project; each item carries its project_id
+        """
+        for project_data in projects:
+            self._index_deadlines(project_data)
+        return self.deadline_index.report(None, current_date)
+    
+    def record_task_status(self, project_data: Dict, task_id: str, status: str):
+        """
+        Append the change to the project's status history (the burndown event log)
+        and apply it to the deadline index without reindexing the project
+        """
+        record_status_event(project_data, task_id, status)
+        key = project_key(project_data)
+        with self._deadline_lock:
+            if key in self._deadline_stamps:
+                self.deadline_index.set_task_status(key, task_id, status)
+                self._deadline_stamps[key] = project_data.get("updated_at")
+    
+    def _index_deadlines(self, project_data: Dict) -> Optional[str]:
+        """(Re)index a project when its updated_at changed; returns its key"""
+        key = project_key(project_data)
+        if key is None:
+            return None
+        stamp = project_data.get("updated_at")
+        with self._deadline_lock:
+            if key not in self._deadline_stamps or stamp is None or self._deadline_stamps[key] != stamp:
+                self.deadline_index.index_project(key, project_data)
+                self._deadline_stamps[key] = stamp
+        return key
     
     def track_milestone_completion(self, milestone_name: str, project_data: Dict) -> Dict:
         """
         Track completion of a specific milestone
         """
+        return self._run(self._track_milestone_completion_request(milestone_name, project_data))
+    
+    async def track_milestone_completion_async(self, milestone_name: str, project_data: Dict) -> Dict:
+        """Async variant of track_milestone_completion"""
+        return await self._run_async(self._track_milestone_completion_request(milestone_name, project_data))
+    
+    def _track_milestone_completion_request(self, milestone_name: str, project_data: Dict) -> LLMRequest:
         prompt = f"""Milestone: {milestone_name}
 
-Project Data:
-{json.dumps(project_data, indent=2)}
+Analyze the completion status of this milestone."""
 
-Analyze milestone completion:
-{{
-  "milestone": {{
-    "name": "string",
-    "target_date": "YYYY-MM-DD",
-    "actual_completion_date": "YYYY-MM-DD or null",
-    "status": "completed|in_progress|not_started"
-  }},
-  "completion_criteria": [
-    {{
-      "criterion": "string",
-      "met": boolean,
-      "evidence": "string"
-    }}
-  ],
-  "associated_tasks": [
-    {{
-      "task_id": "string",
-      "title": "string",
-      "status": "string",
-      "completion_percentage": number
-    }}
-  ],
-  "completion_percentage": number,
-  "blockers": ["string"],
-  "next_steps": ["string"],
-  "ready_to_mark_complete": boolean,
-  "recommendation": "string"
-}}"""
-
-        response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=3000,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        return self._parse_json_response(response.content[0].text)
+        return LLMRequest("track_milestone_completion", prompt, max_tokens=3000, schema=MilestoneCompletion,
+                          context=self._snapshot(self.slicer.milestone_slice(project_data, milestone_name),
+                                                 'track_milestone_completion'))
     
     def identify_blockers(self, project_data: Dict) -> List[Dict]:
         """
         Identify blockers and bottlenecks in the project
         """
-        prompt = f"""Analyze this project for blockers and bottlenecks:
-
-{json.dumps(project_data, indent=2)}
-
-Return JSON:
-{{
-  "blockers": [
-    {{
-      "blocker_id": "string",
-      "type": "technical|resource|dependency|external",
-      "description": "string",
-      "affected_tasks": ["task_id"],
-      "severity": "high|medium|low",
-      "estimated_delay": "string",
-      "resolution_strategies": ["string"],
-      "owner": "string or null"
-    }}
-  ],
-  "bottlenecks": [
-    {{
-      "type": "resource|skill|process",
-      "description": "string",
-      "impact": "string",
-      "mitigation": "string"
-    }}
-  ],
-  "dependencies_at_risk": [
-    {{
-      "dependency": "string",
-      "risk": "string",
-      "contingency_plan": "string"
-    }}
-  ]
-}}"""
+        return self._run(self._identify_blockers_request(project_data))
+    
+    async def identify_blockers_async(self, project_data: Dict) -> List[Dict]:
+        """Async variant of identify_blockers"""
+        return await self._run_async(self._identify_blockers_request(project_data))
+    
+    def _identify_blockers_request(self, project_data: Dict) -> LLMRequest:
+        prompt = "Analyze the project above for blockers and bottlenecks."
 
-        response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=3000,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        return self._parse_json_response(response.content[0].text)
+        return LLMRequest("identify_blockers", prompt, max_tokens=3000, schema=Blockers,
+                          context=self._snapshot(project_data, 'identify_blockers'))
     
-    def generate_burndown_data(self, project_data: Dict, historical_data: Optional[List] = None) -> Dict:
+    def generate_burndown_data(self, project_data: Dict, historical_data: Optional[List] = None,
+                               current_date: Optional[str] = None) -> Dict:
         """
         Generate burndown chart data
+        Replayed locally from status change events: historical_data if given,
+        otherwise the project's recorded status_history
         """
-        prompt = f"""Generate burndown chart data for this project:
-
-{json.dumps(project_data, indent=2)}
-
-Historical Data:
-{json.dumps(historical_data or [], indent=2)}
-
-Return JSON:
-{{
-  "burndown": {{
-    "total_tasks": number,
-    "total_hours": number,
-    "data_points": [
-      {{
-        "date": "YYYY-MM-DD",
-        "remaining_tasks": number,
-        "remaining_hours": number,
-        "completed_tasks": number,
-        "completed_hours": number
-      }}
-    ],
-    "ideal_line": [
-      {{
-        "date": "YYYY-MM-DD",
-        "ideal_remaining": number
-      }}
-    ],
-    "projected_completion_date": "YYYY-MM-DD",
-    "on_track": boolean,
-    "variance_percentage": number
-  }}
-}}"""
-
-        response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=3000,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        return self._parse_json_response(response.content[0].text)
+        return self.burndown.build(project_data, historical_data, current_date)
     
-    def _parse_json_response(self, text: str) -> Dict:
-        """Extract and parse JSON from Claude's response"""
-        try:
-            start_idx = text.find('{')
-            end_idx = text.rfind('}') + 1
-            if start_idx != -1 and end_idx > start_idx:
-                json_str = text[start_idx:end_idx]
-                return json.loads(json_str)
-        except Exception as e:
-            print(f"Error parsing JSON: {e}")
-        
-        return {"raw_response": text, "error": "Failed to parse JSON"}
\ No newline at end of file
+    async def generate_burndown_data_async(self, project_data: Dict, historical_data: Optional[List] = None,
+                                           current_date: Optional[str] = None) -> Dict:
+        """Async variant of generate_burndown_data; the replay runs on a worker thread"""
+        return await asyncio.to_thread(self.generate_burndown_data, project_data, historical_data, current_date)
@@ -2,10 +2,11 @@
 Project Management Agent API - MOCK MODE
 FastAPI backend with mock responses
 """
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, List, Optional
+import asyncio
 import json
 import os
 from dotenv import load_dotenv
@@ -14,6 +15,8 @@ from pathlib import Path
 
 # Import only what you need from models
 from api.models import ProjectCreate, TaskUpdate
+from storage import AsyncProjectRepository, ProjectQuery, create_repository, project_fields
+from storage.query import DEFAULT_LIMIT, DEFAULT_SORT, MAX_LIMIT
 
 load_dotenv()
 
@@ -28,14 +31,30 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# In-memory storage
-projects_db = {}
+# Project storage (STORAGE_BACKEND / DATABASE_PATH), opened on first use; calls run off the event loop
+_repository: Optional[AsyncProjectRepository] = None
 active_connections: Dict[str, WebSocket] = {}
 
+# Fields returned by GET /api/projects unless `fields` asks for more (phases and plan are left out)
+SUMMARY_FIELDS = (
+    "id", "project_id", "name", "description", "goals", "status", "health_indicator",
+    "completion_percentage", "start_date", "deadline", "created_at", "updated_at",
+    "team_members", "budget"
+)
+
 # Helper Functions
 def generate_id():
     return f"proj_{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
 
+def get_repository() -> AsyncProjectRepository:
+    global _repository
+    if _repository is None:
+        _repository = AsyncProjectRepository(create_repository())
+    return _repository
+
+def split_csv(value: Optional[str]) -> List[str]:
+    return [item.strip() for item in (value or "").split(",") if item.strip()]
+
 def generate_mock_plan(project_name: str, goals: List[str]) -> dict:
     """Generate a mock project plan without calling AI"""
     return {
@@ -154,6 +173,17 @@ The project "{project_data['name']}" is currently in {project_data['status']} st
 
 # REST API Endpoints
 
+@app.on_event("startup")
+async def open_repository():
+    await asyncio.to_thread(get_repository)
+
+@app.on_event("shutdown")
+async def close_repository():
+    global _repository
+    if _repository is not None:
+        await _repository.aclose()
+        _repository = None
+
 @app.get("/")
 async def root():
     return {
@@ -188,31 +218,67 @@ async def create_project(project: ProjectCreate):
             "plan": plan
         }
         
-        projects_db[project_id] = project_dict
+        await get_repository().save(project_dict)
         
-        return {"project_id": project_id, "project": projects_db[project_id]}
+        return {"project_id": project_id, "project": project_dict}
     except Exception as e:
         print(f"Error creating project: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/projects/{project_id}")
 async def get_project(project_id: str):
-    if project_id not in projects_db:
+    project = await get_repository().get(project_id)
+    if project is None:
         raise HTTPException(status_code=404, detail="Project not found")
-    return projects_db[project_id]
+    return project
 
 @app.get("/api/projects")
-async def list_projects():
-    return {"projects": list(projects_db.values())}
+async def list_projects(
+    status: Optional[str] = None,
+    health_indicator: Optional[str] = None,
+    deadline_from: Optional[str] = None,
+    deadline_to: Optional[str] = None,
+    team_member: Optional[str] = None,
+    sort: str = DEFAULT_SORT,
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    cursor: Optional[str] = None,
+    fields: str = "summary"
+):
+    """
+    One page of projects. status and health_indicator take comma-separated
+    values; deadline_from / deadline_to are inclusive ISO dates; sort is a
+    field name, "-" prefixed for descending. fields is "summary", "all" or
+    a comma-separated list. Pass next_cursor back as cursor for the next page.
+    """
+    if fields == "summary":
+        selected = SUMMARY_FIELDS
+    elif fields == "all":
+        selected = None
+    else:
+        selected = split_csv(fields)
+    try:
+        query = ProjectQuery(
+            statuses=split_csv(status), health_indicators=split_csv(health_indicator),
+            deadline_from=deadline_from, deadline_to=deadline_to, team_member=team_member,
+            sort=sort, limit=limit, cursor=cursor, fields=selected
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    page = await get_repository().query(query)
+    return {
+        "projects": [project_fields(project, selected) for project in page.projects],
+        "next_cursor": page.next_cursor,
+        "total": page.total
+    }
 
 @app.get("/api/projects/{project_id}/report")
 async def generate_report(project_id: str, report_type: str = "weekly"):
     """Generate mock status report"""
-    if project_id not in projects_db:
+    project_data = await get_repository().get(project_id)
+    if project_data is None:
         raise HTTPException(status_code=404, detail="Project not found")
     
     try:
-        project_data = projects_db[project_id]
         report = generate_mock_report(project_data)
         
         # Save report to file for PDF export
@@ -254,11 +320,43 @@ async def download_report(filename: str):
 
 @app.delete("/api/projects/{project_id}")
 async def delete_project(project_id: str):
-    if project_id not in projects_db:
+    if not await get_repository().delete(project_id):
         raise HTTPException(status_code=404, detail="Project not found")
-    del projects_db[project_id]
     return {"message": "Project deleted successfully"}
 
+# Streaming helpers
+STREAM_CHUNK_WORDS = 3
+
+async def mock_deltas(text: str) -> AsyncIterator[str]:
+    """Yield a canned response a few words at a time, like a streamed completion"""
+    words = text.split(" ")
+    for i in range(0, len(words), STREAM_CHUNK_WORDS):
+        chunk = " ".join(words[i:i + STREAM_CHUNK_WORDS])
+        yield chunk + (" " if i + STREAM_CHUNK_WORDS < len(words) else "")
+        await asyncio.sleep(0)
+
+async def stream_to_websocket(websocket: WebSocket, deltas: AsyncIterator[str],
+                              usage: Optional[Dict] = None, kind: str = "chat") -> str:
+    """
+    Send a reply as message_start, delta... and message_end frames
+    message_end repeats the full text and carries the final usage
+    """
+    message_id = f"msg_{datetime.now().strftime('%Y%m%d%H%M%S%f')}"
+    await websocket.send_json({"type": "message_start", "message_id": message_id, "kind": kind})
+    parts = []
+    async for text in deltas:
+        parts.append(text)
+        await websocket.send_json({"type": "delta", "message_id": message_id, "text": text})
+    response = "".join(parts)
+    await websocket.send_json({
+        "type": "message_end",
+        "message_id": message_id,
+        "kind": kind,
+        "response": response,
+        "usage": usage or {"input_tokens": 0, "output_tokens": 0}
+    })
+    return response
+
 # WebSocket Endpoint with Smart Responses
 @app.websocket("/ws/{session_id}")
 async def websocket_endpoint(websocket: WebSocket, session_id: str):
@@ -273,6 +371,15 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
         
         while True:
             data = await websocket.receive_json()
+            
+            if data.get("type") == "report":
+                project = await get_repository().get(str(data.get("project_id")))
+                if project is None:
+                    await websocket.send_json({"type": "error", "message": "Project not found"})
+                else:
+                    await stream_to_websocket(websocket, mock_deltas(generate_mock_report(project)), kind="report")
+                continue
+            
             message = data.get("message", "").lower()
             
             # Smart responses based on keywords
@@ -363,11 +470,7 @@ I'm here to help! Try asking:
 For AI-powered intelligent responses, add credits at:
 https://console.anthropic.com/settings/billing"""
             
-            await websocket.send_json({
-                "type": "message",
-                "response": response,
-                "usage": {"input_tokens": 0, "output_tokens": 0}
-            })
+            await stream_to_websocket(websocket, mock_deltas(response))
             
     except WebSocketDisconnect:
         if session_id in active_connections:
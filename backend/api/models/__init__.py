@@ -6,7 +6,8 @@ Exports all Pydantic models
 from .project import Project, ProjectCreate, ProjectUpdate, Phase, ProjectStatus, HealthIndicator
 from .task import Task, TaskCreate, TaskUpdate, TaskStatus, Priority
 from .milestone import Milestone, MilestoneCreate, MilestoneStatus
-from .report import Report, ReportCreate, Risk, MetricsSummary, RiskLevel
+from .report import Report, ReportCreate, Risk, MetricsSummary
+from agent.domain import RiskLevel
 
 __all__ = [
     # Project models
@@ -7,6 +7,8 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime
 from enum import Enum
 
+from agent.domain import HealthIndicator
+
 class ProjectStatus(str, Enum):
     PLANNING = "planning"
     ACTIVE = "active"
@@ -14,11 +16,6 @@ class ProjectStatus(str, Enum):
     COMPLETED = "completed"
     CANCELLED = "cancelled"
 
-class HealthIndicator(str, Enum):
-    GREEN = "green"
-    YELLOW = "yellow"
-    RED = "red"
-
 class Phase(BaseModel):
     phase_number: int
     name: str
@@ -5,33 +5,8 @@ Report Models
 from pydantic import BaseModel, Field
 from typing import List, Optional
 from datetime import datetime
-from enum import Enum
 
-class RiskLevel(str, Enum):
-    LOW = "low"
-    MEDIUM = "medium"
-    HIGH = "high"
-    CRITICAL = "critical"
-
-class HealthIndicator(str, Enum):
-    GREEN = "green"
-    YELLOW = "yellow"
-    RED = "red"
-
-class Risk(BaseModel):
-    risk_id: str
-    category: str
-    description: str
-    probability: RiskLevel
-    impact: RiskLevel
-    risk_score: int
-    mitigation_strategy: Optional[str] = None
-    contingency_plan: Optional[str] = None
-    owner: Optional[str] = None
-    status: str = "identified"
-    
-    class Config:
-        use_enum_values = True
+from agent.domain import HealthIndicator, Risk
 
 class MetricsSummary(BaseModel):
     total_tasks: int
@@ -0,0 +1,40 @@
+"""
+Storage Package
+Project persistence behind a repository interface
+"""
+from pathlib import Path
+from typing import Optional
+import os
+
+from .base import ProjectRepository, AsyncProjectRepository
+from .query import ProjectQuery, ProjectPage, project_fields
+from .memory import InMemoryProjectRepository
+from .sqlite import SQLiteProjectRepository
+
+# Anchored to the backend directory so the location does not depend on the working directory
+DEFAULT_DATABASE_PATH = str(Path(__file__).resolve().parent.parent / "data" / "projects.db")
+
+
+def create_repository(backend: Optional[str] = None, path: Optional[str] = None) -> ProjectRepository:
+    """
+    Repository chosen by STORAGE_BACKEND ("sqlite", the default, or "memory"),
+    with the SQLite file at DATABASE_PATH
+    """
+    backend = (backend or os.getenv("STORAGE_BACKEND") or "sqlite").strip().lower()
+    if backend == "memory":
+        return InMemoryProjectRepository()
+    if backend == "sqlite":
+        return SQLiteProjectRepository(path or os.getenv("DATABASE_PATH") or DEFAULT_DATABASE_PATH)
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+
+__all__ = [
+    'ProjectRepository',
+    'AsyncProjectRepository',
+    'InMemoryProjectRepository',
+    'SQLiteProjectRepository',
+    'ProjectQuery',
+    'ProjectPage',
+    'project_fields',
+    'create_repository',
+]
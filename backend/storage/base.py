@@ -0,0 +1,94 @@
+"""
+Base Module
+Repository interface for project persistence
+"""
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+import asyncio
+import functools
+
+from .query import ProjectPage, ProjectQuery, paginate
+
+
+class ProjectRepository(ABC):
+    """
+    Stores project documents (the dicts the API serves) by project_id.
+
+    Implementations are synchronous and thread-safe; use
+    AsyncProjectRepository to call them from the event loop.
+    """
+
+    @abstractmethod
+    def get(self, project_id: str) -> Optional[Dict]:
+        ...
+
+    @abstractmethod
+    def list(self) -> List[Dict]:
+        """Every project, most recently created first"""
+
+    def query(self, query: ProjectQuery) -> ProjectPage:
+        """One filtered, sorted page of projects"""
+        return paginate(self.list(), query)
+
+    @abstractmethod
+    def save(self, project: Dict) -> Dict:
+        """Insert or replace a project; returns it"""
+
+    @abstractmethod
+    def save_many(self, projects: Iterable[Dict]) -> int:
+        """Insert or replace several projects in one write; returns how many"""
+
+    @abstractmethod
+    def delete(self, project_id: str) -> bool:
+        """Remove a project; False if it did not exist"""
+
+    def exists(self, project_id: str) -> bool:
+        return self.get(project_id) is not None
+
+    def close(self):
+        pass
+
+
+class AsyncProjectRepository:
+    """
+    Async facade over a ProjectRepository: every call runs on a worker thread
+    so database I/O never blocks the event loop
+    """
+
+    def __init__(self, repository: ProjectRepository, max_workers: int = 4):
+        self.repository = repository
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="repository")
+
+    async def _call(self, method, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(method, *args))
+
+    async def get(self, project_id: str) -> Optional[Dict]:
+        return await self._call(self.repository.get, project_id)
+
+    async def list(self) -> List[Dict]:
+        return await self._call(self.repository.list)
+
+    async def query(self, query: ProjectQuery) -> ProjectPage:
+        return await self._call(self.repository.query, query)
+
+    async def save(self, project: Dict) -> Dict:
+        return await self._call(self.repository.save, project)
+
+    async def save_many(self, projects: Iterable[Dict]) -> int:
+        return await self._call(self.repository.save_many, list(projects))
+
+    async def delete(self, project_id: str) -> bool:
+        return await self._call(self.repository.delete, project_id)
+
+    async def exists(self, project_id: str) -> bool:
+        return await self._call(self.repository.exists, project_id)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self.repository.close()
+
+    async def aclose(self):
+        """close() without blocking the event loop while writes drain"""
+        await asyncio.to_thread(self.close)
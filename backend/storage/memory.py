@@ -0,0 +1,65 @@
+"""
+Memory Module
+In-process project repository for tests and single-worker development
+"""
+from typing import Dict, Iterable, List, Optional
+import copy
+import threading
+
+from .base import ProjectRepository
+from .query import ProjectPage, ProjectQuery, paginate
+
+
+class InMemoryProjectRepository(ProjectRepository):
+    """
+    Dict-backed repository. Projects are deep-copied on the way in and out,
+    so callers cannot mutate stored state by accident (matching SQLite).
+    Nothing survives a restart or is shared between workers.
+    """
+
+    def __init__(self):
+        self._projects: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def get(self, project_id: str) -> Optional[Dict]:
+        with self._lock:
+            project = self._projects.get(project_id)
+            return copy.deepcopy(project) if project is not None else None
+
+    def list(self) -> List[Dict]:
+        with self._lock:
+            projects = [copy.deepcopy(project) for project in self._projects.values()]
+        return sorted(projects, key=lambda project: project.get("created_at") or "", reverse=True)
+
+    def query(self, query: ProjectQuery) -> ProjectPage:
+        # Page the stored dicts and copy only what is returned
+        with self._lock:
+            page = paginate(list(self._projects.values()), query)
+            page.projects = [copy.deepcopy(project) for project in page.projects]
+        return page
+
+    def save(self, project: Dict) -> Dict:
+        self.save_many([project])
+        return project
+
+    def save_many(self, projects: Iterable[Dict]) -> int:
+        copies = [copy.deepcopy(project) for project in projects]
+        with self._lock:
+            for project in copies:
+                self._projects[_project_id(project)] = project
+        return len(copies)
+
+    def delete(self, project_id: str) -> bool:
+        with self._lock:
+            return self._projects.pop(project_id, None) is not None
+
+    def exists(self, project_id: str) -> bool:
+        with self._lock:
+            return project_id in self._projects
+
+
+def _project_id(project: Dict) -> str:
+    project_id = project.get("project_id") or project.get("id")
+    if not project_id:
+        raise ValueError("Project has no project_id")
+    return str(project_id)
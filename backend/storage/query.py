@@ -0,0 +1,160 @@
+"""
+Query Module
+Filtering, sorting and cursor pagination for project listings
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import base64
+import binascii
+import json
+
+DEFAULT_SORT = "-created_at"
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+# Sortable fields and how their values compare; missing or mistyped values sort lowest
+TEXT_SORT = "text"
+NUMBER_SORT = "number"
+SORT_KEYS = {
+    "created_at": TEXT_SORT,
+    "updated_at": TEXT_SORT,
+    "deadline": TEXT_SORT,
+    "start_date": TEXT_SORT,
+    "name": TEXT_SORT,
+    "status": TEXT_SORT,
+    "completion_percentage": NUMBER_SORT,
+}
+TEXT_FLOOR = ""
+NUMBER_FLOOR = -1e308
+
+# Top-level fields held in child tables rather than on the project row
+CHILD_FIELDS = ("phases", "plan", "tasks")
+
+
+@dataclass
+class ProjectQuery:
+    """
+    One page of a project listing. Filters combine with AND; statuses and
+    health_indicators match any of their values. Deadline bounds are
+    inclusive and compare ISO strings on the bound's precision, so
+    deadline_to="2024-05-01" includes "2024-05-01T17:00". `sort` is a
+    SORT_KEYS name, prefixed with "-" for descending. `fields` names the
+    top-level fields the caller needs (None for whole documents), letting
+    repositories skip loading the rest.
+    """
+    statuses: Sequence[str] = ()
+    health_indicators: Sequence[str] = ()
+    deadline_from: Optional[str] = None
+    deadline_to: Optional[str] = None
+    team_member: Optional[str] = None
+    sort: str = DEFAULT_SORT
+    limit: int = DEFAULT_LIMIT
+    cursor: Optional[str] = None
+    fields: Optional[Sequence[str]] = None
+
+    def __post_init__(self):
+        if self.sort_key not in SORT_KEYS:
+            raise ValueError(f"Unknown sort key: {self.sort_key} (expected one of {', '.join(SORT_KEYS)})")
+        if not 1 <= self.limit <= MAX_LIMIT:
+            raise ValueError(f"limit must be between 1 and {MAX_LIMIT}")
+        # Decode eagerly so a bad cursor fails before any I/O
+        self.after = self._decode_cursor() if self.cursor else None
+
+    @property
+    def sort_key(self) -> str:
+        return self.sort.lstrip("-")
+
+    @property
+    def descending(self) -> bool:
+        return self.sort.startswith("-")
+
+    @property
+    def needs_children(self) -> bool:
+        return self.fields is None or any(name in self.fields for name in CHILD_FIELDS)
+
+    #  MATCHING
+
+    def matches(self, project: Dict) -> bool:
+        if self.statuses and project.get("status") not in self.statuses:
+            return False
+        if self.health_indicators and project.get("health_indicator") not in self.health_indicators:
+            return False
+        if self.deadline_from is not None or self.deadline_to is not None:
+            deadline = project.get("deadline")
+            if not isinstance(deadline, str):
+                return False
+            if self.deadline_from is not None and deadline[:len(self.deadline_from)] < self.deadline_from:
+                return False
+            if self.deadline_to is not None and deadline[:len(self.deadline_to)] > self.deadline_to:
+                return False
+        if self.team_member is not None:
+            members = project.get("team_members")
+            if not isinstance(members, list) or self.team_member not in members:
+                return False
+        return True
+
+    def sort_value(self, project: Dict) -> Any:
+        value = project.get(self.sort_key)
+        if SORT_KEYS[self.sort_key] == NUMBER_SORT:
+            return value if isinstance(value, (int, float)) and not isinstance(value, bool) else NUMBER_FLOOR
+        return value if isinstance(value, str) else TEXT_FLOOR
+
+    def position(self, project: Dict) -> Tuple[Any, str]:
+        """Where a project falls in the ordering: (sort value, project_id)"""
+        return self.sort_value(project), str(project.get("project_id") or project.get("id"))
+
+    def is_after_cursor(self, project: Dict) -> bool:
+        if self.after is None:
+            return True
+        position = self.position(project)
+        return position < self.after if self.descending else position > self.after
+
+    #  CURSORS
+
+    def cursor_for(self, project: Dict) -> str:
+        """Opaque cursor resuming the listing after `project`"""
+        value, project_id = self.position(project)
+        payload = json.dumps({"sort": self.sort, "value": value, "id": project_id}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+    def _decode_cursor(self) -> Tuple[Any, str]:
+        try:
+            padded = self.cursor + "=" * (-len(self.cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+            value, project_id, sort = payload["value"], payload["id"], payload["sort"]
+        except (ValueError, KeyError, TypeError, binascii.Error):
+            raise ValueError("Invalid cursor")
+        if sort != self.sort:
+            raise ValueError("Cursor was issued for a different sort order")
+        # A tampered value must not reach comparisons or SQL bind parameters
+        if SORT_KEYS[self.sort_key] == NUMBER_SORT:
+            valid = isinstance(value, (int, float)) and not isinstance(value, bool)
+        else:
+            valid = isinstance(value, str)
+        if not valid or not isinstance(project_id, str):
+            raise ValueError("Invalid cursor")
+        return value, project_id
+
+
+@dataclass
+class ProjectPage:
+    projects: List[Dict] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    total: int = 0
+
+
+def paginate(projects: List[Dict], query: ProjectQuery) -> ProjectPage:
+    """Filter, order and page a full project list in Python"""
+    matching = [project for project in projects if query.matches(project)]
+    matching.sort(key=query.position, reverse=query.descending)
+    remaining = [project for project in matching if query.is_after_cursor(project)]
+    page = remaining[:query.limit]
+    next_cursor = query.cursor_for(page[-1]) if len(remaining) > query.limit else None
+    return ProjectPage(page, next_cursor, len(matching))
+
+
+def project_fields(project: Dict, fields: Optional[Sequence[str]]) -> Dict:
+    """A project reduced to `fields` (always keeping its ids)"""
+    if fields is None:
+        return project
+    return {key: value for key, value in project.items() if key in fields or key in ("id", "project_id")}
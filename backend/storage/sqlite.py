@@ -0,0 +1,528 @@
+"""
+SQLite Module
+Project repository on SQLite: WAL mode, normalized tables, pooled readers and a batching writer
+"""
+from concurrent.futures import Future
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import json
+import queue
+import sqlite3
+import threading
+
+from .base import ProjectRepository
+from .query import NUMBER_FLOOR, NUMBER_SORT, SORT_KEYS, TEXT_FLOOR, ProjectPage, ProjectQuery
+
+SCHEMA_VERSION = 1
+
+TEXT = "TEXT"
+NUMBER = "NUMERIC"
+
+# Fields stored in their own columns; everything else goes to the row's JSON `extra`
+PROJECT_COLUMNS = (
+    ("name", TEXT), ("description", TEXT), ("status", TEXT), ("health_indicator", TEXT),
+    ("completion_percentage", NUMBER), ("start_date", TEXT), ("deadline", TEXT), ("budget", NUMBER),
+    ("created_at", TEXT), ("updated_at", TEXT),
+)
+MEMBER_COLUMNS = (("member", TEXT),)
+PHASE_COLUMNS = (
+    ("phase_number", NUMBER), ("name", TEXT), ("description", TEXT), ("status", TEXT),
+    ("duration_weeks", NUMBER), ("start_date", TEXT), ("end_date", TEXT), ("completion_percentage", NUMBER),
+)
+MILESTONE_COLUMNS = (("name", TEXT), ("target_week", NUMBER), ("target_date", TEXT), ("status", TEXT))
+TASK_COLUMNS = (
+    ("task_id", TEXT), ("title", TEXT), ("status", TEXT), ("priority", TEXT), ("assignee", TEXT),
+    ("estimated_hours", NUMBER), ("actual_hours", NUMBER), ("deadline", TEXT), ("start_date", TEXT),
+    ("end_date", TEXT),
+)
+
+# Phase index of tasks kept directly on the project rather than in a phase
+PROJECT_LEVEL = -1
+
+# Markers inside `extra`: a non-dict list item, the child lists a record had, and
+# plan.phases when it duplicates the project's phases
+PLAIN_VALUE = "$value"
+CHILD_KEYS = "$children"
+PHASES_REF = "$phases"
+
+
+def _columns_sql(columns: Sequence[Tuple[str, str]]) -> str:
+    return "".join(f", {name} {kind}" for name, kind in columns)
+
+
+def _names(columns: Sequence[Tuple[str, str]]) -> str:
+    return "".join(f", {name}" for name, _ in columns)
+
+
+def _placeholders(count: int) -> str:
+    return ", ".join("?" * count)
+
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS projects (
+    project_id TEXT PRIMARY KEY{_columns_sql(PROJECT_COLUMNS)},
+    extra TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS project_members (
+    project_id TEXT NOT NULL REFERENCES projects(project_id) ON DELETE CASCADE,
+    position INTEGER NOT NULL{_columns_sql(MEMBER_COLUMNS)},
+    extra TEXT NOT NULL,
+    PRIMARY KEY (project_id, position)
+);
+CREATE TABLE IF NOT EXISTS phases (
+    project_id TEXT NOT NULL REFERENCES projects(project_id) ON DELETE CASCADE,
+    phase_index INTEGER NOT NULL{_columns_sql(PHASE_COLUMNS)},
+    extra TEXT NOT NULL,
+    PRIMARY KEY (project_id, phase_index)
+);
+CREATE TABLE IF NOT EXISTS milestones (
+    project_id TEXT NOT NULL REFERENCES projects(project_id) ON DELETE CASCADE,
+    phase_index INTEGER NOT NULL,
+    position INTEGER NOT NULL{_columns_sql(MILESTONE_COLUMNS)},
+    extra TEXT NOT NULL,
+    PRIMARY KEY (project_id, phase_index, position)
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    project_id TEXT NOT NULL REFERENCES projects(project_id) ON DELETE CASCADE,
+    phase_index INTEGER NOT NULL,
+    position INTEGER NOT NULL{_columns_sql(TASK_COLUMNS)},
+    extra TEXT NOT NULL,
+    PRIMARY KEY (project_id, phase_index, position)
+);
+CREATE INDEX IF NOT EXISTS idx_projects_status ON projects (status);
+CREATE INDEX IF NOT EXISTS idx_projects_deadline ON projects (deadline);
+CREATE INDEX IF NOT EXISTS idx_projects_created ON projects (created_at);
+CREATE INDEX IF NOT EXISTS idx_members_member ON project_members (member);
+CREATE INDEX IF NOT EXISTS idx_tasks_task_id ON tasks (project_id, task_id);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status);
+CREATE INDEX IF NOT EXISTS idx_tasks_assignee ON tasks (assignee);
+"""
+
+# Statements are fixed strings so each connection's statement cache reuses them prepared
+INSERT_PROJECT = (f"INSERT OR REPLACE INTO projects (project_id{_names(PROJECT_COLUMNS)}, extra) "
+                  f"VALUES ({_placeholders(len(PROJECT_COLUMNS) + 2)})")
+INSERT_MEMBER = (f"INSERT INTO project_members (project_id, position{_names(MEMBER_COLUMNS)}, extra) "
+                 f"VALUES ({_placeholders(len(MEMBER_COLUMNS) + 3)})")
+INSERT_PHASE = (f"INSERT INTO phases (project_id, phase_index{_names(PHASE_COLUMNS)}, extra) "
+                f"VALUES ({_placeholders(len(PHASE_COLUMNS) + 3)})")
+INSERT_MILESTONE = (f"INSERT INTO milestones (project_id, phase_index, position{_names(MILESTONE_COLUMNS)}, extra) "
+                    f"VALUES ({_placeholders(len(MILESTONE_COLUMNS) + 4)})")
+INSERT_TASK = (f"INSERT INTO tasks (project_id, phase_index, position{_names(TASK_COLUMNS)}, extra) "
+               f"VALUES ({_placeholders(len(TASK_COLUMNS) + 4)})")
+DELETE_PROJECT = "DELETE FROM projects WHERE project_id = ?"
+# Children are cleared explicitly before a replace (INSERT OR REPLACE does not cascade)
+DELETE_CHILDREN = tuple(
+    f"DELETE FROM {table} WHERE project_id = ?" for table in ("project_members", "phases", "milestones", "tasks")
+)
+
+SELECT_PROJECTS = f"SELECT project_id{_names(PROJECT_COLUMNS)}, extra FROM projects"
+SELECT_MEMBERS = f"SELECT project_id, position{_names(MEMBER_COLUMNS)}, extra FROM project_members"
+SELECT_PHASES = f"SELECT project_id, phase_index{_names(PHASE_COLUMNS)}, extra FROM phases"
+SELECT_MILESTONES = f"SELECT project_id, phase_index, position{_names(MILESTONE_COLUMNS)}, extra FROM milestones"
+SELECT_TASKS = f"SELECT project_id, phase_index, position{_names(TASK_COLUMNS)}, extra FROM tasks"
+BY_PROJECT = " WHERE project_id = ?"
+
+
+class SQLiteProjectRepository(ProjectRepository):
+    """
+    Projects normalized into projects / project_members / phases / milestones /
+    tasks tables in one SQLite file, shareable by several worker processes.
+
+    The database runs in WAL mode, so readers never block the writer. Reads
+    use a small pool of connections, each in a snapshot transaction. All
+    writes go through one writer thread, which commits every write queued
+    at that moment in a single transaction; callers still block until their
+    own write is durable, so a save is visible to the next read.
+    """
+
+    def __init__(self, path: str = "data/projects.db", pool_size: int = 4,
+                 batch_size: int = 64, busy_timeout_ms: int = 5000):
+        if path == ":memory:":
+            raise ValueError("Use InMemoryProjectRepository for a non-persistent store")
+        self.path = Path(path)
+        self.pool_size = pool_size
+        self.batch_size = batch_size
+        self.busy_timeout_ms = busy_timeout_ms
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._readers: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._reader_count = 0
+        self._reader_lock = threading.Lock()
+
+        with self._connection() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                conn.executescript(SCHEMA)
+                conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+        self._writes: "queue.Queue[Optional[Tuple[str, Any, Future]]]" = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="sqlite-writer", daemon=True)
+        self._writer.start()
+        self._closed = False
+
+    #  CONNECTIONS
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode; transactions are opened explicitly
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None,
+                               cached_statements=128)
+        conn.execute(f"PRAGMA busy_timeout={int(self.busy_timeout_ms)}")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    @contextmanager
+    def _connection(self):
+        conn = self._connect()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _reader(self):
+        """A pooled connection holding a read snapshot for the duration of the block"""
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            with self._reader_lock:
+                create = self._reader_count < self.pool_size
+                if create:
+                    self._reader_count += 1
+            conn = self._connect() if create else self._readers.get()
+        try:
+            conn.execute("BEGIN")
+            try:
+                yield conn
+            finally:
+                conn.execute("COMMIT")
+        finally:
+            self._readers.put(conn)
+
+    #  READS
+
+    def get(self, project_id: str) -> Optional[Dict]:
+        with self._reader() as conn:
+            projects = _load(conn, BY_PROJECT, (project_id,))
+        return projects[0] if projects else None
+
+    def list(self) -> List[Dict]:
+        with self._reader() as conn:
+            projects = _load(conn, "", ())
+        return sorted(projects, key=lambda project: project.get("created_at") or "", reverse=True)
+
+    def query(self, query: ProjectQuery) -> ProjectPage:
+        """Filtered and ordered in SQL; children are loaded for the returned page only"""
+        where, params = _filters(query)
+        column = query.sort_key
+        floor = NUMBER_FLOOR if SORT_KEYS[column] == NUMBER_SORT else TEXT_FLOOR
+        key = f"COALESCE({column}, ?)"
+        page_where, page_params = list(where), list(params)
+        if query.after is not None:
+            value, project_id = query.after
+            op = "<" if query.descending else ">"
+            page_where.append(f"({key} {op} ? OR ({key} = ? AND project_id {op} ?))")
+            page_params += [floor, value, floor, value, project_id]
+        direction = "DESC" if query.descending else "ASC"
+        clause = " WHERE " + " AND ".join(page_where) if page_where else ""
+        page_sql = (f"SELECT project_id FROM projects{clause} "
+                    f"ORDER BY {key} {direction}, project_id {direction} LIMIT ?")
+        count_sql = "SELECT COUNT(*) FROM projects" + (" WHERE " + " AND ".join(where) if where else "")
+
+        with self._reader() as conn:
+            total = conn.execute(count_sql, params).fetchone()[0]
+            ids = [row[0] for row in conn.execute(page_sql, [*page_params, floor, query.limit + 1])]
+            has_more = len(ids) > query.limit
+            ids = ids[:query.limit]
+            loaded = {}
+            if ids:
+                in_ids = f" WHERE project_id IN ({_placeholders(len(ids))})"
+                for project in _load(conn, in_ids, tuple(ids), children=query.needs_children):
+                    loaded[str(project.get("project_id") or project.get("id"))] = project
+        projects = [loaded[project_id] for project_id in ids if project_id in loaded]
+        next_cursor = query.cursor_for(projects[-1]) if has_more and projects else None
+        return ProjectPage(projects, next_cursor, total)
+
+    def exists(self, project_id: str) -> bool:
+        with self._reader() as conn:
+            return conn.execute("SELECT 1 FROM projects" + BY_PROJECT, (project_id,)).fetchone() is not None
+
+    #  WRITES
+
+    def save(self, project: Dict) -> Dict:
+        self.save_many([project])
+        return project
+
+    def save_many(self, projects: Iterable[Dict]) -> int:
+        rows = [_project_rows(project) for project in projects]
+        if rows:
+            self._submit("save", rows)
+        return len(rows)
+
+    def delete(self, project_id: str) -> bool:
+        return self._submit("delete", project_id)
+
+    def _submit(self, operation: str, payload: Any) -> Any:
+        if self._closed:
+            raise RuntimeError("Repository is closed")
+        future: Future = Future()
+        self._writes.put((operation, payload, future))
+        return future.result()
+
+    def _write_loop(self):
+        conn = self._connect()
+        try:
+            while True:
+                item = self._writes.get()
+                if item is None:
+                    return
+                batch = [item]
+                # Everything already queued joins this transaction
+                while len(batch) < self.batch_size:
+                    try:
+                        item = self._writes.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        self._commit(conn, batch)
+                        return
+                    batch.append(item)
+                self._commit(conn, batch)
+        finally:
+            conn.close()
+
+    def _commit(self, conn: sqlite3.Connection, batch: List[Tuple[str, Any, Future]]):
+        try:
+            results = self._apply(conn, batch)
+        except Exception:
+            # Retry one by one so a single bad write does not fail its neighbours
+            for item in batch:
+                try:
+                    result = self._apply(conn, [item])[0]
+                except Exception as e:
+                    item[2].set_exception(e)
+                else:
+                    item[2].set_result(result)
+            return
+        for item, result in zip(batch, results):
+            item[2].set_result(result)
+
+    @staticmethod
+    def _apply(conn: sqlite3.Connection, batch: List[Tuple[str, Any, Future]]) -> List[Any]:
+        results = []
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for operation, payload, _ in batch:
+                if operation == "save":
+                    for rows in payload:
+                        _write_project(conn, rows)
+                    results.append(len(payload))
+                else:
+                    results.append(conn.execute(DELETE_PROJECT, (payload,)).rowcount > 0)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return results
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._writes.put(None)
+        self._writer.join()
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+#  ROW ENCODING
+
+def _fits(value: Any, kind: str) -> bool:
+    if kind == NUMBER:
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    return isinstance(value, str)
+
+
+def _split(item: Any, columns: Sequence[Tuple[str, str]], children: Sequence[str] = ()) -> Tuple[List, Dict]:
+    """Column values and the leftover fields of one record"""
+    if not isinstance(item, dict):
+        return [None] * len(columns), {PLAIN_VALUE: item}
+    values = []
+    extra = {}
+    for name, kind in columns:
+        value = item.get(name)
+        if value is not None and _fits(value, kind):
+            values.append(value)
+        else:
+            values.append(None)
+            if name in item:
+                extra[name] = value
+    names = {name for name, _ in columns}
+    for key, value in item.items():
+        if key not in names and key not in children:
+            extra[key] = value
+    present = [key for key in children if key in item]
+    if present:
+        extra[CHILD_KEYS] = present
+    return values, extra
+
+
+def _join(values: Sequence, columns: Sequence[Tuple[str, str]], extra_json: str) -> Tuple[Any, List[str]]:
+    """Inverse of _split: the record and the child lists it had"""
+    extra = json.loads(extra_json)
+    if PLAIN_VALUE in extra:
+        return extra[PLAIN_VALUE], []
+    item = {name: value for (name, _), value in zip(columns, values) if value is not None}
+    children = extra.pop(CHILD_KEYS, [])
+    item.update(extra)
+    return item, children
+
+
+def _dumps(extra: Dict) -> str:
+    return json.dumps(extra, separators=(",", ":"), default=str)
+
+
+def _project_rows(project: Dict) -> Dict[str, List[tuple]]:
+    """Every row of one project, ready for executemany"""
+    project_id = project.get("project_id") or project.get("id")
+    if not project_id:
+        raise ValueError("Project has no project_id")
+    project_id = str(project_id)
+
+    phases = project.get("phases") if isinstance(project.get("phases"), list) else None
+    values, extra = _split(project, PROJECT_COLUMNS, ("phases", "team_members", "tasks"))
+    plan = extra.get("plan")
+    if phases is not None and isinstance(plan, dict) and plan.get("phases") == phases:
+        extra["plan"] = {**plan, "phases": PHASES_REF}
+    rows = {"project": [(project_id, *values, _dumps(extra))], "members": [], "phases": [],
+            "milestones": [], "tasks": []}
+
+    members = project.get("team_members")
+    for position, member in enumerate(members if isinstance(members, list) else []):
+        if isinstance(member, str):
+            rows["members"].append((project_id, position, member, "{}"))
+        else:
+            rows["members"].append((project_id, position, None, _dumps({PLAIN_VALUE: member})))
+
+    for phase_index, phase in enumerate(phases or []):
+        values, extra = _split(phase, PHASE_COLUMNS, ("milestones", "tasks"))
+        rows["phases"].append((project_id, phase_index, *values, _dumps(extra)))
+        if isinstance(phase, dict):
+            _child_rows(rows, project_id, phase_index, phase)
+
+    tasks = project.get("tasks")
+    if isinstance(tasks, list):
+        _child_rows(rows, project_id, PROJECT_LEVEL, {"tasks": tasks})
+    # Lists that are not lists (or are missing) survive as plain extra fields
+    for key in ("phases", "team_members", "tasks"):
+        if key in project and not isinstance(project[key], list):
+            extra = json.loads(rows["project"][0][-1])
+            extra[key] = project[key]
+            extra[CHILD_KEYS] = [child for child in extra.get(CHILD_KEYS, []) if child != key]
+            rows["project"][0] = (*rows["project"][0][:-1], _dumps(extra))
+    return rows
+
+
+def _child_rows(rows: Dict[str, List[tuple]], project_id: str, phase_index: int, parent: Dict):
+    for key, columns, table in (("milestones", MILESTONE_COLUMNS, "milestones"), ("tasks", TASK_COLUMNS, "tasks")):
+        items = parent.get(key)
+        for position, item in enumerate(items if isinstance(items, list) else []):
+            values, extra = _split(item, columns)
+            rows[table].append((project_id, phase_index, position, *values, _dumps(extra)))
+
+
+def _write_project(conn: sqlite3.Connection, rows: Dict[str, List[tuple]]):
+    project_id = rows["project"][0][0]
+    for statement in DELETE_CHILDREN:
+        conn.execute(statement, (project_id,))
+    conn.execute(INSERT_PROJECT, rows["project"][0])
+    conn.executemany(INSERT_MEMBER, rows["members"])
+    conn.executemany(INSERT_PHASE, rows["phases"])
+    conn.executemany(INSERT_MILESTONE, rows["milestones"])
+    conn.executemany(INSERT_TASK, rows["tasks"])
+
+
+def _filters(query: ProjectQuery) -> Tuple[List[str], List]:
+    """SQL conditions on the projects table equivalent to ProjectQuery.matches"""
+    where: List[str] = []
+    params: List = []
+    for column, values in (("status", query.statuses), ("health_indicator", query.health_indicators)):
+        if values:
+            where.append(f"{column} IN ({_placeholders(len(values))})")
+            params += list(values)
+    if query.deadline_from is not None:
+        where.append("substr(deadline, 1, ?) >= ?")
+        params += [len(query.deadline_from), query.deadline_from]
+    if query.deadline_to is not None:
+        where.append("substr(deadline, 1, ?) <= ?")
+        params += [len(query.deadline_to), query.deadline_to]
+    if query.team_member is not None:
+        where.append("project_id IN (SELECT project_id FROM project_members WHERE member = ?)")
+        params.append(query.team_member)
+    return where, params
+
+
+def _load(conn: sqlite3.Connection, where: str, params: tuple, children: bool = True) -> List[Dict]:
+    """
+    Projects matching `where` (a clause on project_id) with their children.
+    Without `children`, phases, milestones and tasks are not read (nor restored).
+    """
+    projects: Dict[str, Dict] = {}
+    child_keys: Dict[str, List[str]] = {}
+    for row in conn.execute(SELECT_PROJECTS + where, params):
+        project, keys = _join(row[1:-1], PROJECT_COLUMNS, row[-1])
+        project.setdefault("project_id", row[0])
+        projects[row[0]] = project
+        child_keys[row[0]] = keys
+    if not projects:
+        return []
+
+    members: Dict[str, List] = {}
+    for row in conn.execute(SELECT_MEMBERS + where + " ORDER BY project_id, position", params):
+        if row[0] in projects:
+            extra = json.loads(row[-1])
+            members.setdefault(row[0], []).append(row[2] if row[2] is not None else extra.get(PLAIN_VALUE))
+    for project_id, project in projects.items():
+        if "team_members" in child_keys[project_id]:
+            project["team_members"] = members.get(project_id, [])
+    if not children:
+        return list(projects.values())
+
+    phases: Dict[str, Dict[int, Dict]] = {}
+    phase_keys: Dict[Tuple[str, int], List[str]] = {}
+    for row in conn.execute(SELECT_PHASES + where + " ORDER BY project_id, phase_index", params):
+        if row[0] in projects:
+            phase, keys = _join(row[2:-1], PHASE_COLUMNS, row[-1])
+            phases.setdefault(row[0], {})[row[1]] = phase
+            phase_keys[(row[0], row[1])] = keys
+
+    grouped: Dict[Tuple[str, int, str], List] = {}
+    for key, columns, select in (("milestones", MILESTONE_COLUMNS, SELECT_MILESTONES),
+                                 ("tasks", TASK_COLUMNS, SELECT_TASKS)):
+        for row in conn.execute(select + where + " ORDER BY project_id, phase_index, position", params):
+            if row[0] in projects:
+                item, _ = _join(row[3:-1], columns, row[-1])
+                grouped.setdefault((row[0], row[1], key), []).append(item)
+
+    for project_id, project in projects.items():
+        keys = child_keys[project_id]
+        project_phases = phases.get(project_id, {})
+        phase_list = []
+        for phase_index in sorted(project_phases):
+            phase = project_phases[phase_index]
+            if isinstance(phase, dict):
+                for key in phase_keys[(project_id, phase_index)]:
+                    phase[key] = grouped.get((project_id, phase_index, key), [])
+            phase_list.append(phase)
+        if "phases" in keys:
+            project["phases"] = phase_list
+        if "tasks" in keys:
+            project["tasks"] = grouped.get((project_id, PROJECT_LEVEL, "tasks"), [])
+        plan = project.get("plan")
+        if isinstance(plan, dict) and plan.get("phases") == PHASES_REF:
+            project["plan"] = {**plan, "phases": project.get("phases", [])}
+    return list(projects.values())
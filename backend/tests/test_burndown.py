@@ -0,0 +1,73 @@
+"""
+Tests for the event-replay burndown engine
+"""
+from agent.burndown import BurndownEngine, record_status_event
+
+
+def project(**extra) -> dict:
+    data = {
+        "start_date": "2024-03-01",
+        "deadline": "2024-03-05",
+        "phases": [{"name": "Build", "tasks": [
+            {"task_id": "a", "estimated_hours": 4, "status": "completed"},
+            {"task_id": "b", "estimated_hours": 6, "status": "in_progress"},
+            {"task_id": "c", "estimated_hours": 10, "status": "not_started"},
+        ]}],
+    }
+    data.update(extra)
+    return data
+
+
+def test_record_status_event_appends_normalized_event():
+    data = project()
+    event = record_status_event(data, "a", "In Progress", "2024-03-02T09:00:00")
+    assert event == {"task_id": "a", "status": "in_progress", "timestamp": "2024-03-02T09:00:00"}
+    assert data["status_history"] == [event]
+
+
+def test_replay_counts_reopened_tasks_as_remaining():
+    data = project()
+    record_status_event(data, "a", "completed", "2024-03-02T10:00:00")
+    record_status_event(data, "b", "completed", "2024-03-03T10:00:00")
+    record_status_event(data, "b", "in_progress", "2024-03-04T10:00:00")
+
+    burndown = BurndownEngine().build(data, current_date="2024-03-04")["burndown"]
+    assert burndown["total_tasks"] == 3
+    assert burndown["total_hours"] == 20
+    points = burndown["data_points"]
+    assert [point["date"] for point in points] == ["2024-03-01", "2024-03-02", "2024-03-03", "2024-03-04"]
+    assert [point["remaining_tasks"] for point in points] == [3, 2, 1, 2]
+    assert [point["completed_hours"] for point in points] == [0, 4, 10, 4]
+
+
+def test_events_argument_overrides_recorded_history():
+    data = project()
+    record_status_event(data, "a", "completed", "2024-03-02")
+    events = [{"task_id": "c", "status": "completed", "timestamp": "2024-03-03"},
+              {"task_id": "unknown", "status": "completed", "timestamp": "2024-03-03"}]
+
+    points = BurndownEngine().build(data, events=events, current_date="2024-03-03")["burndown"]["data_points"]
+    # "a" has no event here, so it falls back to today as its completion day
+    assert [point["completed_tasks"] for point in points] == [0, 0, 2]
+    assert points[-1]["remaining_hours"] == 6
+
+
+def test_ideal_line_reaches_zero_at_deadline():
+    burndown = BurndownEngine().build(project(), events=[], current_date="2024-03-02")["burndown"]
+    ideal = burndown["ideal_line"]
+    assert ideal[0] == {"date": "2024-03-01", "ideal_remaining": 3}
+    assert ideal[-1] == {"date": "2024-03-05", "ideal_remaining": 0}
+
+
+def test_start_without_dates_uses_earliest_change():
+    data = project(start_date=None)
+    events = [{"task_id": "a", "status": "completed", "timestamp": "2024-03-03"}]
+    points = BurndownEngine().build(data, events=events, current_date="2024-03-04")["burndown"]["data_points"]
+    assert points[0]["date"] == "2024-03-03"
+    assert len(points) == 2
+
+
+def test_future_start_is_capped_at_today():
+    data = project(start_date="2024-04-01")
+    burndown = BurndownEngine().build(data, events=[], current_date="2024-03-10")["burndown"]
+    assert [point["date"] for point in burndown["data_points"]] == ["2024-03-10"]
@@ -0,0 +1,97 @@
+"""
+Tests for the agent facade, run against the synthesizing fake backend
+"""
+import threading
+
+import pytest
+
+from agent.core import ProjectManagementAgent
+from agent.fake_backend import MODE_SYNTHESIZE, FakeLLMBackend
+
+PROJECT = {
+    "project_id": "proj_1",
+    "name": "Demo",
+    "start_date": "2024-01-01",
+    "updated_at": "1",
+    "phases": [{"name": "Build", "tasks": [
+        {"task_id": "t1", "title": "Set up", "status": "completed", "deadline": "2024-01-10"},
+        {"task_id": "t2", "title": "Ship", "status": "not_started", "deadline": "2024-02-01",
+         "dependencies": ["t1"]},
+    ]}]
+}
+
+
+@pytest.fixture
+def agent() -> ProjectManagementAgent:
+    backend = FakeLLMBackend(mode=MODE_SYNTHESIZE)
+    return ProjectManagementAgent("fake-key", llm_client=backend.client())
+
+
+@pytest.mark.parametrize("parallel", [True, False])
+def test_project_status_shape_does_not_depend_on_parallel(agent, parallel):
+    status = agent.get_project_status(PROJECT, parallel=parallel)
+    assert set(status) == {"completion", "deadline_status", "blockers", "metrics", "partial", "failed_sections"}
+    assert status["partial"] is False
+
+
+@pytest.mark.parametrize("parallel", [True, False])
+def test_failed_section_becomes_error_marker(agent, parallel, monkeypatch):
+    def fail(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(agent.tracker, "identify_blockers", fail)
+    status = agent.get_project_status(PROJECT, parallel=parallel)
+    assert status["partial"] is True
+    assert status["failed_sections"] == ["blockers"]
+    assert status["blockers"] == {"error": "boom", "error_type": "exception"}
+
+
+def test_sequential_create_project_flags_failures(agent, monkeypatch):
+    def fail(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(agent.planner, "estimate_resources", fail)
+    stages = []
+    result = agent.create_project("Build a demo", parallel=False, on_stage=lambda name, _: stages.append(name))
+    assert result["failed_sections"] == ["resources"]
+    assert {"timeline", "resources", "critical_path"} <= set(stages)
+
+
+def test_failed_chat_leaves_history_alternating(agent, monkeypatch):
+    agent.chat("hello there")
+
+    def fail(request):
+        raise RuntimeError("upstream down")
+
+    monkeypatch.setattr(agent.client, "complete", fail)
+    with pytest.raises(RuntimeError):
+        agent.chat("what is blocked?")
+    assert [message["role"] for message in agent.memory.messages] == ["user", "assistant"]
+
+
+async def test_failed_chat_async_leaves_history_alternating(agent, monkeypatch):
+    async def fail(request):
+        raise RuntimeError("upstream down")
+
+    monkeypatch.setattr(agent.client, "complete_async", fail)
+    with pytest.raises(RuntimeError):
+        await agent.chat_async("what is blocked?")
+    assert agent.memory.messages == []
+
+
+async def test_async_metrics_run_off_the_event_loop(agent, monkeypatch):
+    loop_thread = threading.get_ident()
+    threads = []
+
+    def record(engine_method):
+        def wrapper(*args, **kwargs):
+            threads.append(threading.get_ident())
+            return engine_method(*args, **kwargs)
+        return wrapper
+
+    monkeypatch.setattr(agent.summarizer.metrics, "aggregate_metrics", record(agent.summarizer.metrics.aggregate_metrics))
+    monkeypatch.setattr(agent.report_generator.metrics, "dashboard", record(agent.report_generator.metrics.dashboard))
+    await agent.summarizer.aggregate_metrics_async(PROJECT)
+    await agent.report_generator.generate_metrics_dashboard_async(PROJECT)
+    assert len(threads) == 2
+    assert loop_thread not in threads
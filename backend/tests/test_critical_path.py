@@ -0,0 +1,67 @@
+"""
+Tests for the CPM critical path engine
+"""
+import pytest
+
+from agent.critical_path import CriticalPathEngine, DependencyCycleError
+from agent.planner import ProjectPlanner
+
+
+def plan(*tasks) -> dict:
+    return {"phases": [{"name": "Build", "tasks": [
+        {"task_id": task_id, "title": task_id.upper(), "estimated_hours": hours, "dependencies": deps}
+        for task_id, hours, deps in tasks
+    ]}]}
+
+
+DIAMOND = plan(
+    ("a", 4, []),
+    ("b", 10, ["a"]),
+    ("c", 2, ["a"]),
+    ("d", 3, ["b", "c"]),
+)
+
+
+def test_critical_path_and_slack():
+    result = CriticalPathEngine().analyze(DIAMOND)
+    assert [item["task_id"] for item in result["critical_path"]] == ["a", "b", "d"]
+    assert result["project_duration_hours"] == 17
+    assert result["task_slack"] == {"a": 0, "b": 0, "c": 8, "d": 0}
+
+
+def test_parallel_groups_and_bottlenecks():
+    result = CriticalPathEngine().analyze(DIAMOND)
+    assert result["parallel_opportunities"][0]["tasks"] == ["b", "c"]
+    assert result["bottlenecks"][0].startswith("a (A) gates 2 downstream tasks")
+
+
+def test_unknown_dependencies_are_reported():
+    result = CriticalPathEngine().analyze(plan(("a", 1, ["missing"]), ("b", 2, ["a", "b"])))
+    assert result["unknown_dependencies"] == [{"task_id": "a", "dependency": "missing"}]
+    assert result["project_duration_hours"] == 3
+
+
+def test_cycle_raises_with_path():
+    cyclic = plan(("a", 1, ["c"]), ("b", 1, ["a"]), ("c", 1, ["b"]), ("d", 1, []))
+    with pytest.raises(DependencyCycleError) as error:
+        CriticalPathEngine().analyze(cyclic)
+    cycle = error.value.cycle
+    assert cycle[0] == cycle[-1]
+    assert set(cycle) == {"a", "b", "c"}
+
+
+def test_planner_reports_cycle_instead_of_raising():
+    result = ProjectPlanner(api_key="test").identify_critical_path(plan(("a", 1, ["b"]), ("b", 1, ["a"])))
+    assert result["critical_path"] == []
+    assert "cycle" in result
+
+
+async def test_async_variant_matches_sync():
+    planner = ProjectPlanner(api_key="test")
+    assert await planner.identify_critical_path_async(DIAMOND) == planner.identify_critical_path(DIAMOND)
+
+
+def test_empty_plan():
+    result = CriticalPathEngine().analyze({"phases": []})
+    assert result["critical_path"] == []
+    assert result["project_duration_hours"] == 0
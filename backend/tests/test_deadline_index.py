@@ -0,0 +1,109 @@
+"""
+Tests for the portfolio deadline index
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from agent.deadline_index import MILESTONE, TASK, DeadlineIndex
+from agent.tracker import ProgressTracker
+
+
+def make_project(project_id: str, tasks: int = 30, updated_at: str = "1") -> dict:
+    return {
+        "project_id": project_id,
+        "start_date": "2024-01-01",
+        "updated_at": updated_at,
+        "phases": [{
+            "name": "Build",
+            "milestones": [{"name": "Launch", "target_date": "2024-03-01"}],
+            "tasks": [
+                {"task_id": f"{project_id}-t{i}", "title": f"Task {i}", "status": "not_started",
+                 "deadline": f"2024-02-{i % 28 + 1:02d}"}
+                for i in range(tasks)
+            ]
+        }]
+    }
+
+
+def test_overdue_and_upcoming():
+    index = DeadlineIndex()
+    index.index_project("p1", make_project("p1", tasks=3))
+    report = index.report("p1", "2024-02-02")
+    assert [item["task_id"] for item in report["overdue_tasks"]] == ["p1-t0"]
+    assert [item["task_id"] for item in report["upcoming_deadlines"]] == ["p1-t1", "p1-t2"]
+
+
+def test_set_task_status_updates_milestone_progress():
+    index = DeadlineIndex()
+    index.index_project("p1", make_project("p1", tasks=2))
+    index.set_task_status("p1", "p1-t0", "completed")
+    milestone = index.report("p1", "2024-02-01")["milestone_status"][0]
+    assert milestone["completion_percentage"] == 50.0
+
+
+def test_reindex_replaces_project():
+    index = DeadlineIndex()
+    index.index_project("p1", make_project("p1", tasks=5))
+    index.index_project("p2", make_project("p2", tasks=5))
+    index.index_project("p1", make_project("p1", tasks=2))
+    assert len(index.between(None, None, "p1", TASK)) == 2
+    assert len(index.between(None, None, "p2", TASK)) == 5
+    index.remove_project("p1")
+    assert index.between(None, None, "p1") == []
+    assert len(index) == 6
+
+
+def test_between_bounds_are_inclusive():
+    index = DeadlineIndex()
+    index.index_project("p1", make_project("p1", tasks=5))
+    found = index.between(date(2024, 2, 2), date(2024, 2, 4), kind=TASK)
+    assert [entry.item_id for entry in found] == ["p1-t1", "p1-t2", "p1-t3"]
+    assert [entry.kind for entry in index.between(None, None, kind=MILESTONE)] == [MILESTONE]
+
+
+def test_project_queries_match_portfolio_queries():
+    index = DeadlineIndex()
+    for project_id in ("p1", "p2", "p3"):
+        index.index_project(project_id, make_project(project_id, tasks=10))
+    index.remove_task("p2", "p2-t3")
+    index.upsert_task("p2", {"task_id": "p2-t4", "deadline": "2024-02-20"})
+    start, end = date(2024, 2, 3), date(2024, 2, 21)
+    for project_id in ("p1", "p2", "p3"):
+        portfolio = [entry for entry in index.between(start, end) if entry.project_id == project_id]
+        assert index.between(start, end, project_id) == portfolio
+    assert index.between(None, None, "missing") == []
+    assert {item["project_id"] for item in index.report("p2", "2024-02-05")["overdue_tasks"]} == {"p2"}
+
+
+def test_concurrent_reindexing():
+    index = DeadlineIndex()
+
+    def work(worker: int):
+        for round_ in range(40):
+            project_id = f"p{(worker + round_) % 4}"
+            index.index_project(project_id, make_project(project_id, tasks=20 + round_ % 5))
+            index.set_task_status(project_id, f"{project_id}-t1", "completed")
+            index.report(None, "2024-02-10")
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        list(pool.map(work, range(6)))
+
+    # Keys and entries stay in step, so every key resolves
+    entries = index.between(None, None)
+    assert len(entries) == len(index)
+    assert len({(entry.project_id, entry.item_id) for entry in entries}) == len(entries)
+
+
+def test_tracker_concurrent_monitor_deadlines():
+    tracker = ProgressTracker(api_key="test")
+
+    def work(worker: int):
+        for round_ in range(30):
+            project_id = f"p{round_ % 3}"
+            project = make_project(project_id, tasks=25, updated_at=f"{worker}-{round_}")
+            tracker.monitor_deadlines(project, "2024-02-10")
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        list(pool.map(work, range(6)))
+    report = tracker.monitor_portfolio_deadlines([], "2024-02-10")
+    assert {item["project_id"] for item in report["upcoming_deadlines"]} == {"p0", "p1", "p2"}
@@ -0,0 +1,71 @@
+"""
+Tests for the task dependency index
+"""
+from agent.dependency_index import DependencyIndex
+from agent.executor import TaskExecutor
+
+
+def make_index() -> DependencyIndex:
+    return DependencyIndex.from_project({
+        "phases": [{"tasks": [
+            {"task_id": "a", "title": "A", "status": "completed"},
+            {"task_id": "b", "title": "B", "status": "not_started", "dependencies": ["a"]},
+            {"task_id": "c", "title": "C", "status": "not_started", "dependencies": ["a", "b"]},
+            {"task_id": "d", "title": "D", "status": "not_started", "dependencies": ["ghost"]},
+        ]}]
+    })
+
+
+def test_validate_prerequisites():
+    index = make_index()
+    assert index.validate("b")["ready_to_execute"] is True
+    result = index.validate("c")
+    assert result["can_start"] is False
+    assert result["missing_prerequisites"] == ["b"]
+    assert index.validate("d")["missing_prerequisites"] == ["ghost (unknown task)"]
+
+
+def test_set_status_unblocks_dependents():
+    index = make_index()
+    assert index.set_status("b", "completed") is True
+    assert index.validate("c")["can_start"] is True
+    assert index.dependents_of("a") == ["b", "c"]
+
+
+def test_set_status_ignores_unknown_ids():
+    index = make_index()
+    version = index.version
+    assert index.set_status("typo", "completed") is False
+    assert index.version == version
+    assert "typo" not in index
+    assert index.validate("typo")["can_start"] is False
+    assert "typo" not in index.validate_all()["tasks"]
+
+
+def test_upsert_and_remove_keep_reverse_edges():
+    index = make_index()
+    index.upsert_task({"task_id": "c", "status": "not_started", "dependencies": ["b"]})
+    assert index.dependents_of("a") == ["b"]
+    index.remove_task("b")
+    assert "b" not in index
+    assert index.validate("c")["missing_prerequisites"] == ["b (unknown task)"]
+    assert index.dependents_of("a") == []
+
+
+def test_executor_keeps_recently_used_indexes_only():
+    executor = TaskExecutor(api_key="test", max_dependency_indexes=2)
+    projects = [
+        {"project_id": f"p{i}", "updated_at": "1", "phases": [{"tasks": [
+            {"task_id": "a"}, {"task_id": "b", "dependencies": ["a"]}
+        ]}]}
+        for i in range(3)
+    ]
+    first = executor.dependency_index(projects[0])
+    executor.dependency_index(projects[1])
+    assert executor.dependency_index(projects[0]) is first
+    executor.dependency_index(projects[2])
+    assert list(executor._dependency_indexes) == ["p0", "p2"]
+
+    executor.record_task_status(projects[0], "a", "completed")
+    assert executor.dependency_index(projects[0]) is first
+    assert first.validate("b")["can_start"] is True
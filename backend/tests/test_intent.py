@@ -0,0 +1,32 @@
+"""
+Tests for local intent classification and entity extraction
+"""
+from datetime import date
+
+import pytest
+
+from agent.intent import IntentClassifier, extract_entities
+
+TODAY = date(2026, 10, 18)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("move the launch to March 5th", "2027-03-05"),
+    ("due may 3", "2027-05-03"),
+    ("deadline is Sept. 14", "2027-09-14"),
+    ("ship on dec 24", "2026-12-24"),
+])
+def test_month_day_dates(text, expected):
+    assert extract_entities(text, today=TODAY)["date"] == expected
+
+
+@pytest.mark.parametrize("text", ["mark 5 tasks done", "may 3 tasks slip", "decide 2 items", "marching 5"])
+def test_words_starting_with_a_month_are_not_dates(text):
+    assert extract_entities(text, today=TODAY)["date"] is None
+
+
+def test_classify_mark_done_has_no_date():
+    result = IntentClassifier().classify("mark 5 tasks done", today=TODAY)
+    assert result["entities"]["date"] is None
+    assert "date" not in result["parameters"]
+    assert result["entities"]["status"] == "completed"
@@ -0,0 +1,40 @@
+"""
+Tests for incremental JSON parsing and repair of truncated responses
+"""
+import json
+
+import pytest
+
+from agent.json_stream import IncrementalJSONParser, parse_json_response
+
+DOCUMENT = {
+    "phases": [{"name": "Build", "path": "C:\\users\\u", "note": "caf\u00e9 \"quoted\""}, [1, -2.5e3, None]],
+    "escaped": "\\u1234 and \\\\u",
+    "flags": [True, False, ""]
+}
+
+
+def test_items_stream_as_they_close():
+    text = json.dumps(DOCUMENT)
+    parser = IncrementalJSONParser()
+    items = []
+    for start in range(0, len(text), 7):
+        items += parser.feed(text[start:start + 7])
+    assert parser.close() == DOCUMENT
+    assert [value for key, value in items if key == "phases"] == DOCUMENT["phases"]
+
+
+@pytest.mark.parametrize("text,expected", [
+    ('{"a": ["C:\\\\u', {"a": ["C:\\u"]}),
+    ('{"a": ["C:\\\\\\u12', {"a": ["C:\\"]}),
+    ('{"a": "x\\u00', {"a": "x"}),
+])
+def test_truncated_unicode_escapes(text, expected):
+    assert parse_json_response(text) == expected
+
+
+def test_every_truncation_point_repairs():
+    text = json.dumps(DOCUMENT, indent=2)
+    for cut in range(text.index("{") + 1, len(text)):
+        result = parse_json_response(text[:cut])
+        assert "raw_response" not in result, text[:cut]
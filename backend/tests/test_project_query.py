@@ -0,0 +1,159 @@
+"""
+Tests for filtered, sorted, cursor-paginated project listings
+"""
+import base64
+import importlib
+import json
+import random
+
+import pytest
+
+from storage import InMemoryProjectRepository, ProjectQuery, SQLiteProjectRepository, project_fields
+
+SORTS = ["-created_at", "created_at", "name", "-name", "completion_percentage",
+         "-completion_percentage", "deadline", "-status"]
+FILTERS = [
+    {},
+    {"statuses": ["active", "on_hold"]},
+    {"health_indicators": ["red"]},
+    {"deadline_from": "2024-05-01", "deadline_to": "2024-05-01"},
+    {"deadline_to": "2024-06"},
+    {"team_member": "bob"},
+]
+
+
+def make_projects(count: int = 120, seed: int = 1) -> list:
+    # Mixed and missing values on purpose, so both repositories must agree on how they order
+    rng = random.Random(seed)
+    projects = []
+    for i in range(count):
+        project_id = f"p{i:03d}"
+        phases = [{"name": "Build", "tasks": [{"task_id": "t1"}]}]
+        projects.append({
+            "id": project_id,
+            "project_id": project_id,
+            "name": rng.choice(["alpha", "beta", "Gamma", None, 5]),
+            "status": rng.choice(["active", "completed", "on_hold"]),
+            "health_indicator": rng.choice(["green", "yellow", "red"]),
+            "deadline": rng.choice([None, "2024-05-01", "2024-05-01T12:00", "2024-06-10", 7]),
+            "created_at": rng.choice(["2024-01-01", "2024-01-02", "2024-01-03"]),
+            "completion_percentage": rng.choice([0, 10, 55.5, None, True]),
+            "team_members": rng.sample(["ann", "bob", "cy"], rng.randint(0, 2)),
+            "phases": phases,
+            "plan": {"phases": phases},
+        })
+    return projects
+
+
+@pytest.fixture(scope="module")
+def repositories(tmp_path_factory):
+    projects = make_projects()
+    memory = InMemoryProjectRepository()
+    sqlite = SQLiteProjectRepository(str(tmp_path_factory.mktemp("query") / "projects.db"))
+    memory.save_many(projects)
+    sqlite.save_many(projects)
+    yield memory, sqlite
+    memory.close()
+    sqlite.close()
+
+
+def walk(repository, **kwargs) -> list:
+    """Every page of a listing, checking the total stays put and matches what was returned"""
+    projects, cursor, totals = [], None, set()
+    while True:
+        page = repository.query(ProjectQuery(limit=7, cursor=cursor, **kwargs))
+        totals.add(page.total)
+        projects += [project_fields(project, kwargs.get("fields")) for project in page.projects]
+        cursor = page.next_cursor
+        if not cursor:
+            break
+    assert totals == {len(projects)}
+    return projects
+
+
+@pytest.mark.parametrize("sort", SORTS)
+@pytest.mark.parametrize("filters", FILTERS)
+@pytest.mark.parametrize("fields", [None, ["name"]])
+def test_sqlite_matches_memory(repositories, sort, filters, fields):
+    memory, sqlite = repositories
+    expected = walk(memory, sort=sort, fields=fields, **filters)
+    assert walk(sqlite, sort=sort, fields=fields, **filters) == expected
+
+
+def test_filters_and_order(repositories):
+    memory, _ = repositories
+    projects = walk(memory, sort="completion_percentage", statuses=["active"], team_member="bob")
+    assert projects
+    assert all(project["status"] == "active" and "bob" in project["team_members"] for project in projects)
+    # Missing and boolean values sort lowest
+    values = [project["completion_percentage"] for project in projects]
+    numbers = [value for value in values if isinstance(value, (int, float)) and not isinstance(value, bool)]
+    assert values[len(values) - len(numbers):] == sorted(numbers)
+
+
+def test_deadline_bounds_compare_on_bound_precision(repositories):
+    memory, _ = repositories
+    projects = walk(memory, deadline_from="2024-05-01", deadline_to="2024-05-01")
+    assert {project["deadline"] for project in projects} == {"2024-05-01", "2024-05-01T12:00"}
+
+
+def test_field_selection_keeps_ids(repositories):
+    _, sqlite = repositories
+    page = sqlite.query(ProjectQuery(fields=["name"], limit=3))
+    assert all(set(project_fields(project, ["name"])) == {"id", "project_id", "name"} for project in page.projects)
+
+
+@pytest.mark.parametrize("kwargs", [{"sort": "bogus"}, {"cursor": "zzz"}, {"limit": 0}, {"limit": 201}])
+def test_invalid_query(kwargs):
+    with pytest.raises(ValueError):
+        ProjectQuery(**kwargs)
+
+
+def test_cursor_is_tied_to_its_sort():
+    cursor = ProjectQuery(sort="name").cursor_for(make_projects(1)[0])
+    assert ProjectQuery(sort="name", cursor=cursor).after is not None
+    with pytest.raises(ValueError):
+        ProjectQuery(sort="-created_at", cursor=cursor)
+
+
+def encode_cursor(payload: dict) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode("utf-8")).decode("ascii")
+
+
+@pytest.mark.parametrize("payload", [
+    {"sort": "-created_at", "value": 5, "id": "x"},
+    {"sort": "-created_at", "value": {"a": 1}, "id": "x"},
+    {"sort": "-created_at", "value": "2024-01-01", "id": 3},
+    {"sort": "completion_percentage", "value": "10", "id": "x"},
+    {"sort": "completion_percentage", "value": True, "id": "x"},
+    {"sort": "completion_percentage", "value": [1], "id": "x"},
+])
+def test_tampered_cursor_values_are_rejected(payload):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        ProjectQuery(sort=payload["sort"], cursor=encode_cursor(payload))
+
+
+def test_api_list_params(monkeypatch):
+    from fastapi.testclient import TestClient
+
+    monkeypatch.setenv("STORAGE_BACKEND", "memory")
+    main = importlib.reload(importlib.import_module("api.main"))
+    with TestClient(main.app) as client:
+        main.get_repository().repository.save_many(make_projects(20))
+        first = client.get("/api/projects", params={"sort": "name", "limit": 5, "fields": "name"}).json()
+        assert first["total"] == 20
+        assert len(first["projects"]) == 5
+        assert set(first["projects"][0]) == {"id", "project_id", "name"}
+        rest = client.get("/api/projects", params={
+            "sort": "name", "limit": 50, "fields": "name", "cursor": first["next_cursor"]
+        }).json()
+        assert rest["next_cursor"] is None
+        assert len(rest["projects"]) == 15
+
+        filtered = client.get("/api/projects", params={"status": "active,on_hold", "fields": "all"}).json()
+        assert all(project["status"] in ("active", "on_hold") for project in filtered["projects"])
+        assert client.get("/api/projects", params={"sort": "bogus"}).status_code == 400
+        assert client.get("/api/projects", params={"cursor": "zzz"}).status_code == 400
+        tampered = encode_cursor({"sort": "-created_at", "value": 5, "id": "x"})
+        assert client.get("/api/projects", params={"cursor": tampered}).status_code == 400
+        assert client.get("/api/projects", params={"limit": 0}).status_code == 422
@@ -0,0 +1,37 @@
+"""
+Tests for per-method model routing and escalation
+"""
+from agent.client import LLMRequest
+from agent.routing import DEFAULT_TIER_MODELS, TIER_DEFAULT, TIER_LARGE, TIER_SMALL, ModelRouter
+
+FAILED = {"validation_errors": ["missing field"]}
+
+
+def routed(router: ModelRouter, method: str) -> LLMRequest:
+    return router.route(LLMRequest(method, "prompt"))
+
+
+def test_small_tier_failures_escalate_one_tier():
+    router = ModelRouter()
+    request = routed(router, "parse_user_intent")
+    assert request.model == DEFAULT_TIER_MODELS[TIER_SMALL]
+    assert router.escalate(request, {"intent": "other"}) is None
+    assert router.escalate(request, FAILED).model == DEFAULT_TIER_MODELS[TIER_DEFAULT]
+    assert router.stats()["escalated"] == {"parse_user_intent": 1}
+
+
+def test_default_tier_failures_are_not_escalated():
+    router = ModelRouter()
+    request = routed(router, "analyze_project_risks")
+    assert request.model == DEFAULT_TIER_MODELS[TIER_DEFAULT]
+    assert router.escalate(request, FAILED) is None
+    assert router.escalate(routed(router, "break_down_goals"), FAILED) is None
+
+
+def test_escalation_tiers_are_configurable():
+    router = ModelRouter.from_env({"AGENT_MODEL_ESCALATION_TIERS": "small, default"})
+    request = routed(router, "analyze_project_risks")
+    assert router.escalate(request, FAILED).model == DEFAULT_TIER_MODELS[TIER_LARGE]
+    assert ModelRouter.from_env({"AGENT_MODEL_ESCALATION": "0"}).escalate(
+        routed(router, "parse_user_intent"), FAILED
+    ) is None
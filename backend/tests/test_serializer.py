@@ -0,0 +1,28 @@
+"""
+Tests for the token-budgeted prompt serializer
+"""
+from agent.serializer import PromptSerializer
+
+
+def test_fits_budget_for_arbitrary_shapes():
+    data = {
+        "items": [{"k": i, "v": "x" * 50, "nested": {"deep": list(range(20))}} for i in range(2000)],
+        "blob": "y" * 40000
+    }
+    text, report = PromptSerializer().serialize_with_report(data, token_budget=500)
+    assert report["estimated_tokens"] <= 500
+    assert report["over_budget"] is False
+    assert "trim_largest" in report["steps"]
+    assert '"omitted_items"' in text
+
+
+def test_reports_over_budget_when_it_cannot_fit():
+    text, report = PromptSerializer().serialize_with_report({"a": [{"b": 1}, {"b": 2}] * 100}, token_budget=5)
+    assert report["over_budget"] is True
+    assert report["estimated_tokens"] > 5
+
+
+def test_small_payload_is_untouched():
+    text, report = PromptSerializer().serialize_with_report({"a": 1}, token_budget=100)
+    assert text == '{"a":1}'
+    assert report["steps"] == []
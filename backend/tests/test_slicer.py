@@ -0,0 +1,66 @@
+"""
+Tests for single-entity context slices and their prompt budget
+"""
+import random
+
+import pytest
+
+from agent.serializer import DEFAULT_TOKEN_BUDGET, PromptSerializer
+from agent.slicer import DEFAULT_MAX_RELATED, ContextSlicer
+
+
+@pytest.fixture(scope="module")
+def large_project() -> dict:
+    rng = random.Random(1)
+    phases = []
+    count = 0
+    for phase_number in range(1, 11):
+        tasks = []
+        for _ in range(500):
+            count += 1
+            dependencies = [f"task_{rng.randint(1, count - 1)}"] if count > 1 and rng.random() < 0.7 else []
+            tasks.append({
+                "task_id": f"task_{count}",
+                "title": f"Task {count} do something",
+                "status": rng.choice(["completed", "in_progress", "not_started"]),
+                "priority": rng.choice(["high", "medium", "low"]),
+                "estimated_hours": 8,
+                "dependencies": dependencies,
+                "assignee": rng.choice(["ann", "bob", "cy"]),
+                "description": "long description " * 5
+            })
+        phases.append({
+            "phase_number": phase_number,
+            "name": f"Phase {phase_number} work",
+            "tasks": tasks,
+            "milestones": [{"name": f"M{phase_number}", "target_week": phase_number + 1}]
+        })
+    return {"project_id": "proj_1", "name": "Big", "start_date": "2026-01-01", "phases": phases}
+
+
+def test_task_slice_keeps_target_and_neighbours(large_project):
+    sliced = ContextSlicer().task_slice(large_project, "task_2500")
+    assert sliced["target_task"]["task_id"] == "task_2500"
+    assert all(task["hops"] <= 2 for task in sliced["related_tasks"])
+    assert "phases" not in sliced["project"]
+
+
+def test_milestone_tasks_are_capped(large_project):
+    sliced = ContextSlicer().milestone_slice(large_project, "M3")
+    assert len(sliced["milestone_tasks"]) == DEFAULT_MAX_RELATED
+    assert sliced["milestone_tasks_omitted"] == 500 - DEFAULT_MAX_RELATED
+
+
+@pytest.mark.parametrize("kind,name", [("task", "task_2500"), ("milestone", "M3"), ("phase", "Phase 4 work")])
+def test_slices_fit_the_default_budget(large_project, kind, name):
+    sliced = getattr(ContextSlicer(), f"{kind}_slice")(large_project, name)
+    text, report = PromptSerializer().serialize_with_report(sliced)
+    assert report["estimated_tokens"] <= DEFAULT_TOKEN_BUDGET
+
+
+def test_serializer_trims_slice_task_lists(large_project):
+    sliced = ContextSlicer().milestone_slice(large_project, "M3")
+    text, report = PromptSerializer().serialize_with_report(sliced, token_budget=1000)
+    assert report["estimated_tokens"] <= 1000
+    assert report["steps"]
+    assert "milestone_tasks_omitted" in text
@@ -0,0 +1,139 @@
+"""
+Tests for the project repositories (SQLite and in-memory) and the API's use of them
+"""
+import importlib
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from storage import AsyncProjectRepository, InMemoryProjectRepository, ProjectRepository, SQLiteProjectRepository
+
+
+def make_project(project_id: str, created_at: str = "2024-01-01T00:00:00") -> dict:
+    phases = [{
+        "phase_number": 1,
+        "name": "Build",
+        "milestones": ["Kickoff", {"name": "MVP", "target_week": 6}],
+        "tasks": [
+            {"task_id": "t1", "title": "Set up", "status": "completed", "estimated_hours": 4},
+            {"task_id": "t2", "title": "Ship", "estimated_hours": "ten", "dependencies": ["t1"], "notes": None},
+        ]
+    }, {"name": "Empty"}]
+    return {
+        "id": project_id,
+        "project_id": project_id,
+        "name": "Demo",
+        "description": None,
+        "goals": ["ship"],
+        "created_at": created_at,
+        "status": "active",
+        "completion_percentage": 12.5,
+        "team_members": ["ann", {"name": "bob"}],
+        "budget": True,
+        "phases": phases,
+        "plan": {"phases": phases, "total_estimated_weeks": 12},
+        "tasks": [{"task_id": "loose"}]
+    }
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def repository(request, tmp_path):
+    if request.param == "memory":
+        repo = InMemoryProjectRepository()
+    else:
+        repo = SQLiteProjectRepository(str(tmp_path / "projects.db"))
+    yield repo
+    repo.close()
+
+
+def test_interface_is_abstract():
+    with pytest.raises(TypeError):
+        ProjectRepository()
+
+
+def test_round_trip(repository):
+    project = make_project("p1")
+    repository.save(project)
+    assert repository.get("p1") == project
+    assert repository.exists("p1")
+    assert repository.get("missing") is None
+
+
+def test_odd_shapes_round_trip(repository):
+    project = make_project("p1")
+    project["phases"] = "not a list"
+    del project["plan"]
+    repository.save(project)
+    assert repository.get("p1") == project
+
+
+def test_returned_projects_are_copies(repository):
+    project = make_project("p1")
+    repository.save(project)
+    project["phases"][0]["tasks"].clear()
+    loaded = repository.get("p1")
+    loaded["name"] = "Changed"
+    assert repository.get("p1") == make_project("p1")
+
+
+def test_list_newest_first_and_delete(repository):
+    repository.save_many([make_project("old", "2024-01-01"), make_project("new", "2024-02-01")])
+    assert [project["id"] for project in repository.list()] == ["new", "old"]
+    assert repository.delete("old") is True
+    assert repository.delete("old") is False
+    assert [project["id"] for project in repository.list()] == ["new"]
+
+
+def test_save_requires_id(repository):
+    with pytest.raises(ValueError):
+        repository.save({"name": "No id"})
+
+
+def test_concurrent_saves(repository):
+    def work(worker: int):
+        for round_ in range(25):
+            repository.save(make_project(f"p{worker}_{round_}"))
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(work, range(8)))
+    assert len(repository.list()) == 200
+
+
+def test_sqlite_persists_across_instances(tmp_path):
+    path = str(tmp_path / "projects.db")
+    first = SQLiteProjectRepository(path)
+    first.save(make_project("p1"))
+    first.close()
+    second = SQLiteProjectRepository(path)
+    assert second.get("p1") == make_project("p1")
+    second.close()
+
+
+async def test_async_facade():
+    repository = AsyncProjectRepository(InMemoryProjectRepository())
+    await repository.save(make_project("p1"))
+    assert (await repository.get("p1"))["id"] == "p1"
+    assert await repository.delete("p1")
+    await repository.aclose()
+
+
+def test_api_opens_storage_lazily(tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("STORAGE_BACKEND", "sqlite")
+    monkeypatch.setenv("DATABASE_PATH", str(tmp_path / "api.db"))
+    main = importlib.reload(importlib.import_module("api.main"))
+    assert not (tmp_path / "api.db").exists()
+
+    with TestClient(main.app) as client:
+        created = client.post("/api/projects", json={
+            "name": "Demo", "description": "d", "goals": ["x"],
+            "start_date": "2024-01-01", "deadline": "2024-05-01"
+        }).json()
+        project_id = created["project_id"]
+        assert client.get(f"/api/projects/{project_id}").json() == created["project"]
+        assert client.delete(f"/api/projects/{project_id}").status_code == 200
+        assert client.get(f"/api/projects/{project_id}").status_code == 404
+    assert (tmp_path / "api.db").exists()
+    assert main._repository is None
@@ -2,32 +2,69 @@
 import { useState, useEffect, useCallback } from 'react';
 import api from '../services/api';
 
-export function useProjects() {
+// Largest page the API serves
+const PAGE_SIZE = 200;
+
+// filters are passed to GET /api/projects. Without a `limit` every page is
+// loaded (summaries are small); with one, only the first page is, and
+// loadMore() fetches the next.
+export function useProjects(filters = {}) {
   const [projects, setProjects] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [total, setTotal] = useState(0);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
+  const filterKey = JSON.stringify(filters);
 
   const fetchProjects = useCallback(async () => {
     try {
       setLoading(true);
       setError(null);
-      const response = await api.getProjects();
-      setProjects(response.projects || []);
+      const params = JSON.parse(filterKey);
+      let loaded = [];
+      let cursor = null;
+      let count = 0;
+      do {
+        const response = await api.getProjects({ limit: PAGE_SIZE, ...params, cursor });
+        loaded = loaded.concat(response.projects || []);
+        cursor = response.next_cursor || null;
+        count = response.total ?? loaded.length;
+      } while (cursor && !params.limit);
+      setProjects(loaded);
+      setNextCursor(cursor);
+      setTotal(count);
     } catch (err) {
       setError(err.message);
     } finally {
       setLoading(false);
     }
-  }, []);
+  }, [filterKey]);
 
   useEffect(() => {
     fetchProjects();
   }, [fetchProjects]);
 
+  const loadMore = useCallback(async () => {
+    if (!nextCursor) return;
+    try {
+      setLoading(true);
+      const response = await api.getProjects({ ...JSON.parse(filterKey), cursor: nextCursor });
+      setProjects(prev => [...prev, ...(response.projects || [])]);
+      setNextCursor(response.next_cursor || null);
+      setTotal(response.total ?? total);
+    } catch (err) {
+      setError(err.message);
+    } finally {
+      setLoading(false);
+    }
+  }, [filterKey, nextCursor, total]);
+
   const createProject = async (projectData) => {
     try {
       const response = await api.createProject(projectData);
-      setProjects(prev => [...prev, response.project]);
+      // Newest first, matching the server's default order
+      setProjects(prev => [response.project, ...prev]);
+      setTotal(prev => prev + 1);
       return response;
     } catch (err) {
       setError(err.message);
@@ -39,6 +76,7 @@ export function useProjects() {
     try {
       await api.deleteProject(projectId);
       setProjects(prev => prev.filter(p => p.id !== projectId));
+      setTotal(prev => Math.max(prev - 1, 0));
     } catch (err) {
       setError(err.message);
       throw err;
@@ -47,9 +85,12 @@ export function useProjects() {
 
   return {
     projects,
+    total,
+    hasMore: nextCursor !== null,
     loading,
     error,
     fetchProjects,
+    loadMore,
     createProject,
     deleteProject,
   };
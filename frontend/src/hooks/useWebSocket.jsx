@@ -28,6 +28,26 @@ export function useWebSocket(sessionId = null) {
           timestamp: new Date().toISOString(),
         }]);
         setIsLoading(false);
+      } else if (data.type === 'message_start') {
+        // Streamed reply: show an empty assistant message and grow it with each delta
+        setMessages(prev => [...prev, {
+          id: data.message_id,
+          role: 'assistant',
+          content: '',
+          streaming: true,
+          timestamp: new Date().toISOString(),
+        }]);
+        setIsLoading(false);
+      } else if (data.type === 'delta') {
+        setMessages(prev => prev.map(msg =>
+          msg.id === data.message_id ? { ...msg, content: msg.content + data.text } : msg
+        ));
+      } else if (data.type === 'message_end') {
+        setMessages(prev => prev.map(msg =>
+          msg.id === data.message_id
+            ? { ...msg, content: data.response, streaming: false, usage: data.usage }
+            : msg
+        ));
       }
     });
 
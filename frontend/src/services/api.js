@@ -33,8 +33,13 @@ class ApiService {
   }
 
   // Projects
-  async getProjects() {
-    return this.request('/api/projects');
+  // params: status, health_indicator, deadline_from, deadline_to, team_member,
+  // sort, limit, cursor, fields (the server defaults to summary fields)
+  async getProjects(params = {}) {
+    const query = new URLSearchParams(
+      Object.entries(params).filter(([, value]) => value !== undefined && value !== null && value !== '')
+    ).toString();
+    return this.request(`/api/projects${query ? `?${query}` : ''}`);
   }
 
   async getProject(projectId) {
@@ -72,6 +72,18 @@ class WebSocketService {
     this.ws.send(JSON.stringify(payload));
   }
 
+  requestReport(projectId, reportType = 'weekly') {
+    if (this.ws?.readyState !== WebSocket.OPEN) {
+      throw new Error('WebSocket not connected');
+    }
+
+    this.ws.send(JSON.stringify({
+      type: 'report',
+      project_id: projectId,
+      report_type: reportType,
+    }));
+  }
+
   handleMessage(data) {
     if (data.type === 'error') {
       this.notifyError(new Error(data.message));